@@ -0,0 +1,51 @@
+"""Decode cost of large listing responses per JSON backend.
+
+Times turning a `ship_get_all` body into Ship models with every installed backend,
+against the old path of stdlib `json` plus the eager model.
+
+    python -m benchmarks.bench_decode --ships 2000
+"""
+
+import argparse
+import json
+import timeit
+
+from benchmarks.bench_models import EagerShip, ship_payload
+from spt.decode import BACKENDS, Decoder
+from spt.ship import Ship
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ships", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    body = json.dumps({"ships": [ship_payload(i) for i in range(args.ships)]}).encode()
+    print(f"{args.ships} ships, {len(body) / 1024:.0f} KiB")
+
+    def old():
+        return [EagerShip(None, x) for x in json.loads(body)["ships"]]
+
+    cases = [("json + eager", old)]
+    for name in BACKENDS:
+        try:
+            decoder = Decoder(name)
+        except ImportError:
+            print(f"{name:<14} not installed")
+            continue
+
+        cases.append(
+            (
+                f"{name} + lazy",
+                lambda d=decoder: [Ship(None, x) for x in d(body)["ships"]],
+            )
+        )
+
+    for name, case in cases:
+        seconds = min(timeit.repeat(case, number=1, repeat=args.repeat))
+        print(f"{name:<14} {seconds * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""Throughput benchmark for HTTPClient against the local stand-in server.
+
+Runs serial, concurrent and fleet-wide workloads and reports the requests the
+server actually handled per second, p50/p99 latency and event loop lag. The server
+runs on its own thread and loop so its work doesn't show up as client loop lag.
+
+    python -m benchmarks.bench_http --requests 200 --ships 30 --latency 0.02
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+
+from typing import Awaitable, Callable, List
+
+from spt.ext.mock import MockServer
+from spt.http import HTTPClient
+
+TOKEN = "bench-token"
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(pct / 100 * len(values)) - 1))
+    return values[index]
+
+
+class LoopLag:
+    """Measures how late a periodic timer fires, i.e. how blocked the loop is"""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - start - self.interval))
+
+    def __enter__(self):
+        self._task = asyncio.ensure_future(self._run())
+        return self
+
+    def __exit__(self, *_):
+        self._task.cancel()
+
+
+class Result:
+    def __init__(
+        self,
+        name: str,
+        latencies: List[float],
+        elapsed: float,
+        lag: LoopLag,
+        served: int,
+    ):
+        self.name = name
+        self.latencies = latencies
+        self.elapsed = elapsed
+        self.lag = lag.samples
+        self.served = served
+
+    def __str__(self):
+        ms = 1000
+        return (
+            f"{self.name:<12} {len(self.latencies):>6} calls "
+            f"{self.served:>6} served "
+            f"{self.served / self.elapsed:>9.1f} req/s "
+            f"p50 {percentile(self.latencies, 50) * ms:>7.2f} ms "
+            f"p99 {percentile(self.latencies, 99) * ms:>7.2f} ms "
+            f"lag p99 {percentile(self.lag, 99) * ms:>6.2f} ms "
+            f"max {max(self.lag, default=0) * ms:>6.2f} ms"
+        )
+
+
+async def timed(latencies: List[float], call: Callable[[], Awaitable]):
+    start = time.perf_counter()
+    await call()
+    latencies.append(time.perf_counter() - start)
+
+
+async def serial(http: HTTPClient, ships: List[str], n: int) -> List[float]:
+    latencies: List[float] = []
+    for i in range(n):
+        await timed(latencies, lambda: http.ship_get_info(ships[i % len(ships)]))
+    return latencies
+
+
+async def concurrent(http: HTTPClient, ships: List[str], n: int) -> List[float]:
+    latencies: List[float] = []
+    await asyncio.gather(
+        *(
+            timed(latencies, lambda i=i: http.ship_get_info(ships[i % len(ships)]))
+            for i in range(n)
+        )
+    )
+    return latencies
+
+
+async def fleet(http: HTTPClient, ships: List[str], n: int) -> List[float]:
+    """Every ship polls its market, refuels and checks in, like a trading loop"""
+    latencies: List[float] = []
+
+    async def ship_loop(ship_id: str):
+        for _ in range(max(1, n // len(ships) // 3)):
+            info = await http.ship_get_info(ship_id)
+            location = info["ship"]["location"]
+            await timed(latencies, lambda: http.location_get_market(location))
+            await timed(latencies, lambda: http.order_purchase(ship_id, "FUEL", 1))
+            await timed(latencies, lambda: http.ship_get_info(ship_id))
+
+    await asyncio.gather(*(ship_loop(s) for s in ships))
+    return latencies
+
+
+WORKLOADS = {"serial": serial, "concurrent": concurrent, "fleet": fleet}
+
+
+def serve(server: MockServer) -> asyncio.AbstractEventLoop:
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(server.start())
+        started.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    started.wait()
+    return loop
+
+
+async def bench(args, server: MockServer):
+    # Coalescing would merge the concurrent GETs for the same ship into one request
+    async with HTTPClient(
+        TOKEN,
+        asyncio.get_event_loop(),
+        base_url=server.url,
+        coalesce=False,
+        rate_limit=args.rate,
+        burst=args.burst,
+        connections=args.connections,
+    ) as http:
+        ships = [s["id"] for s in (await http.ship_get_all())["ships"]]
+
+        for name in args.workloads:
+            before = server.requests
+            with LoopLag() as lag:
+                start = time.perf_counter()
+                latencies = await WORKLOADS[name](http, ships, args.requests)
+                elapsed = time.perf_counter() - start
+
+            print(Result(name, latencies, elapsed, lag, server.requests - before))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--ships", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.005)
+    parser.add_argument("--rate", type=float, default=1000.0, help="requests/s allowed")
+    parser.add_argument("--burst", type=int, default=100)
+    parser.add_argument("--connections", type=int, default=100, help="pool size")
+    parser.add_argument("--workloads", nargs="+", default=list(WORKLOADS))
+    args = parser.parse_args()
+
+    server = MockServer(
+        tokens=(TOKEN,),
+        rate=args.rate,
+        burst=args.burst,
+        latency=args.latency,
+        jitter=args.jitter,
+        ships=args.ships,
+        seed=0,
+    )
+    server_loop = serve(server)
+
+    try:
+        asyncio.run(bench(args, server))
+    finally:
+        server_loop.call_soon_threadsafe(server_loop.stop)
+
+    print(f"server handled {server.requests} requests")
+
+
+if __name__ == "__main__":
+    main()
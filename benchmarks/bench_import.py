@@ -0,0 +1,91 @@
+"""Cold import cost of `spt`.
+
+Each sample runs a fresh interpreter so nothing is cached in `sys.modules`. The
+script exits non-zero when the median cost of `import spt` is over budget, so it
+can gate CI.
+
+    python -m benchmarks.bench_import --budget-ms 20
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+from typing import List
+
+SNIPPETS = {
+    "import spt": "import spt",
+    "spt.Client": "import spt; spt.Client",
+}
+
+
+def sample(code: str) -> float:
+    """Seconds spent importing, as measured by the interpreter itself"""
+    probe = (
+        "import time; _t = time.perf_counter(); "
+        f"{code}; "
+        "print(time.perf_counter() - _t)"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def side_effects() -> List[str]:
+    """Anything `import spt` touches that it shouldn't"""
+    probe = (
+        "import logging, os, sys; before = set(os.listdir('.')); "
+        "import spt; "
+        "print(sorted(set(os.listdir('.')) - before)); "
+        "print(sorted(m for m in sys.modules if m.split('.')[0] in ('aiohttp', 'art'))); "
+        "print(logging.getLogger('asyncio').disabled); "
+        "print(len(logging.getLogger('spacetraders').handlers))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+    )
+    files, modules, disabled, handlers = out.stdout.strip().splitlines()
+
+    problems = []
+    if files != "[]":
+        problems.append(f"created files {files}")
+    if modules != "[]":
+        problems.append(f"imported {modules}")
+    if disabled != "False":
+        problems.append("disabled the asyncio logger")
+    if handlers != "0":
+        problems.append("attached logging handlers")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    medians = {}
+    for name, code in SNIPPETS.items():
+        samples = [sample(code) * 1000 for _ in range(args.runs)]
+        medians[name] = statistics.median(samples)
+        print(
+            f"{name:<12} median {medians[name]:7.2f} ms  "
+            f"min {min(samples):7.2f} ms  max {max(samples):7.2f} ms"
+        )
+
+    failed = False
+    for problem in side_effects():
+        print(f"FAIL: import spt {problem}")
+        failed = True
+
+    if medians["import spt"] > args.budget_ms:
+        print(f"FAIL: import spt over budget of {args.budget_ms} ms")
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Per-request cost of logging in HTTPClient.
+
+Sends requests through a transport that answers instantly, so the time per request
+is the client's own overhead, and compares it with logging off, the old eager INFO
+lines into a blocking file handler, and the background queue from `spt.setup` with
+and without sampling. Time spent on the writer thread afterwards isn't counted,
+but it does compete with the loop for the GIL while requests run.
+
+    python -m benchmarks.bench_logging --requests 20000
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+
+from spt import log
+from spt.http import HTTPClient
+from spt.route import Route
+from spt.transport import Response, Transport
+
+BODY = b'{"ship": {"id": "ship-1", "location": "OE-PM", "cargo": []}}'
+
+
+class Instant(Transport):
+    async def send(self, route: Route, url: str, timeout: float) -> Response:
+        return Response(200, {}, BODY)
+
+
+def reset():
+    log.shutdown()
+    for name in log.LOGGERS:
+        logger = logging.getLogger(name)
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+            handler.close()
+        logger.setLevel(logging.WARNING)
+
+
+def eager(path: str):
+    """What the package did before: a FileHandler and INFO lines per request"""
+    handler = logging.FileHandler(path)
+    handler.setFormatter(logging.Formatter(log.FORMAT))
+    logger = logging.getLogger("spacetraders-http")
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+
+    def each(route: Route):
+        logger.info(route.__str__())
+        logger.info(route.kwargs)
+
+    return each
+
+
+async def run(n: int, each=None, sample: float = 1.0) -> float:
+    async with HTTPClient(
+        "bench-token",
+        asyncio.get_event_loop(),
+        transport=Instant(),
+        rate_limit=1e9,
+        burst=1 << 30,
+        coalesce=False,
+        log_sample=sample,
+    ) as http:
+        start = time.perf_counter()
+        for i in range(n):
+            route = Route("get", "/my/ships/{shipId}", shipId=f"ship-{i % 50}")
+            if each is not None:
+                each(route)
+            await http._request(route)
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3, help="best of")
+    parser.add_argument("--sample", type=float, default=0.1, help="share logged")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "bench.log")
+
+    def queue(**kwargs):
+        return lambda: log.setup(path, quiet_asyncio=False, **kwargs) and None
+
+    # name, logging setup, share of requests HTTPClient logs
+    cases = [
+        ("off", lambda: None, 1.0),
+        ("eager file", lambda: eager(path), 1.0),
+        ("queue", queue(), 1.0),
+        (f"queue {args.sample:.0%}", queue(), args.sample),
+        ("queue json", queue(structured=True), 1.0),
+    ]
+
+    base = None
+    for name, configure, sample in cases:
+        elapsed = float("inf")
+        for _ in range(args.repeat):
+            if os.path.exists(path):
+                os.remove(path)
+            reset()
+            each = configure()
+            elapsed = min(elapsed, asyncio.run(run(args.requests, each, sample)))
+            # Stopping the writer waits for the queue to drain
+            reset()
+
+        per = elapsed / args.requests * 1e6
+        base = per if base is None else base
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        print(
+            f"{name:<12} {per:>7.1f} us/request  +{per - base:>6.1f} us  "
+            f"{size / 1024:>8.0f} KiB written"
+        )
+
+        if os.path.exists(path):
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Memory and construction cost of the model classes.
+
+Compares the `__slots__` models with lazy fields against the previous eager
+models, which copied every field into an instance `__dict__`, on the same
+payloads. Also compares refreshing a ship with `apply` against rebuilding it.
+
+    python -m benchmarks.bench_models --count 100000
+"""
+
+import argparse
+import gc
+import timeit
+import tracemalloc
+
+from typing import Callable, List
+
+from spt.flight import FlightPlan
+from spt.ship import Ship
+
+
+class EagerShip:
+    """The model as it was before `__slots__`, minus the broken Location call"""
+
+    def __init__(self, http, data: dict) -> None:
+        self.http = http
+        self.data = data
+
+        self.cargo = data.get("cargo", [])
+        self.ship_class = data.get("class", None)
+        self.id = data.get("id", None)
+        self.location = data.get("location")
+        self.manufacturer = data.get("manufacturer")
+        self.max_cargo = data.get("maxCargo", 0)
+        self.plating = data.get("plating", 0)
+        self.spaceAvailable = data.get("spaceAvailable", 0)
+        self.speed = data.get("speed", 0)
+        self.ship_type = data.get("type", None)
+        self.weapons = data.get("weapons", 0)
+
+        self.x, self.y = data.get("x", 0), data.get("y", 0)
+
+        self.flight_plan_id = data.get("flightPlanId", None)
+
+
+class EagerFlightPlan:
+    def __init__(self, http, data: dict):
+        data = data["flightPlan"]
+
+        self.arrives = data.get("arrivesAt")
+        self.created_at = data.get("createdAt")
+        self.departure = data.get("departure")
+        self.destination = data.get("destination")
+
+        self.distance = data.get("distance")
+        self.fuel_used = data.get("fuelConsumed")
+        self.fuel_remaining = data.get("fuelRemaining")
+
+        self.id = data.get("id")
+        self.ship_id = data.get("shipId")
+
+        self.terminated_at = data.get("terminatedAt")
+        self.terminated = None if self.terminated_at is None else True
+
+
+def ship_payload(i: int) -> dict:
+    return {
+        "id": f"ship{i:08d}",
+        "location": "OE-PM-TR",
+        "x": 21,
+        "y": -26,
+        "cargo": [{"good": "FUEL", "quantity": 20, "totalVolume": 20}],
+        "spaceAvailable": 80,
+        "type": "GR-MK-I",
+        "class": "MK-I",
+        "maxCargo": 100,
+        "speed": 1,
+        "manufacturer": "Gravager",
+        "plating": 10,
+        "weapons": 5,
+    }
+
+
+def plan_payload(i: int) -> dict:
+    return {
+        "flightPlan": {
+            "id": f"plan{i:08d}",
+            "shipId": f"ship{i:08d}",
+            "createdAt": "2021-05-24T18:19:23.497Z",
+            "arrivesAt": "2021-05-24T18:21:23.497Z",
+            "departure": "OE-PM-TR",
+            "destination": "OE-CR",
+            "distance": 84,
+            "fuelConsumed": 22,
+            "fuelRemaining": 0,
+            "terminatedAt": None,
+        }
+    }
+
+
+def memory(factory: Callable, payloads: List[dict]) -> float:
+    """Bytes per object, not counting the shared payloads"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(None, p) for p in payloads]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del objects
+    return (after - before) / len(payloads)
+
+
+def construction(factory: Callable, payloads: List[dict]) -> float:
+    """Nanoseconds per object"""
+    seconds = min(
+        timeit.repeat(lambda: [factory(None, p) for p in payloads], number=1, repeat=5)
+    )
+    return seconds / len(payloads) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100000)
+    args = parser.parse_args()
+
+    ships = [ship_payload(i) for i in range(args.count)]
+    plans = [plan_payload(i) for i in range(args.count)]
+
+    cases = (
+        ("Ship", EagerShip, Ship, ships),
+        ("FlightPlan", EagerFlightPlan, FlightPlan, plans),
+    )
+    for name, before, after, payloads in cases:
+        for label, factory in (("before", before), ("after", after)):
+            print(
+                f"{name:<11} {label:<7} "
+                f"{memory(factory, payloads):8.1f} B/obj  "
+                f"{construction(factory, payloads):8.1f} ns/obj"
+            )
+
+    ship = Ship(None, ships[0])
+    rebuild = min(timeit.repeat(lambda: ship.__init__(None, ships[1]), number=100000))
+    apply = min(timeit.repeat(lambda: ship.apply(ships[1]), number=100000))
+    print(f"refresh     rebuild {rebuild * 1e4:8.1f} ns  apply {apply * 1e4:8.1f} ns")
+
+
+if __name__ == "__main__":
+    main()
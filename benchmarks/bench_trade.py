@@ -0,0 +1,133 @@
+"""Fleet-wide trade search with spt.ext.trade against a plain Python loop.
+
+Builds a random system of markets and ranks the best trade for every ship, first
+with `best_trades` and then by looping over every destination and good per ship.
+
+    python -m benchmarks.bench_trade --locations 40 --ships 500
+"""
+
+import argparse
+import math
+import random
+import timeit
+
+from typing import Dict, List
+
+from spt.enum import Goods
+from spt.ext.trade import MarketMatrix, best_trades
+
+TYPES = ("PLANET", "MOON", "ASTEROID", "GAS_GIANT")
+
+
+def system(n: int, rng: random.Random):
+    locations = [
+        {
+            "symbol": f"XV-{i:03d}",
+            "type": rng.choice(TYPES),
+            "x": rng.randint(-150, 150),
+            "y": rng.randint(-150, 150),
+        }
+        for i in range(n)
+    ]
+
+    goods = [g.value for g in Goods]
+    volumes = {good: rng.randint(1, 3) for good in goods}
+    markets: Dict[str, List[dict]] = {}
+    for loc in locations:
+        listing = []
+        for good in rng.sample(goods, k=12):
+            price = rng.randint(2, 400)
+            spread = max(1, price // 20)
+            listing.append(
+                {
+                    "symbol": good,
+                    "volumePerUnit": volumes[good],
+                    "purchasePricePerUnit": price + spread,
+                    "sellPricePerUnit": price - spread,
+                    "quantityAvailable": rng.randint(100, 50000),
+                }
+            )
+        markets[loc["symbol"]] = listing
+
+    return locations, markets
+
+
+def fleet(n: int, locations: List[dict], rng: random.Random) -> List[dict]:
+    return [
+        {
+            "id": f"ship{i}",
+            "location": rng.choice(locations)["symbol"],
+            "spaceAvailable": rng.choice((50, 100, 300, 500)),
+            "speed": rng.choice((1, 2, 3)),
+            "cargo": [{"good": "FUEL", "quantity": rng.randint(0, 40)}],
+        }
+        for i in range(n)
+    ]
+
+
+def loop(ships: List[dict], locations: List[dict], markets: Dict[str, List[dict]]):
+    """The per-ship search bots write by hand"""
+    by_symbol = {loc["symbol"]: loc for loc in locations}
+    listings = {s: {i["symbol"]: i for i in m} for s, m in markets.items()}
+    fuel_price = {
+        s: m["FUEL"]["purchasePricePerUnit"] if "FUEL" in m else 4
+        for s, m in listings.items()
+    }
+
+    best = {}
+    for ship in ships:
+        here = by_symbol[ship["location"]]
+        held = ship["cargo"][0]["quantity"]
+        for there in locations:
+            if there is here:
+                continue
+            distance = math.ceil(
+                math.hypot(here["x"] - there["x"], here["y"] - there["y"])
+            )
+            fuel = round(distance / 4) + (2 if here["type"] == "PLANET" else 0) + 1
+            bought = max(fuel - held, 0)
+            room = max(ship["spaceAvailable"] - bought, 0)
+            seconds = round(distance * 2 / ship["speed"]) + 30
+
+            for good, item in listings[here["symbol"]].items():
+                other = listings[there["symbol"]].get(good)
+                if other is None:
+                    continue
+                units = min(room // item["volumePerUnit"], item["quantityAvailable"])
+                profit = (
+                    other["sellPricePerUnit"] - item["purchasePricePerUnit"]
+                ) * units - bought * fuel_price[here["symbol"]]
+                rate = profit / seconds
+                if profit > 0 and rate > best.get(ship["id"], (0,))[0]:
+                    best[ship["id"]] = (rate, good, there["symbol"])
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--locations", type=int, default=40)
+    parser.add_argument("--ships", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    locations, markets = system(args.locations, rng)
+    ships = fleet(args.ships, locations, rng)
+    print(f"{args.locations} locations, {len(Goods)} goods, {args.ships} ships")
+
+    cases = [
+        ("build matrix", lambda: MarketMatrix(locations, markets)),
+        (
+            "best_trades",
+            lambda m=MarketMatrix(locations, markets): best_trades(ships, m),
+        ),
+        ("python loop", lambda: loop(ships, locations, markets)),
+    ]
+    for name, case in cases:
+        seconds = min(timeit.repeat(case, number=1, repeat=args.repeat))
+        print(f"{name:<14} {seconds * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,48 +1,77 @@
-from .cargo import *
-from .client import *
-from .errors import *
-from .flight import *
-from .http import *
-from .ship import *
-from .user import *
-from .route import *
-
-# ----------
-# Disable aiohttp's warning messages
-import logging
-
-asyncio = logging.getLogger("asyncio")
-asyncio.disabled = True
-
-# Setup logging for module
-with open("spacetraders.log", "w") as f:
-    pass
-
-logger = logging.getLogger("spacetraders")
-logger.setLevel(logging.DEBUG)
-fh = logging.FileHandler("spacetraders.log")
-fh.setLevel(logging.DEBUG)
-formatter = logging.Formatter("[%(name)s]  %(levelname)s - %(message)s")
-fh.setFormatter(formatter)
-logger.addHandler(fh)
-
-logger = logging.getLogger("spacetraders-http")
-logger.setLevel(logging.DEBUG)
-fh = logging.FileHandler("spacetraders.log")
-fh.setLevel(logging.DEBUG)
-formatter = logging.Formatter("[%(name)s]  %(levelname)s - %(message)s")
-fh.setFormatter(formatter)
-logger.addHandler(fh)
-
-
-# --------------------
-
-try:
-    import art
-
-    print(f"\033[1;33m {art.text2art('spt')} \033[0m")
-
-    del art
-
-except ImportError:
-    pass
+"""An asyncio wrapper for the SpaceTraders API.
+
+Importing the package does no work: submodules load the first time one of their
+names is used, and logging is left alone until `spt.setup()` is called.
+"""
+
+import importlib
+
+# Public name -> submodule that defines it
+_LAZY = {
+    "ArrivalScheduler": "arrivals",
+    "ResponseCache": "cache",
+    "Cargo": "cargo",
+    "Client": "client",
+    "Goods": "enum",
+    "Ships": "enum",
+    "SPTError": "errors",
+    "HTTPError": "errors",
+    "ReachedMaximumRetries": "errors",
+    "ReplayExhausted": "errors",
+    "ServerError": "errors",
+    "CircuitOpen": "errors",
+    "Decoder": "decode",
+    "Fleet": "fleet",
+    "FleetResult": "fleet",
+    "FlightPlan": "flight",
+    "HTTPClient": "http",
+    "IdentityMap": "identity",
+    "Loan": "loan",
+    "Location": "location",
+    "setup": "log",
+    "Metrics": "metrics",
+    "EventMetrics": "metrics",
+    "RouteMetrics": "metrics",
+    "Model": "model",
+    "Order": "order",
+    "HTTPClientPool": "pool",
+    "RateLimiter": "ratelimit",
+    "SharedRateLimiter": "ratelimit",
+    "RetryPolicy": "retry",
+    "CircuitBreaker": "retry",
+    "Route": "route",
+    "Priority": "scheduler",
+    "Scheduler": "scheduler",
+    "Ship": "ship",
+    "ShipInfo": "ship",
+    "Supervisor": "supervisor",
+    "Structure": "structure",
+    "OwnedStructure": "structure",
+    "SyncClient": "sync",
+    "Blocking": "sync",
+    "Response": "transport",
+    "Transport": "transport",
+    "SessionTransport": "transport",
+    "RecordingTransport": "transport",
+    "ReplayTransport": "transport",
+    "User": "user",
+    "PartialUser": "user",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+
+    # Cache it so later lookups skip this hook
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
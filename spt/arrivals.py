@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import heapq
+import itertools
+import logging
+
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+
+from .flight import FlightPlan
+
+if TYPE_CHECKING:
+    from .client import Client
+    from .ship import Ship
+
+
+def seconds_until(plan: FlightPlan) -> float:
+    """Seconds until a flight plan arrives, from `arrivesAt`"""
+    arrives = plan.arrives
+    if arrives is None:
+        return float(plan.data.get("timeRemainingInSeconds") or 0)
+
+    # fromisoformat doesn't take a trailing Z before 3.11
+    when = datetime.datetime.fromisoformat(arrives.replace("Z", "+00:00"))
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return max(0.0, (when - now).total_seconds())
+
+
+class ArrivalScheduler:
+    """Fires `on_arrival(ship, flight_plan)` when each tracked flight lands.
+
+    Flights sit in a heap ordered by arrival time, and a single loop timer is kept
+    armed for the earliest one, so scheduling is O(log n) with no polling. On
+    arrival the ship is refreshed with one request before the event is dispatched.
+    A ship only has one tracked flight; scheduling a new one replaces the old.
+    """
+
+    def __init__(self, client: Client):
+        self.client = client
+        self._log = logging.getLogger("spacetraders")
+
+        # (loop time, sequence, ship id). Entries whose sequence no longer matches
+        # `_pending` were replaced or cancelled and are skipped when popped
+        self._heap: List[Tuple[float, int, str]] = []
+        self._pending: Dict[str, Tuple[Ship, FlightPlan, int]] = {}
+        self._seq = itertools.count()
+
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_at = float("inf")
+
+        # The loop only holds tasks weakly, so arrivals in progress are kept here
+        self._tasks: Set[asyncio.Task] = set()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def __contains__(self, ship_id: str):
+        return ship_id in self._pending
+
+    def schedule(self, ship: Ship, plan: FlightPlan):
+        """Track a flight. Plans that already ended are ignored"""
+        if plan.terminated:
+            return
+
+        loop = asyncio.get_event_loop()
+        when = loop.time() + seconds_until(plan)
+        seq = next(self._seq)
+
+        self._pending[ship.id] = (ship, plan, seq)
+        heapq.heappush(self._heap, (when, seq, ship.id))
+
+        if when < self._timer_at:
+            self._arm(loop, when)
+
+    def cancel(self, ship_id: str):
+        self._pending.pop(ship_id, None)
+
+    def close(self):
+        """Stop tracking every flight"""
+        if self._timer is not None:
+            self._timer.cancel()
+
+        self._timer = None
+        self._timer_at = float("inf")
+        self._heap.clear()
+        self._pending.clear()
+
+        for task in self._tasks:
+            task.cancel()
+
+    def _arm(self, loop: asyncio.AbstractEventLoop, when: float):
+        if self._timer is not None:
+            self._timer.cancel()
+
+        self._timer = loop.call_at(when, self._fire, loop)
+        self._timer_at = when
+
+    def _fire(self, loop: asyncio.AbstractEventLoop):
+        self._timer = None
+        self._timer_at = float("inf")
+        now = loop.time()
+
+        # Pops everything due, plus any stale entries in front of the next flight
+        while self._heap:
+            when, seq, ship_id = self._heap[0]
+            entry = self._pending.get(ship_id)
+            current = entry is not None and entry[2] == seq
+
+            if current and when > now:
+                break
+
+            heapq.heappop(self._heap)
+            if current:
+                del self._pending[ship_id]
+                task = loop.create_task(self._arrive(entry[0], entry[1]))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+        if self._heap:
+            self._arm(loop, self._heap[0][0])
+
+    async def _arrive(self, ship: Ship, plan: FlightPlan):
+        try:
+            await ship.update()
+        except Exception:
+            self._log.exception(f"Could not refresh ship {ship.id} on arrival")
+
+        if self.client.events.get("on_arrival"):
+            await self.client._dispatch("on_arrival", ship, plan)
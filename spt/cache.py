@@ -0,0 +1,179 @@
+import json
+import logging
+import os
+import time
+
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from .route import Route
+
+# Path template -> seconds a GET response stays fresh. Routes not listed aren't cached
+DEFAULT_TTLS: Dict[str, float] = {
+    "/types/goods": 86400.0,
+    "/types/loans": 86400.0,
+    "/types/ships": 86400.0,
+    "/types/structures": 86400.0,
+    "/systems/{systemSymbol}": 3600.0,
+    "/systems/{systemSymbol}/locations": 3600.0,
+}
+
+_SHIP = ("/my/ships", "/my/ships/{shipId}")
+
+# (method, path template) of a mutating call -> templates whose entries it makes stale
+INVALIDATES: Dict[Tuple[str, str], Tuple[str, ...]] = {
+    ("POST", "/my/purchase-orders"): _SHIP + ("/my/account",),
+    ("POST", "/my/sell-orders"): _SHIP + ("/my/account",),
+    ("POST", "/my/ships"): _SHIP + ("/my/account",),
+    ("DELETE", "/my/ships/{shipId}/"): _SHIP + ("/my/account",),
+    ("POST", "/my/ships/{shipId}/jettison"): _SHIP,
+    ("POST", "/my/ships/{fromShipId}/transfer"): _SHIP,
+    ("POST", "/my/flight-plans"): _SHIP,
+    ("POST", "/my/warp-jumps"): _SHIP,
+    ("POST", "/my/loans"): ("/my/loans", "/my/account"),
+    ("PUT", "/my/loans/{loanId}"): ("/my/loans", "/my/account"),
+    ("POST", "/my/structures"): ("/my/structures", "/my/account"),
+    ("POST", "/my/structures/{structureId}/deposit"): _SHIP
+    + ("/my/structures", "/my/structures/{structureId}"),
+    ("POST", "/my/structures/{structureId}/transfer"): _SHIP
+    + ("/my/structures", "/my/structures/{structureId}"),
+    ("POST", "/structures/{structureId}/deposit"): _SHIP
+    + ("/structures/{structureId}",),
+}
+
+
+class ResponseCache:
+    """A TTL + LRU cache of decoded responses, keyed by route.
+
+    Only GET routes with a TTL are stored. The cache is bounded both by entry
+    count and by the approximate encoded size of its values, evicting the least
+    recently used entries first. Pass `path` to persist it across restarts.
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        max_entries: int = 1024,
+        max_bytes: int = 8 * 1024 * 1024,
+        path: Optional[str] = None,
+    ):
+        self._log = logging.getLogger("spacetraders-http")
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.path = path
+
+        # key -> [expires at (wall clock), size, template, value]
+        self._entries: "OrderedDict[str, list]" = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, route: Route) -> Optional[dict]:
+        """The cached response for `route`, or None if missing or stale"""
+        if route.method.upper() != "GET" or route.path not in self.ttls:
+            return None
+
+        key = route.key
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if entry[0] <= time.time():
+            self._drop(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[3]
+
+    def update(self, route: Route, value: dict):
+        """Store a fresh response, or drop entries a mutating call made stale.
+
+        Mutating calls missing from INVALIDATES leave the cache alone.
+        """
+        method = route.method.upper()
+
+        if method != "GET":
+            stale = INVALIDATES.get((method, route.path))
+            if stale:
+                self.invalidate(*stale)
+            return
+
+        ttl = self.ttls.get(route.path)
+        if not ttl:
+            return
+
+        self.put(route.key, route.path, value, time.time() + ttl)
+
+    def put(self, key: str, template: str, value: dict, expires: float):
+        size = len(json.dumps(value))
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._drop(key)
+
+        self._entries[key] = [expires, size, template, value]
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key)
+        self._bytes -= entry[1]
+
+    def invalidate(self, *templates: str):
+        """Drop every entry for the given path templates, or everything if none given"""
+        if not templates:
+            self._entries.clear()
+            self._bytes = 0
+            return
+
+        stale = [k for k, e in self._entries.items() if e[2] in templates]
+        for key in stale:
+            self._drop(key)
+
+    def save(self, path: Optional[str] = None):
+        """Write unexpired entries to disk"""
+        path = path or self.path
+        if path is None:
+            return
+
+        now = time.time()
+        entries = [[k] + e for k, e in self._entries.items() if e[0] > now]
+
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(entries, f)
+        os.replace(tmp, path)
+
+    def load(self, path: Optional[str] = None):
+        """Read entries saved by `save`, skipping any that expired since"""
+        path = path or self.path
+        now = time.time()
+
+        try:
+            with open(path) as f:
+                entries: Iterable[list] = json.load(f)
+        except (OSError, ValueError):
+            self._log.warning(f"Could not load response cache from {path}")
+            return
+
+        for key, expires, _, template, value in entries:
+            if expires > now:
+                self.put(key, template, value, expires)
@@ -0,0 +1,152 @@
+from array import array
+from operator import add
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .enum import Goods
+
+GOODS: List[str] = [g.value for g in Goods]
+
+# Good symbol -> slot in a Cargo's arrays
+ORDINAL: Dict[str, int] = {g: i for i, g in enumerate(GOODS)}
+
+
+def _symbol(good: Union[str, Goods]) -> str:
+    return good.value if isinstance(good, Goods) else good
+
+
+class Cargo:
+    """A hold's contents as quantity and volume counts per good.
+
+    Counts live in two arrays indexed by `Goods` ordinal, so looking a good up is
+    O(1) and summing holds is a pass over fixed-size arrays. Goods the enum
+    doesn't know go in a small dict alongside. `capacity` is the hold size and
+    `space` the free volume the API reported, when known.
+    """
+
+    __slots__ = ("quantities", "volumes", "extra", "capacity", "_space", "source")
+
+    def __init__(
+        self,
+        items: Iterable[dict] = (),
+        capacity: int = 0,
+        space: Optional[int] = None,
+    ):
+        self.quantities = array("q", bytes(8 * len(GOODS)))
+        self.volumes = array("q", bytes(8 * len(GOODS)))
+        self.extra: Dict[str, List[int]] = {}
+        self.capacity = capacity
+        self._space: Optional[int] = None
+
+        # The payload list this was read from, so owners can tell when it's stale
+        self.source: Optional[list] = None
+
+        for item in items:
+            quantity = item.get("quantity", 0)
+            self.add(item["good"], quantity, item.get("totalVolume", quantity))
+
+        # Reported after loading, since it already accounts for the items
+        self._space = space
+
+    def add(self, good: Union[str, Goods], quantity: int, volume: int = None):
+        """Count `quantity` more of a good, taking `volume` (default 1 per unit)"""
+        good = _symbol(good)
+        volume = quantity if volume is None else volume
+        i = ORDINAL.get(good)
+
+        if i is None:
+            counts = self.extra.setdefault(good, [0, 0])
+            counts[0] += quantity
+            counts[1] += volume
+        else:
+            self.quantities[i] += quantity
+            self.volumes[i] += volume
+
+        if self._space is not None:
+            self._space -= volume
+
+    def __getitem__(self, good: Union[str, Goods]) -> int:
+        """Quantity held of a good, 0 if none"""
+        good = _symbol(good)
+        i = ORDINAL.get(good)
+        if i is None:
+            return self.extra.get(good, (0, 0))[0]
+        return self.quantities[i]
+
+    def volume(self, good: Union[str, Goods]) -> int:
+        """Volume a good takes up in the hold"""
+        good = _symbol(good)
+        i = ORDINAL.get(good)
+        if i is None:
+            return self.extra.get(good, (0, 0))[1]
+        return self.volumes[i]
+
+    def __contains__(self, good: Union[str, Goods]) -> bool:
+        return self[good] > 0
+
+    def __iter__(self) -> Iterator[Tuple[str, int]]:
+        """(good, quantity) for every good held"""
+        for good, quantity in zip(GOODS, self.quantities):
+            if quantity:
+                yield good, quantity
+        for good, (quantity, _) in self.extra.items():
+            if quantity:
+                yield good, quantity
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    @property
+    def used(self) -> int:
+        return sum(self.volumes) + sum(v for _, v in self.extra.values())
+
+    @property
+    def space(self) -> int:
+        """Free volume, as reported by the API or worked out from `capacity`"""
+        return self.capacity - self.used if self._space is None else self._space
+
+    def fits(
+        self, good: Union[str, Goods], quantity: int, per_unit: int = None
+    ) -> bool:
+        """Whether `quantity` more of a good fits, at `per_unit` volume each.
+
+        Without `per_unit` the volume per unit of what is already held is used,
+        or 1 for a good not held yet.
+        """
+        if per_unit is None:
+            held = self[good]
+            per_unit = self.volume(good) // held if held else 1
+
+        return quantity * per_unit <= self.space
+
+    def to_list(self) -> List[dict]:
+        """Back to the API's list of {"good", "quantity", "totalVolume"}"""
+        return [
+            {"good": good, "quantity": quantity, "totalVolume": self.volume(good)}
+            for good, quantity in self
+        ]
+
+    @classmethod
+    def sum(cls, holds: Iterable["Cargo"]) -> "Cargo":
+        """Everything in many holds, added up in one pass"""
+        total = cls()
+        quantities, volumes = total.quantities, total.volumes
+        capacity = space = 0
+
+        for hold in holds:
+            quantities = array("q", map(add, quantities, hold.quantities))
+            volumes = array("q", map(add, volumes, hold.volumes))
+            for good, (quantity, volume) in hold.extra.items():
+                counts = total.extra.setdefault(good, [0, 0])
+                counts[0] += quantity
+                counts[1] += volume
+            capacity += hold.capacity
+            space += hold.space
+
+        total.quantities, total.volumes = quantities, volumes
+        total.capacity = capacity
+        total._space = space
+        return total
+
+    def __repr__(self):
+        held = ", ".join(f"{good}={quantity}" for good, quantity in self)
+        return f"<Cargo {held} space={self.space}>"
@@ -1,112 +1,170 @@
 import logging
 import asyncio
-import traceback
-import pprint
+import time
 
+from .arrivals import ArrivalScheduler
+from .fleet import Fleet
 from .http import Route, HTTPClient
+from .metrics import EventMetrics
+from .pool import HTTPClientPool
 from .user import User, PartialUser
 from .flight import FlightPlan
 from .loan import Loan
 from .ship import Ship
 from .structure import Structure, OwnedStructure
 
-from typing import Coroutine, Dict, List, Tuple
-
-
-class __Colour:
-    """
-    An class holding colour codes.
-    """
-
-    black = "\033[0;30m"
-    red = "\033[0;31m"
-    green = "\033[0;32m"
-    brown = "\033[0;33m"
-    blue = "\033[0;34m"
-    purple = "\033[0;35m"
-    cyan = "\033[0;36m"
-    lightgrey = "\033[0;37m"
-    grey = "\033[1;30m"
-    lightred = "\033[1;31m"
-    lime = "\033[1;32m"
-    yellow = "\033[1;33m"
-    lightblue = "\033[1;34m"
-    lightpurple = "\033[1;35m"
-    lightcyan = "\033[1;36m"
-    white = "\033[1;37m"
-    bold = "\033[1m"
-    faint = "\033[2m"
-    italic = "\033[3m"
-    underline = "\033[4m"
-    blink = "\033[5m"
-    crossed = "\033[9m"
-    end = "\033[0m"
+from typing import Coroutine, Dict, List, Optional, Set, Tuple, Union
 
 
 class Client:
-    def __init__(self, token: str, **kwargs):
-        """Client for Spacetraders"""
+    def __init__(self, token: Union[str, List[str]], **kwargs):
+        """Client for Spacetraders. Pass a list of tokens to use several accounts"""
         self._log = logging.getLogger("spacetraders")
         self.loop: asyncio.AbstractEventLoop = (
             asyncio.get_event_loop()
             if kwargs.get("loop", None) is None
-            else kwargs.get("loop", None)
+            else kwargs.pop("loop")
         )
-        self.http = HTTPClient(token, self.loop, **kwargs)
+        kwargs.pop("loop", None)
+        self.http = (
+            HTTPClientPool(list(token), self.loop, **kwargs)
+            if isinstance(token, (list, tuple))
+            else HTTPClient(token, self.loop, **kwargs)
+        )
+        self.identity = self.http.identity
+        self.arrivals = ArrivalScheduler(self)
+        self.http.arrivals = self.arrivals
         self.events: Dict[str, List[Coroutine]] = {"on_ready": [self.on_ready]}
 
+        # Handlers of one event run concurrently, at most this many at once
+        self.dispatch_concurrency: Optional[int] = kwargs.get("dispatch_concurrency")
+        self.dispatch_timeout: Optional[float] = kwargs.get("dispatch_timeout")
+        self.event_metrics: Dict[str, EventMetrics] = {}
+        self.__limits: Dict[str, Optional[int]] = {}
+        self.__semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.__timeouts: Dict[Tuple[str, Coroutine], Optional[float]] = {}
+
+        # The loop only holds tasks weakly, so handlers still running are kept here
+        self._tasks: Set[asyncio.Task] = set()
+
         # Attempt test of token
         # self.profile = User(loop.run_until_complete(self.test()))
 
     async def on_ready(self):
         pass
 
-    def event(self, event_name: str = None):
+    def event(
+        self,
+        event_name: str = None,
+        timeout: Optional[float] = None,
+        concurrency: Optional[int] = None,
+    ):
+        """Register an event handler. Must be a coroutine
+
+        `timeout` cancels this handler if it runs longer, and `concurrency` caps how
+        many of the event's handlers run at once. They default to the client's
+        `dispatch_timeout` and `dispatch_concurrency`.
+        """
+
         def inner(func: Coroutine):
-            """Register an event. Must be a coroutine"""
             name = func.__name__ if event_name is None else event_name
 
-            # Look up the name in the event's dictionary and see if they are registered
-            is_present = self.events.get(name, False)
-
-            if not is_present:
-                self.events[name] = [
-                    func,
-                ]
-
-                return func
-
-            else:
-                self.events[name].append(func)
+            self.events.setdefault(name, []).append(func)
+            self.__timeouts[(name, func)] = timeout
+            if concurrency is not None:
+                self.__limits[name] = concurrency
+                self.__semaphores.pop(name, None)
 
             return func
 
         return inner
 
-    def _raise_warning(self):
-        print(__Colour.red)
-        traceback.print_exc()
-        print(__Colour.end)
+    def dispatch(self, event_name: str, *args, **kwargs) -> List[asyncio.Task]:
+        """Starts an event's handlers as tasks and returns them without waiting.
 
-    async def _dispatch(self, event_name: str):
-        """Dispatches an event. The event must be a coroutine"""
-        self._log.info(f"Dispatching event {event_name}")
-        coro_list = self.events.get(event_name, None)
+        The client keeps the tasks until they finish, so the result can be dropped.
+        """
+        self._log.debug(f"Dispatching event {event_name}")
+        handlers = self.events.get(event_name)
 
-        if coro_list is None or len(coro_list) == 0:
+        if not handlers:
             self._log.warning(f"Event {event_name} is not registered to any coroutines")
-            return
-
-        for coro in coro_list:
-            try:
-                if not asyncio.iscoroutinefunction(coro):
-                    self._log.warning(
-                        f"Event {event_name} func {coro.__name__} is not a coroutine"
-                    )
-                    continue
-                await coro()
-            except Exception:
-                self._raise_warning()
+            return []
+
+        metrics = self.event_metrics.get(event_name)
+        if metrics is None:
+            metrics = self.event_metrics[event_name] = EventMetrics()
+        metrics.dispatched += 1
+
+        semaphore = self.__semaphore(event_name)
+        started = time.perf_counter()
+        tasks = []
+
+        for handler in handlers:
+            if not asyncio.iscoroutinefunction(handler):
+                self._log.warning(
+                    f"Event {event_name} func {handler.__name__} is not a coroutine"
+                )
+                continue
+
+            coro = self.__run(
+                event_name, handler, semaphore, started, metrics, args, kwargs
+            )
+            task = asyncio.ensure_future(coro)
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            tasks.append(task)
+
+        return tasks
+
+    async def _dispatch(self, event_name: str, *args, **kwargs):
+        """Dispatches an event and waits for all of its handlers to finish"""
+        tasks = self.dispatch(event_name, *args, **kwargs)
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    def __semaphore(self, event_name: str) -> Optional[asyncio.Semaphore]:
+        limit = self.__limits.get(event_name, self.dispatch_concurrency)
+        if limit is None:
+            return None
+
+        # Made on first use so it binds to the running loop
+        semaphore = self.__semaphores.get(event_name)
+        if semaphore is None:
+            semaphore = self.__semaphores[event_name] = asyncio.Semaphore(limit)
+
+        return semaphore
+
+    async def __run(
+        self,
+        event_name: str,
+        handler: Coroutine,
+        semaphore: Optional[asyncio.Semaphore],
+        started: float,
+        metrics: EventMetrics,
+        args: tuple,
+        kwargs: dict,
+    ):
+        timeout = self.__timeouts.get((event_name, handler))
+        if timeout is None:
+            timeout = self.dispatch_timeout
+
+        try:
+            if semaphore is not None:
+                async with semaphore:
+                    await asyncio.wait_for(handler(*args, **kwargs), timeout)
+            else:
+                await asyncio.wait_for(handler(*args, **kwargs), timeout)
+        except asyncio.TimeoutError:
+            metrics.timeouts += 1
+            self._log.warning(
+                f"Event {event_name} func {handler.__name__} timed out after {timeout}s"
+            )
+        except Exception:
+            metrics.failures += 1
+            self._log.exception(f"Event {event_name} func {handler.__name__} failed")
+        finally:
+            metrics.observe(time.perf_counter() - started)
 
     def start(self, func: Coroutine = None):
         """
@@ -116,15 +174,28 @@ class Client:
         ```
         try:
             self.loop.run_until_complete(func())
-        except Exception as e:
-            raise e
+        finally:
+            self.loop.run_until_complete(self.close())
         """
 
         try:
             self.loop.create_task(self._dispatch("on_ready"))
             self.loop.run_until_complete(func())
-        except Exception as e:
-            raise e
+        finally:
+            self.loop.run_until_complete(self.close())
+
+    async def close(self):
+        """Stop tracking flights, then drain and close the HTTP client"""
+        self.arrivals.close()
+        await self.http.close()
+
+    async def __aenter__(self):
+        await self.http.start()
+        self.dispatch("on_ready")
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
 
     @property
     async def account(self) -> User:
@@ -150,16 +221,26 @@ class Client:
     async def loans(self) -> List[Loan]:
         result = await self.http.loan_get_all()
 
-        return [Loan(self.http, x) for x in result["loans"]]
+        return [self.identity.load(Loan, self.http, x) for x in result["loans"]]
 
     @property
     async def ships(self) -> List[Ship]:
         result = await self.http.ship_get_all()
 
-        return [Ship(self.http, x) for x in result["ships"]]
+        return [self.identity.load(Ship, self.http, x) for x in result["ships"]]
+
+    async def fleet(self, ships: List[Ship] = None, concurrency: int = None) -> Fleet:
+        """A Fleet for bulk operations over `ships`, or every ship when not given"""
+        if ships is None:
+            ships = await self.ships
+
+        return Fleet(self.http, ships, concurrency)
 
     @property
     async def structures(self) -> List[OwnedStructure]:
         result = await self.http.structure_get_all_info()
 
-        return [OwnedStructure(self.http, x) for x in result["structures"]]
+        return [
+            self.identity.load(OwnedStructure, self.http, x)
+            for x in result["structures"]
+        ]
@@ -0,0 +1,48 @@
+import json
+
+from typing import Any, Callable, Optional
+
+# Tried in this order when no backend is asked for
+BACKENDS = ("orjson", "msgspec", "json")
+
+
+def _backend(name: str) -> Optional[Callable[[bytes], Any]]:
+    if name == "orjson":
+        try:
+            import orjson
+        except ImportError:
+            return None
+        return orjson.loads
+
+    if name == "msgspec":
+        try:
+            import msgspec
+        except ImportError:
+            return None
+        return msgspec.json.Decoder().decode
+
+    if name == "json":
+        return json.loads
+
+    raise ValueError(f"Unknown JSON backend {name!r}")
+
+
+class Decoder:
+    """Decodes response bodies with the fastest JSON library installed.
+
+    orjson is preferred, then msgspec, then the standard library. Pass `backend`
+    to force one; it must be installed.
+    """
+
+    def __init__(self, backend: Optional[str] = None):
+        for name in (backend,) if backend else BACKENDS:
+            loads = _backend(name)
+            if loads is not None:
+                self.name: str = name
+                self.loads: Callable[[bytes], Any] = loads
+                return
+
+        raise ImportError(f"JSON backend {backend!r} is not installed")
+
+    def __call__(self, body: bytes) -> Any:
+        return self.loads(body) if body else {}
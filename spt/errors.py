@@ -10,3 +10,25 @@ class HTTPError(SPTError):
 
 class ReachedMaximumRetries(HTTPError):
     pass
+
+
+class ReplayExhausted(HTTPError):
+    """Raised when a replay has no recorded response for a request"""
+
+
+class ServerError(HTTPError):
+    """Raised for a 5xx or 429 response that was not, or could no longer be, retried"""
+
+    def __init__(self, message: str, status: int, retry_after: float = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class CircuitOpen(HTTPError):
+    """Raised without sending when a host's circuit breaker is open"""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"Circuit for {host} is open, retry in {retry_in:.1f}s")
+        self.host = host
+        self.retry_in = retry_in
@@ -0,0 +1,219 @@
+"""Market polls turned into a stream of what changed.
+
+    feed = MarketFeed(client)
+
+    @client.event()
+    async def on_market_change(changes):
+        for change in changes:
+            print(change.location, change.good, change.kind, change.buy_delta)
+
+    await feed.run(["OE-PM", "OE-PM-TR"], interval=10)
+
+or, without events, `async for change in feed.changes(): ...`.
+"""
+
+import asyncio
+import logging
+import math
+import time
+
+from typing import AsyncIterator, Dict, Iterable, List, NamedTuple, Optional, Set
+
+# Listing fields compared between polls
+FIELDS = ("purchasePricePerUnit", "sellPricePerUnit", "quantityAvailable")
+
+
+class MarketChange(NamedTuple):
+    """One good at one location that differs from the previous poll.
+
+    `kind` is "added", "removed" or "changed". `old` is None for added goods and
+    `new` is None for removed ones.
+    """
+
+    location: str
+    good: str
+    kind: str
+    old: Optional[dict]
+    new: Optional[dict]
+    ts: float
+
+    def _delta(self, field: str) -> float:
+        before = (self.old or {}).get(field) or 0
+        after = (self.new or {}).get(field) or 0
+        return after - before
+
+    @property
+    def buy_delta(self) -> float:
+        return self._delta("purchasePricePerUnit")
+
+    @property
+    def sell_delta(self) -> float:
+        return self._delta("sellPricePerUnit")
+
+    @property
+    def quantity_delta(self) -> float:
+        return self._delta("quantityAvailable")
+
+
+class Rolling:
+    """Time-weighted EWMA, min and max of a value that only changes on updates.
+
+    The value is held constant between updates, so the average can be brought up
+    to any moment exactly and is only touched when the value moves.
+    """
+
+    __slots__ = ("halflife", "value", "since", "_ewma", "low", "high", "updates")
+
+    def __init__(self, value: float, ts: float, halflife: float):
+        self.halflife = halflife
+        self.value = value
+        self.since = ts
+        self._ewma = value
+        self.low = value
+        self.high = value
+        self.updates = 1
+
+    def _decayed(self, ts: float) -> float:
+        weight = math.exp(-max(0.0, ts - self.since) * math.log(2) / self.halflife)
+        return self.value + (self._ewma - self.value) * weight
+
+    def update(self, value: float, ts: float):
+        self._ewma = self._decayed(ts)
+        self.since = ts
+        self.value = value
+        self.low = min(self.low, value)
+        self.high = max(self.high, value)
+        self.updates += 1
+
+    def ewma(self, ts: Optional[float] = None) -> float:
+        """The average as of `ts`, now by default"""
+        return self._decayed(time.time() if ts is None else ts)
+
+
+class GoodStats:
+    """Rolling stats for one good at one location"""
+
+    __slots__ = ("buy", "sell", "quantity")
+
+    def __init__(self, item: dict, ts: float, halflife: float):
+        self.buy = Rolling(item.get("purchasePricePerUnit") or 0, ts, halflife)
+        self.sell = Rolling(item.get("sellPricePerUnit") or 0, ts, halflife)
+        self.quantity = Rolling(item.get("quantityAvailable") or 0, ts, halflife)
+
+    def update(self, item: dict, ts: float):
+        for rolling, field in zip((self.buy, self.sell, self.quantity), FIELDS):
+            value = item.get(field) or 0
+            if value != rolling.value:
+                rolling.update(value, ts)
+
+
+class MarketFeed:
+    """Diffs successive marketplace listings per location and emits the changes.
+
+    Changes for a poll are dispatched together as `on_market_change(changes)` when
+    the client has a handler for it, and queued for every `changes()` iterator.
+    Stats for a good are only touched when it changes, so downstream work follows
+    the number of changes rather than the size of the markets. `halflife` is in
+    seconds. An iterator that falls more than `backlog` changes behind loses the
+    oldest ones, counted in `dropped`.
+    """
+
+    def __init__(
+        self, client=None, http=None, halflife: float = 3600.0, backlog: int = 10000
+    ):
+        self.client = client
+        self.http = http if http is not None or client is None else client.http
+        self.halflife = halflife
+        self.backlog = backlog
+        self.dropped = 0
+        self._log = logging.getLogger("spacetraders")
+
+        self._markets: Dict[str, Dict[str, dict]] = {}
+        self._listings: Dict[str, list] = {}
+        self._stats: Dict[str, Dict[str, GoodStats]] = {}
+        self._queues: Set[asyncio.Queue] = set()
+
+    def stats(self, location: str, good: str) -> Optional[GoodStats]:
+        return self._stats.get(location, {}).get(good)
+
+    def market(self, location: str) -> Dict[str, dict]:
+        """The last listing seen for a location, by good"""
+        return self._markets.get(location, {})
+
+    def update(
+        self, location: str, listing: List[dict], ts: Optional[float] = None
+    ) -> List[MarketChange]:
+        """Diff a listing against the last one for its location and emit changes"""
+        # A response cache hands back the same list while nothing could have changed
+        if self._listings.get(location) is listing:
+            return []
+
+        ts = time.time() if ts is None else ts
+        before = self._markets.get(location, {})
+        after = {item["symbol"]: item for item in listing}
+        stats = self._stats.setdefault(location, {})
+        changes = []
+
+        for good, item in after.items():
+            old = before.get(good)
+            if old is None:
+                changes.append(MarketChange(location, good, "added", None, item, ts))
+                if good in stats:
+                    stats[good].update(item, ts)
+                else:
+                    stats[good] = GoodStats(item, ts, self.halflife)
+            elif any(old.get(f) != item.get(f) for f in FIELDS):
+                changes.append(MarketChange(location, good, "changed", old, item, ts))
+                stats[good].update(item, ts)
+
+        for good, old in before.items():
+            if good not in after:
+                changes.append(MarketChange(location, good, "removed", old, None, ts))
+
+        self._markets[location] = after
+        self._listings[location] = listing
+
+        if changes:
+            self._emit(changes)
+        return changes
+
+    def _emit(self, changes: List[MarketChange]):
+        for queue in self._queues:
+            for change in changes:
+                if queue.full():
+                    queue.get_nowait()
+                    self.dropped += 1
+                queue.put_nowait(change)
+
+        client = self.client
+        if client is not None and client.events.get("on_market_change"):
+            client.dispatch("on_market_change", changes)
+
+    async def changes(self) -> AsyncIterator[MarketChange]:
+        """Yields every change emitted after iteration starts"""
+        queue: asyncio.Queue = asyncio.Queue(self.backlog)
+        self._queues.add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._queues.discard(queue)
+
+    async def poll(self, location: str) -> List[MarketChange]:
+        """Fetch a location's market and emit what changed since the last poll"""
+        result = await self.http.location_get_market(location)
+        return self.update(location, result.get("marketplace", []))
+
+    async def run(self, locations: Iterable[str], interval: float = 10.0):
+        """Poll `locations` concurrently every `interval` seconds until cancelled"""
+        locations = list(locations)
+        while True:
+            started = time.monotonic()
+            results = await asyncio.gather(
+                *(self.poll(loc) for loc in locations), return_exceptions=True
+            )
+            for location, result in zip(locations, results):
+                if isinstance(result, Exception):
+                    self._log.warning(f"Could not poll market {location}: {result!r}")
+
+            await asyncio.sleep(max(0.0, interval - (time.monotonic() - started)))
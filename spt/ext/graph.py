@@ -0,0 +1,176 @@
+"""Distances, fuel and travel times between the locations of a system.
+
+    graph = await SystemGraph.fetch(client.http, "OE")
+    path = graph.route("GR-MK-I", "OE-PM", "OE-W-XV")
+    seconds = graph.eta(ship, ship.location, "OE-NY")
+
+All-pairs matrices are built once with NumPy, and shortest multi-hop routes with
+refuel stops are solved once per ship profile and cached, so planning for a fleet
+is index lookups. Needs NumPy (`pip install numpy`).
+"""
+
+import asyncio
+
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError("spt.ext.graph needs NumPy: pip install numpy") from e
+
+from ..http import HTTPClient
+from ..model import Model
+from .trade import GRAVITY_WELLS, distances, flight_time, fuel_cost
+
+# Used for ship types `type_ships` didn't describe
+DEFAULT_TYPE = {"speed": 1, "maxCargo": 100}
+
+
+def fingerprint(locations: Iterable[dict]) -> int:
+    """Changes whenever a location is added, removed, moved or retyped"""
+    return hash(
+        tuple(
+            sorted(
+                (loc["symbol"], loc.get("x", 0), loc.get("y", 0), loc.get("type"))
+                for loc in locations
+            )
+        )
+    )
+
+
+class Routes:
+    """Shortest routes for one ship profile, by total travel time.
+
+    `time[i, j]` is the fastest way from location i to j, refuelling at stops on
+    the way, inf if it can't be done. `next[i, j]` is the first hop of it.
+    """
+
+    def __init__(self, time: "np.ndarray", next: "np.ndarray"):
+        self.time = time
+        self.next = next
+
+
+class SystemGraph:
+    """A system's locations as a graph weighted by distance, fuel and time.
+
+    `distance` and `fuel` are location x location matrices in `locations` order.
+    A direct hop needs its fuel to fit in the ship's hold, so longer trips go via
+    stops in `refuel` (every location unless given) where it can top up. Routes are
+    cached per (speed, hold) and dropped when `update` sees the locations change.
+    """
+
+    def __init__(
+        self,
+        locations: List[dict],
+        ship_types: Iterable[dict] = (),
+        refuel: Optional[Iterable[str]] = None,
+    ):
+        self.types: Dict[str, dict] = {t["type"]: t for t in ship_types}
+        self._refuel = None if refuel is None else set(refuel)
+        self._routes: Dict[Tuple[float, float], Routes] = {}
+        self.fingerprint: Optional[int] = None
+        self.update(locations)
+
+    @classmethod
+    async def fetch(
+        cls, http: HTTPClient, system: str, refuel: Optional[Iterable[str]] = None
+    ) -> "SystemGraph":
+        """Build a graph from a system's locations and the game's ship types"""
+        locations, types = await asyncio.gather(
+            http.system_get_locations(system), http.type_ships()
+        )
+        return cls(locations["locations"], types.get("ships", ()), refuel)
+
+    async def refresh(self, http: HTTPClient, system: str) -> bool:
+        """Re-read a system's locations, rebuilding only if they changed"""
+        result = await http.system_get_locations(system)
+        return self.update(result["locations"])
+
+    def update(self, locations: List[dict]) -> bool:
+        """Rebuild from `locations` if they differ. Returns whether it rebuilt"""
+        key = fingerprint(locations)
+        if key == self.fingerprint:
+            return False
+
+        self.fingerprint = key
+        self.locations: List[str] = [loc["symbol"] for loc in locations]
+        self.index: Dict[str, int] = {s: i for i, s in enumerate(self.locations)}
+
+        x = np.array([loc.get("x", 0) for loc in locations], dtype=float)
+        y = np.array([loc.get("y", 0) for loc in locations], dtype=float)
+        well = np.array([loc.get("type") in GRAVITY_WELLS for loc in locations])
+
+        self.distance = distances(x, y)
+        self.fuel = fuel_cost(self.distance, well)
+        self.stops = np.array(
+            [self._refuel is None or s in self._refuel for s in self.locations]
+        )
+        self._routes.clear()
+        return True
+
+    def profile(self, ship: Union[str, Model, dict]) -> Tuple[float, float]:
+        """(speed, hold) of a ship, or of a ship type given its name"""
+        if isinstance(ship, str):
+            data = self.types.get(ship, DEFAULT_TYPE)
+        else:
+            data = ship.data if isinstance(ship, Model) else ship
+            data = {**self.types.get(data.get("type"), DEFAULT_TYPE), **data}
+
+        return float(data.get("speed") or 1), float(data.get("maxCargo") or 0)
+
+    def travel_time(self, ship: Union[str, Model, dict]) -> "np.ndarray":
+        """Seconds for every direct hop at the ship's speed"""
+        speed, _ = self.profile(ship)
+        return flight_time(self.distance, speed)
+
+    def routes(self, ship: Union[str, Model, dict]) -> Routes:
+        """All-pairs shortest routes for a ship, solved on first use"""
+        key = self.profile(ship)
+        routes = self._routes.get(key)
+        if routes is None:
+            routes = self._routes[key] = self._solve(*key)
+        return routes
+
+    def _solve(self, speed: float, hold: float) -> Routes:
+        n = len(self.locations)
+        time = flight_time(self.distance, speed)
+        time[self.fuel > hold] = np.inf
+        np.fill_diagonal(time, 0)
+
+        nxt = np.broadcast_to(np.arange(n), (n, n)).copy()
+        nxt[np.isinf(time)] = -1
+
+        # Floyd-Warshall, one vectorized relaxation per stop a ship can refuel at
+        for k in np.flatnonzero(self.stops):
+            via = time[:, k, None] + time[k]
+            better = via < time
+            np.copyto(time, via, where=better)
+            np.copyto(nxt, nxt[:, k, None], where=better)
+
+        return Routes(time, nxt)
+
+    def route(
+        self, ship: Union[str, Model, dict], origin: str, destination: str
+    ) -> Optional[List[str]]:
+        """Locations visited from `origin` to `destination`, None if unreachable"""
+        routes = self.routes(ship)
+        i, j = self.index[origin], self.index[destination]
+        if routes.next[i, j] < 0:
+            return None
+
+        path = [origin]
+        while i != j:
+            i = int(routes.next[i, j])
+            path.append(self.locations[i])
+        return path
+
+    def eta(self, ship: Union[str, Model, dict], origin: str, destination: str):
+        """Seconds for the fastest route, inf if unreachable"""
+        return float(
+            self.routes(ship).time[self.index[origin], self.index[destination]]
+        )
+
+    def fuel_for(self, path: List[str]) -> List[int]:
+        """Fuel burnt on each hop of a route"""
+        hops = [self.index[s] for s in path]
+        return [int(self.fuel[a, b]) for a, b in zip(hops, hops[1:])]
@@ -0,0 +1,412 @@
+"""Append-only, columnar market history that reads back as memory-mapped arrays.
+
+    history = MarketHistory("markets/")
+    await history.record(client.http, "OE-PM")
+    prices = history.query("OE-PM", "FUEL", start=time.time() - 86400)
+    prices["buy"].mean()
+
+Every listing row becomes one record of timestamp, location, good, buy and sell
+price and quantity. Each column is its own flat binary file, so a query only
+pages in the columns and time range it touches. Needs NumPy (`pip install numpy`).
+"""
+
+import json
+import logging
+import os
+import shutil
+import time
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError("spt.ext.history needs NumPy: pip install numpy") from e
+
+from ..http import HTTPClient
+
+# Column name -> on-disk dtype. Locations and goods are stored as interned codes
+COLUMNS = (
+    ("ts", "<f8"),
+    ("location", "<u2"),
+    ("good", "<u2"),
+    ("buy", "<f4"),
+    ("sell", "<f4"),
+    ("quantity", "<i4"),
+)
+
+INDEX = "index.json"
+
+
+def _empty() -> Dict[str, "np.ndarray"]:
+    return {name: np.empty(0, dtype) for name, dtype in COLUMNS}
+
+
+class MarketHistory:
+    """Market snapshots stored column by column under `path`.
+
+    Records go into the newest segment, which is sealed once it holds
+    `segment_rows` and a new one started. Timestamps only move forward, so every
+    segment is sorted by time and range queries are binary searches. `compact`
+    merges and thins out old segments a few at a time.
+    """
+
+    def __init__(self, path: str, segment_rows: int = 1 << 20):
+        self.path = path
+        self.segment_rows = segment_rows
+        self._log = logging.getLogger("spacetraders")
+
+        self.locations: List[str] = []
+        self.goods: List[str] = []
+        self._location_codes: Dict[str, int] = {}
+        self._good_codes: Dict[str, int] = {}
+
+        # {"name", "rows", "start", "end", "resolution"}; the last one is open
+        self.segments: List[dict] = []
+        self._next = 0
+        self._maps: Dict[str, Tuple[int, Dict[str, np.ndarray]]] = {}
+
+        os.makedirs(path, exist_ok=True)
+        self._load()
+
+    def __len__(self):
+        return sum(seg["rows"] for seg in self.segments)
+
+    # ==================== Storage ==================== #
+
+    def _dir(self, name: str) -> str:
+        return os.path.join(self.path, f"seg-{name}")
+
+    def _load(self):
+        try:
+            with open(os.path.join(self.path, INDEX)) as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            self._new_segment()
+            return
+
+        self.locations = index["locations"]
+        self.goods = index["goods"]
+        self._location_codes = {s: i for i, s in enumerate(self.locations)}
+        self._good_codes = {s: i for i, s in enumerate(self.goods)}
+        self.segments = index["segments"]
+        self._next = index["next"]
+        self._repair(self.segments[-1])
+
+    def _save(self):
+        """Write the index atomically"""
+        index = {
+            "locations": self.locations,
+            "goods": self.goods,
+            "segments": self.segments,
+            "next": self._next,
+        }
+        path = os.path.join(self.path, INDEX)
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(index, f)
+        os.replace(f"{path}.tmp", path)
+
+    def _new_segment(self):
+        name = f"{self._next:06d}"
+        self._next += 1
+        os.makedirs(self._dir(name), exist_ok=True)
+
+        self.segments.append(
+            {"name": name, "rows": 0, "start": None, "end": None, "resolution": 0}
+        )
+        self._save()
+
+    def _repair(self, seg: dict):
+        """Size the open segment from its files, cutting off any torn write"""
+        folder = self._dir(seg["name"])
+        os.makedirs(folder, exist_ok=True)
+
+        rows = None
+        for name, dtype in COLUMNS:
+            file = os.path.join(folder, f"{name}.bin")
+            size = os.path.getsize(file) if os.path.exists(file) else 0
+            n = size // np.dtype(dtype).itemsize
+            rows = n if rows is None else min(rows, n)
+
+        for name, dtype in COLUMNS:
+            file = os.path.join(folder, f"{name}.bin")
+            if os.path.exists(file):
+                with open(file, "r+b") as f:
+                    f.truncate(rows * np.dtype(dtype).itemsize)
+
+        seg["rows"] = rows
+        if rows:
+            ts = np.memmap(os.path.join(folder, "ts.bin"), "<f8", "r")
+            seg["start"], seg["end"] = float(ts[0]), float(ts[rows - 1])
+        else:
+            seg["start"] = seg["end"] = None
+
+    def _columns(self, seg: dict) -> Dict[str, "np.ndarray"]:
+        """Memory-mapped columns of a segment, remapped when it has grown"""
+        cached = self._maps.get(seg["name"])
+        if cached is not None and cached[0] == seg["rows"]:
+            return cached[1]
+
+        folder = self._dir(seg["name"])
+        columns = {
+            name: np.memmap(
+                os.path.join(folder, f"{name}.bin"), dtype, "r", shape=(seg["rows"],)
+            )
+            for name, dtype in COLUMNS
+        }
+        self._maps[seg["name"]] = (seg["rows"], columns)
+        return columns
+
+    def _write(self, folder: str, columns: Dict[str, "np.ndarray"]):
+        for name, dtype in COLUMNS:
+            with open(os.path.join(folder, f"{name}.bin"), "ab") as f:
+                np.asarray(columns[name], dtype).tofile(f)
+
+    # ==================== Writing ==================== #
+
+    def _intern(self, symbol: str, codes: Dict[str, int], symbols: List[str]) -> int:
+        code = codes.get(symbol)
+        if code is None:
+            if len(symbols) > 0xFFFF:
+                raise ValueError("MarketHistory holds at most 65536 symbols of a kind")
+
+            code = codes[symbol] = len(symbols)
+            symbols.append(symbol)
+            self._save()
+
+        return code
+
+    def location_code(self, symbol: str) -> Optional[int]:
+        return self._location_codes.get(symbol)
+
+    def good_code(self, symbol: str) -> Optional[int]:
+        return self._good_codes.get(symbol)
+
+    def append(self, location: str, listing: List[dict], ts: Optional[float] = None):
+        """Store one marketplace listing, as returned by `location_get_market`"""
+        self.extend([(time.time() if ts is None else ts, location, listing)])
+
+    def extend(self, snapshots: Iterable[Tuple[float, str, List[dict]]]):
+        """Store many (timestamp, location, listing) snapshots, in time order.
+
+        Much faster than `append` for bulk imports, such as old JSON dumps.
+        """
+        last = next(
+            (s["end"] for s in reversed(self.segments) if s["end"] is not None), None
+        )
+        columns: Dict[str, list] = {name: [] for name, _ in COLUMNS}
+
+        for ts, location, listing in snapshots:
+            ts = float(ts)
+            if last is not None and ts < last:
+                raise ValueError(f"Snapshot at {ts} is older than the last one, {last}")
+            last = ts
+
+            loc = self._intern(location, self._location_codes, self.locations)
+            for item in listing:
+                columns["ts"].append(ts)
+                columns["location"].append(loc)
+                columns["good"].append(
+                    self._intern(item["symbol"], self._good_codes, self.goods)
+                )
+                columns["buy"].append(item.get("purchasePricePerUnit", np.nan))
+                columns["sell"].append(item.get("sellPricePerUnit", np.nan))
+                columns["quantity"].append(item.get("quantityAvailable", 0))
+
+        done, total = 0, len(columns["ts"])
+        while done < total:
+            seg = self.segments[-1]
+            if seg["rows"] >= self.segment_rows:
+                self._new_segment()
+                seg = self.segments[-1]
+
+            n = min(total - done, self.segment_rows - seg["rows"])
+            chunk = {name: col[done : done + n] for name, col in columns.items()}
+            self._write(self._dir(seg["name"]), chunk)
+
+            if seg["start"] is None:
+                seg["start"] = chunk["ts"][0]
+            seg["end"] = chunk["ts"][-1]
+            seg["rows"] += n
+            done += n
+
+    async def record(self, http: HTTPClient, location: str):
+        """Fetch a location's market and store it"""
+        result = await http.location_get_market(location)
+        self.append(location, result.get("marketplace", []))
+
+    # ==================== Reading ==================== #
+
+    def query(
+        self,
+        location: Optional[str] = None,
+        good: Optional[str] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> Dict[str, "np.ndarray"]:
+        """Columns of every record in [start, end) for a location and/or good.
+
+        A query that only limits time, within one segment, returns memory-mapped
+        views; anything else is copied out.
+        """
+        loc = None if location is None else self.location_code(location)
+        code = None if good is None else self.good_code(good)
+        if (location is not None and loc is None) or (
+            good is not None and code is None
+        ):
+            return _empty()
+
+        parts = []
+        for seg in self.segments:
+            if not seg["rows"]:
+                continue
+            if start is not None and seg["end"] < start:
+                continue
+            if end is not None and seg["start"] >= end:
+                continue
+
+            columns = self._columns(seg)
+            ts = columns["ts"]
+            lo = 0 if start is None else int(np.searchsorted(ts, start, "left"))
+            hi = len(ts) if end is None else int(np.searchsorted(ts, end, "left"))
+
+            mask = None
+            if loc is not None:
+                mask = columns["location"][lo:hi] == loc
+            if code is not None:
+                match = columns["good"][lo:hi] == code
+                mask = match if mask is None else mask & match
+
+            parts.append(
+                {
+                    name: col[lo:hi] if mask is None else col[lo:hi][mask]
+                    for name, col in columns.items()
+                }
+            )
+
+        if not parts:
+            return _empty()
+        if len(parts) == 1:
+            return parts[0]
+        return {name: np.concatenate([p[name] for p in parts]) for name, _ in COLUMNS}
+
+    # ==================== Compaction ==================== #
+
+    def compact(
+        self,
+        resolution: float = 3600.0,
+        older_than: float = 7 * 86400.0,
+        retain: Optional[float] = None,
+        max_segments: int = 4,
+    ) -> int:
+        """Thin out old history, a bounded amount at a time. Returns rows removed.
+
+        Sealed segments ending more than `older_than` seconds ago keep only the last
+        record per location, good and `resolution` window, and are merged into one.
+        At most `max_segments` are rewritten per call, so it can run between polls.
+        With `retain`, records older than that many seconds are dropped outright.
+        """
+        now = time.time()
+        removed = 0
+        sealed = self.segments[:-1]
+
+        if retain is not None:
+            cutoff = now - retain
+            expired = [s for s in sealed if s["rows"] and s["end"] < cutoff]
+            for seg in expired:
+                removed += seg["rows"]
+                self._drop(seg)
+
+            sealed = self.segments[:-1]
+            if sealed and sealed[0]["rows"] and sealed[0]["start"] < cutoff:
+                removed += self._rewrite([sealed[0]], None, cutoff)
+                sealed = self.segments[:-1]
+
+        batch = []
+        for seg in sealed:
+            due = seg["rows"] and seg["end"] < now - older_than
+            if not due or seg["resolution"] >= resolution:
+                if batch:
+                    break
+                continue
+
+            batch.append(seg)
+            if len(batch) == max_segments:
+                break
+
+        if batch:
+            removed += self._rewrite(batch, resolution, None)
+
+        self._save()
+        return removed
+
+    def _drop(self, seg: dict):
+        self.segments.remove(seg)
+        self._maps.pop(seg["name"], None)
+        self._save()
+        shutil.rmtree(self._dir(seg["name"]), ignore_errors=True)
+
+    def _rewrite(
+        self, batch: List[dict], resolution: Optional[float], cutoff: Optional[float]
+    ) -> int:
+        """Replace consecutive sealed segments with one, thinned and/or trimmed"""
+        parts = [self._columns(seg) for seg in batch]
+        columns = {
+            name: np.concatenate([np.asarray(p[name]) for p in parts])
+            for name, _ in COLUMNS
+        }
+        rows = len(columns["ts"])
+        keep = np.ones(rows, dtype=bool)
+
+        if cutoff is not None:
+            keep &= columns["ts"] >= cutoff
+
+        if resolution is not None:
+            # Last record of each (window, location, good), time order kept
+            window = np.floor(columns["ts"] / resolution)
+            order = np.lexsort(
+                (np.arange(rows), columns["good"], columns["location"], window)
+            )
+            sw = window[order]
+            sl = columns["location"][order]
+            sg = columns["good"][order]
+
+            last = np.ones(rows, dtype=bool)
+            last[:-1] = (sw[1:] != sw[:-1]) | (sl[1:] != sl[:-1]) | (sg[1:] != sg[:-1])
+            thin = np.zeros(rows, dtype=bool)
+            thin[order[last]] = True
+            keep &= thin
+
+        kept = int(keep.sum())
+        merged = []
+        if kept:
+            name = f"{self._next:06d}"
+            self._next += 1
+            folder = self._dir(name)
+            os.makedirs(f"{folder}.tmp", exist_ok=True)
+            self._write(f"{folder}.tmp", {k: v[keep] for k, v in columns.items()})
+            os.replace(f"{folder}.tmp", folder)
+
+            ts = columns["ts"][keep]
+            merged.append(
+                {
+                    "name": name,
+                    "rows": kept,
+                    "start": float(ts[0]),
+                    "end": float(ts[-1]),
+                    "resolution": max(
+                        [resolution or 0] + [seg["resolution"] for seg in batch]
+                    ),
+                }
+            )
+
+        at = self.segments.index(batch[0])
+        self.segments[at : at + len(batch)] = merged
+        self._save()
+
+        for seg in batch:
+            self._maps.pop(seg["name"], None)
+            shutil.rmtree(self._dir(seg["name"]), ignore_errors=True)
+
+        self._log.info(f"Compacted {len(batch)} history segments, {rows} -> {kept}")
+        return rows - kept
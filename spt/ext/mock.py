@@ -0,0 +1,907 @@
+"""A local stand-in for the SpaceTraders API.
+
+Implements the routes `spt.http.HTTPClient` calls, backed by in-memory state, with
+rate limit headers, 401/429/503 errors and injected latency. Point a client at it
+with `Client(token, base_url=server.url)`, or run it standalone:
+
+    python -m spt.ext.mock --port 8080 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import datetime
+import itertools
+import math
+import random
+import time
+
+from typing import Dict, Iterable, Optional
+
+from aiohttp import web
+
+SYSTEM = "OE"
+
+LOCATIONS = [
+    {"symbol": "OE-PM", "type": "PLANET", "name": "Prime", "x": 20, "y": -25},
+    {"symbol": "OE-PM-TR", "type": "MOON", "name": "Tritus", "x": 21, "y": -26},
+    {"symbol": "OE-CR", "type": "PLANET", "name": "Carth", "x": 17, "y": 57},
+    {"symbol": "OE-KO", "type": "PLANET", "name": "Koria", "x": -47, "y": 26},
+    {"symbol": "OE-UC", "type": "GAS_GIANT", "name": "Ucarro", "x": 74, "y": -12},
+    {"symbol": "OE-UC-AD", "type": "MOON", "name": "Ado", "x": 75, "y": -13},
+    {"symbol": "OE-UC-OB", "type": "MOON", "name": "Obo", "x": 72, "y": -10},
+    {"symbol": "OE-NY", "type": "ASTEROID", "name": "Nyon", "x": 54, "y": 64},
+    {"symbol": "OE-BO", "type": "GAS_GIANT", "name": "Bo", "x": -72, "y": -65},
+    {"symbol": "OE-W-XV", "type": "WORMHOLE", "name": "Wormhole", "x": 106, "y": -96},
+]
+
+GOODS = {
+    "FUEL": 1,
+    "CHEMICALS": 1,
+    "METALS": 1,
+    "DRONES": 2,
+    "FOOD": 1,
+    "TEXTILES": 1,
+    "MACHINERY": 4,
+    "CONSUMER_GOODS": 1,
+    "ELECTRONICS": 1,
+    "CONSTRUCTION_MATERIALS": 1,
+    "RARE_METALS": 1,
+    "SHIP_PARTS": 5,
+}
+
+SHIP_TYPES = [
+    {
+        "type": "JW-MK-I",
+        "class": "MK-I",
+        "maxCargo": 50,
+        "speed": 1,
+        "manufacturer": "Jackshaw",
+        "plating": 5,
+        "weapons": 5,
+        "price": 21125,
+    },
+    {
+        "type": "GR-MK-I",
+        "class": "MK-I",
+        "maxCargo": 100,
+        "speed": 1,
+        "manufacturer": "Gravager",
+        "plating": 10,
+        "weapons": 5,
+        "price": 42650,
+    },
+    {
+        "type": "EM-MK-I",
+        "class": "MK-I",
+        "maxCargo": 75,
+        "speed": 2,
+        "manufacturer": "Electrum",
+        "plating": 5,
+        "weapons": 10,
+        "price": 37500,
+    },
+    {
+        "type": "HM-MK-III",
+        "class": "MK-III",
+        "maxCargo": 500,
+        "speed": 1,
+        "manufacturer": "Hermes",
+        "plating": 20,
+        "weapons": 10,
+        "price": 396000,
+    },
+]
+
+LOAN_TYPES = [
+    {
+        "type": "STARTUP",
+        "amount": 200000,
+        "rate": 40,
+        "termInDays": 2,
+        "collateralRequired": False,
+    },
+]
+
+STRUCTURE_TYPES = [
+    {
+        "type": "MINE",
+        "name": "Mine",
+        "price": 100000,
+        "allowedLocationTypes": ["ASTEROID"],
+        "consumes": ["MACHINERY"],
+        "produces": ["METALS"],
+    },
+    {
+        "type": "FARM",
+        "name": "Farm",
+        "price": 75000,
+        "allowedLocationTypes": ["PLANET"],
+        "consumes": ["MACHINERY"],
+        "produces": ["FOOD"],
+    },
+]
+
+
+def _now() -> str:
+    return datetime.datetime.utcnow().isoformat(timespec="milliseconds") + "Z"
+
+
+def _error(status: int, code: int, message: str, headers: Optional[dict] = None):
+    return web.json_response(
+        {"error": {"code": code, "message": message}}, status=status, headers=headers
+    )
+
+
+class _Bucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """Take a token. Returns 0 on success, otherwise seconds until one is free"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+
+        return (1 - self.tokens) / self.rate
+
+
+class MockServer:
+    """In-memory SpaceTraders stand-in.
+
+    `latency` (+ up to `jitter`) seconds are added to every response, and a share
+    `error_rate` of requests fail with 503. Every token in `tokens` is a valid
+    account starting with `ships` ships spread over the system's locations.
+    """
+
+    def __init__(
+        self,
+        tokens: Iterable[str] = ("mock-token",),
+        rate: float = 2.0,
+        burst: int = 10,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        ships: int = 5,
+        seed: Optional[int] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.host = host
+        self.port = port
+
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._ids = itertools.count(1)
+        self._runner: Optional[web.AppRunner] = None
+
+        self.locations = {
+            l["symbol"]: dict(l, allowsConstruction=False) for l in LOCATIONS
+        }
+        self.markets = {symbol: self._make_market() for symbol in self.locations}
+        self.flight_plans: Dict[str, dict] = {}
+        self.structures: Dict[str, dict] = {}
+
+        self.users: Dict[str, dict] = {}
+        self.buckets: Dict[str, _Bucket] = {}
+        for index, token in enumerate(tokens):
+            self.users[token] = self._make_user(f"mock-user-{index}", ships)
+            self.buckets[token] = _Bucket(rate, burst)
+
+        self.app = web.Application(middlewares=[self._middleware])
+        self._add_routes()
+
+    # ==================== State ==================== #
+
+    def _id(self) -> str:
+        return f"mock{next(self._ids):08x}"
+
+    def _make_market(self) -> Dict[str, dict]:
+        market = {}
+        for good in self._random.sample(list(GOODS), k=8):
+            price = self._random.randint(2, 400)
+            spread = max(1, price // 20)
+            market[good] = {
+                "symbol": good,
+                "volumePerUnit": GOODS[good],
+                "pricePerUnit": price,
+                "spread": spread,
+                "purchasePricePerUnit": price + spread,
+                "sellPricePerUnit": price - spread,
+                "quantityAvailable": self._random.randint(100, 50000),
+            }
+
+        if "FUEL" not in market:
+            market["FUEL"] = {
+                "symbol": "FUEL",
+                "volumePerUnit": 1,
+                "pricePerUnit": 3,
+                "spread": 1,
+                "purchasePricePerUnit": 4,
+                "sellPricePerUnit": 2,
+                "quantityAvailable": 100000,
+            }
+
+        return market
+
+    def _make_ship(self, type: dict, location: str) -> dict:
+        loc = self.locations[location]
+        return {
+            "id": self._id(),
+            "location": location,
+            "x": loc["x"],
+            "y": loc["y"],
+            "cargo": [{"good": "FUEL", "quantity": 20, "totalVolume": 20}],
+            "spaceAvailable": type["maxCargo"] - 20,
+            "type": type["type"],
+            "class": type["class"],
+            "maxCargo": type["maxCargo"],
+            "speed": type["speed"],
+            "manufacturer": type["manufacturer"],
+            "plating": type["plating"],
+            "weapons": type["weapons"],
+        }
+
+    def _make_user(self, username: str, ships: int) -> dict:
+        symbols = list(self.locations)
+        fleet = {}
+        for i in range(ships):
+            ship = self._make_ship(
+                SHIP_TYPES[i % len(SHIP_TYPES)], symbols[i % len(symbols)]
+            )
+            fleet[ship["id"]] = ship
+
+        return {
+            "username": username,
+            "credits": 100000,
+            "joinedAt": _now(),
+            "ships": fleet,
+            "loans": {},
+        }
+
+    def _ship(self, user: dict, ship_id: str) -> dict:
+        ship = user["ships"].get(ship_id)
+        if ship is None:
+            raise web.HTTPNotFound(
+                text='{"error": {"code": 404, "message": "Ship not found"}}',
+                content_type="application/json",
+            )
+
+        self._land(ship)
+        return ship
+
+    def _land(self, ship: dict):
+        """Finish a flight once its arrival time has passed"""
+        plan = self.flight_plans.get(ship.get("flightPlanId"))
+        if plan is None or plan["_arrives"] > time.time():
+            return
+
+        destination = self.locations[plan["destination"]]
+        ship.pop("flightPlanId", None)
+        ship["location"] = destination["symbol"]
+        ship["x"], ship["y"] = destination["x"], destination["y"]
+        plan["terminatedAt"] = plan["arrivesAt"]
+
+    @staticmethod
+    def _cargo(ship: dict, good: str, delta: int):
+        volume = GOODS.get(good, 1)
+        for item in ship["cargo"]:
+            if item["good"] == good:
+                item["quantity"] += delta
+                item["totalVolume"] = item["quantity"] * volume
+                break
+        else:
+            ship["cargo"].append(
+                {"good": good, "quantity": delta, "totalVolume": delta * volume}
+            )
+
+        ship["cargo"] = [c for c in ship["cargo"] if c["quantity"] > 0]
+        ship["spaceAvailable"] = ship["maxCargo"] - sum(
+            c["totalVolume"] for c in ship["cargo"]
+        )
+
+    @staticmethod
+    def _quantity(ship: dict, good: str) -> int:
+        return sum(c["quantity"] for c in ship["cargo"] if c["good"] == good)
+
+    @staticmethod
+    def _public(data: dict) -> dict:
+        return {k: v for k, v in data.items() if not k.startswith("_")}
+
+    # ==================== Middleware ==================== #
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        self.requests += 1
+
+        delay = self.latency + (
+            self._random.random() * self.jitter if self.jitter else 0
+        )
+        if delay:
+            await asyncio.sleep(delay)
+
+        token = request.headers.get("Authorization", "")[len("Bearer ") :]
+        user = self.users.get(token)
+        if user is None:
+            return _error(401, 40101, "Token was invalid or missing from the request.")
+
+        wait = self.buckets[token].take()
+        bucket = self.buckets[token]
+        headers = {
+            "x-ratelimit-limit": str(self.burst),
+            "x-ratelimit-remaining": str(int(bucket.tokens)),
+            "x-ratelimit-reset": _now(),
+            "Retry-After": f"{wait:.3f}" if wait else "0",
+        }
+
+        if wait:
+            return _error(
+                429,
+                42901,
+                "Throttle limit reached. Please try again.",
+                headers=headers,
+            )
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            return _error(503, 50301, "Service Unavailable", headers=headers)
+
+        request["user"] = user
+        response = await handler(request)
+        response.headers.update(headers)
+        return response
+
+    # ==================== Routes ==================== #
+
+    def _add_routes(self):
+        r = self.app.router
+        r.add_get("/my/account", self.account)
+        r.add_get("/my/flight-plans/{flightPlanId}", self.flight_plan_info)
+        r.add_post("/my/flight-plans", self.flight_plan_create)
+        r.add_get("/game/status", self.game_status)
+        r.add_get("/game/leaderboard/net-worth", self.leaderboard)
+        r.add_get("/my/loans", self.loan_get_all)
+        r.add_put("/my/loans/{loanId}", self.loan_pay)
+        r.add_post("/my/loans", self.loan_take)
+        r.add_get("/locations/{locationSymbol}", self.location_get_info)
+        r.add_get("/locations/{locationSymbol}/marketplace", self.location_get_market)
+        r.add_get("/locations/{locationSymbol}/ships", self.location_get_ships)
+        r.add_post("/my/purchase-orders", self.order_purchase)
+        r.add_post("/my/sell-orders", self.order_sell)
+        r.add_post("/my/ships", self.ship_purchase)
+        r.add_get("/my/ships", self.ship_get_all)
+        r.add_get("/my/ships/{shipId}", self.ship_get_info)
+        r.add_delete("/my/ships/{shipId}/", self.ship_scrap)
+        r.add_post("/my/ships/{shipId}/jettison", self.ship_cargo_jettison)
+        r.add_post("/my/ships/{shipId}/transfer", self.ship_cargo_transfer)
+        r.add_get("/my/structures", self.structure_get_all)
+        r.add_post("/my/structures", self.structure_create)
+        r.add_get("/my/structures/{structureId}", self.structure_get_info)
+        r.add_get("/structures/{structureId}", self.structure_get_info)
+        r.add_post("/my/structures/{structureId}/deposit", self.structure_deposit)
+        r.add_post("/structures/{structureId}/deposit", self.structure_deposit)
+        r.add_post("/my/structures/{structureId}/transfer", self.structure_transfer)
+        r.add_get("/systems/{systemSymbol}", self.system_get_info)
+        r.add_get("/systems/{systemSymbol}/ship-listings", self.system_ship_listings)
+        r.add_get("/systems/{systemSymbol}/flight-plans", self.system_flight_plans)
+        r.add_get("/systems/{systemSymbol}/ships", self.system_docked_ships)
+        r.add_get("/systems/{systemSymbol}/locations", self.system_get_locations)
+        r.add_get("/types/goods", self.type_goods)
+        r.add_get("/types/loans", self.type_loans)
+        r.add_get("/types/structures", self.type_structures)
+        r.add_get("/types/ships", self.type_ships)
+        r.add_post("/users/{username}/claim", self.username_claim)
+        r.add_post("/my/warp-jumps", self.warp_attempt)
+
+    def _user_info(self, user: dict) -> dict:
+        return {
+            "username": user["username"],
+            "credits": user["credits"],
+            "joinedAt": user["joinedAt"],
+            "shipCount": len(user["ships"]),
+            "structureCount": sum(
+                1 for s in self.structures.values() if s["_owner"] is user
+            ),
+        }
+
+    async def account(self, request: web.Request):
+        return web.json_response({"user": self._user_info(request["user"])})
+
+    async def flight_plan_info(self, request: web.Request):
+        plan = self.flight_plans.get(request.match_info["flightPlanId"])
+        if plan is None or plan["_owner"] is not request["user"]:
+            return _error(404, 404, "Flight plan not found")
+
+        return web.json_response({"flightPlan": self._public(plan)})
+
+    async def flight_plan_create(self, request: web.Request):
+        user = request["user"]
+        ship = self._ship(user, request.query.get("shipId"))
+        destination = self.locations.get(request.query.get("destination"))
+
+        if destination is None:
+            return _error(404, 404, "Destination not found")
+        if ship.get("flightPlanId") is not None:
+            return _error(400, 400, "Ship is already in transit")
+
+        distance = math.ceil(
+            math.hypot(ship["x"] - destination["x"], ship["y"] - destination["y"])
+        )
+        fuel = (
+            round(distance / 4)
+            + (2 if self.locations[ship["location"]]["type"] == "PLANET" else 0)
+            + 1
+        )
+        if self._quantity(ship, "FUEL") < fuel:
+            return _error(400, 400, "Ship has insufficient fuel for flight")
+
+        self._cargo(ship, "FUEL", -fuel)
+        duration = round(distance * 2 / ship["speed"]) + 30
+        arrives = time.time() + duration
+
+        plan = {
+            "id": self._id(),
+            "shipId": ship["id"],
+            "createdAt": _now(),
+            "arrivesAt": datetime.datetime.utcfromtimestamp(arrives).isoformat(
+                timespec="milliseconds"
+            )
+            + "Z",
+            "departure": ship["location"],
+            "destination": destination["symbol"],
+            "distance": distance,
+            "fuelConsumed": fuel,
+            "fuelRemaining": self._quantity(ship, "FUEL"),
+            "terminatedAt": None,
+            "timeRemainingInSeconds": duration,
+            "_arrives": arrives,
+            "_owner": user,
+        }
+        self.flight_plans[plan["id"]] = plan
+        ship["flightPlanId"] = plan["id"]
+        ship["location"] = None
+
+        return web.json_response({"flightPlan": self._public(plan)}, status=201)
+
+    async def game_status(self, request: web.Request):
+        return web.json_response(
+            {"status": "spacetraders is currently online and available to play"}
+        )
+
+    async def leaderboard(self, request: web.Request):
+        users = sorted(self.users.values(), key=lambda u: u["credits"], reverse=True)
+        return web.json_response(
+            {
+                "netWorth": [
+                    {"username": u["username"], "netWorth": u["credits"], "rank": i + 1}
+                    for i, u in enumerate(users)
+                ],
+                "userNetWorth": [],
+            }
+        )
+
+    async def loan_get_all(self, request: web.Request):
+        return web.json_response({"loans": list(request["user"]["loans"].values())})
+
+    async def loan_pay(self, request: web.Request):
+        user = request["user"]
+        loan = user["loans"].get(request.match_info["loanId"])
+        if loan is None:
+            return _error(404, 404, "Loan not found")
+
+        user["credits"] -= loan["repaymentAmount"]
+        loan["status"] = "PAID"
+        return web.json_response(
+            {"credits": user["credits"], "loans": list(user["loans"].values())}
+        )
+
+    async def loan_take(self, request: web.Request):
+        user = request["user"]
+        kind = next(
+            (l for l in LOAN_TYPES if l["type"] == request.query.get("type")), None
+        )
+        if kind is None:
+            return _error(400, 400, "Invalid loan type")
+
+        loan = {
+            "id": self._id(),
+            "due": _now(),
+            "repaymentAmount": kind["amount"] * (100 + kind["rate"]) // 100,
+            "status": "CURRENT",
+            "type": kind["type"],
+        }
+        user["loans"][loan["id"]] = loan
+        user["credits"] += kind["amount"]
+        return web.json_response({"credits": user["credits"], "loan": loan}, status=201)
+
+    def _location(self, request: web.Request) -> dict:
+        location = self.locations.get(request.match_info["locationSymbol"])
+        if location is None:
+            raise web.HTTPNotFound(
+                text='{"error": {"code": 404, "message": "Location not found"}}',
+                content_type="application/json",
+            )
+        return location
+
+    def _docked(self, symbol: Optional[str] = None) -> list:
+        ships = []
+        for user in self.users.values():
+            for ship in user["ships"].values():
+                self._land(ship)
+                if ship["location"] is not None and symbol in (None, ship["location"]):
+                    ships.append(
+                        {
+                            "shipId": ship["id"],
+                            "username": user["username"],
+                            "shipType": ship["type"],
+                        }
+                    )
+        return ships
+
+    async def location_get_info(self, request: web.Request):
+        location = self._location(request)
+        docked = len(self._docked(location["symbol"]))
+        return web.json_response({"location": dict(location, dockedShips=docked)})
+
+    async def location_get_market(self, request: web.Request):
+        location = self._location(request)
+        return web.json_response(
+            {"marketplace": list(self.markets[location["symbol"]].values())}
+        )
+
+    async def location_get_ships(self, request: web.Request):
+        location = self._location(request)
+        return web.json_response(
+            {"location": dict(location, ships=self._docked(location["symbol"]))}
+        )
+
+    async def _order(self, request: web.Request, buying: bool):
+        user = request["user"]
+        ship = self._ship(user, request.query.get("shipId"))
+        good = request.query.get("good")
+        quantity = int(request.query.get("quantity", 0))
+
+        if ship["location"] is None:
+            return _error(400, 400, "Ship is currently in transit")
+
+        item = self.markets[ship["location"]].get(good)
+        if item is None or quantity <= 0:
+            return _error(400, 400, "Good is not traded at this location")
+
+        if buying:
+            price = item["purchasePricePerUnit"]
+            if quantity * item["volumePerUnit"] > ship["spaceAvailable"]:
+                return _error(400, 400, "Ship has insufficient cargo space")
+            if quantity * price > user["credits"]:
+                return _error(400, 400, "User has insufficient credits")
+            user["credits"] -= quantity * price
+            item["quantityAvailable"] = max(0, item["quantityAvailable"] - quantity)
+            self._cargo(ship, good, quantity)
+        else:
+            price = item["sellPricePerUnit"]
+            if self._quantity(ship, good) < quantity:
+                return _error(400, 400, "Ship has insufficient cargo")
+            user["credits"] += quantity * price
+            item["quantityAvailable"] += quantity
+            self._cargo(ship, good, -quantity)
+
+        return web.json_response(
+            {
+                "credits": user["credits"],
+                "order": {
+                    "good": good,
+                    "quantity": quantity,
+                    "pricePerUnit": price,
+                    "total": quantity * price,
+                },
+                "ship": ship,
+            },
+            status=201,
+        )
+
+    async def order_purchase(self, request: web.Request):
+        return await self._order(request, True)
+
+    async def order_sell(self, request: web.Request):
+        return await self._order(request, False)
+
+    async def ship_purchase(self, request: web.Request):
+        user = request["user"]
+        kind = next(
+            (s for s in SHIP_TYPES if s["type"] == request.query.get("type")), None
+        )
+        location = request.query.get("location")
+
+        if kind is None or location not in self.locations:
+            return _error(400, 400, "Invalid ship type or location")
+        if kind["price"] > user["credits"]:
+            return _error(400, 400, "User has insufficient credits")
+
+        user["credits"] -= kind["price"]
+        ship = self._make_ship(kind, location)
+        user["ships"][ship["id"]] = ship
+        return web.json_response({"credits": user["credits"], "ship": ship}, status=201)
+
+    async def ship_get_all(self, request: web.Request):
+        ships = request["user"]["ships"]
+        for ship in ships.values():
+            self._land(ship)
+        return web.json_response({"ships": list(ships.values())})
+
+    async def ship_get_info(self, request: web.Request):
+        return web.json_response(
+            {"ship": self._ship(request["user"], request.match_info["shipId"])}
+        )
+
+    async def ship_scrap(self, request: web.Request):
+        user = request["user"]
+        self._ship(user, request.match_info["shipId"])
+        del user["ships"][request.match_info["shipId"]]
+        return web.json_response({"success": "Ship scrapped"})
+
+    async def ship_cargo_jettison(self, request: web.Request):
+        ship = self._ship(request["user"], request.match_info["shipId"])
+        good = request.query.get("good")
+        quantity = min(
+            int(request.query.get("quantity", 0)), self._quantity(ship, good)
+        )
+        self._cargo(ship, good, -quantity)
+        return web.json_response(
+            {
+                "good": good,
+                "quantityRemaining": self._quantity(ship, good),
+                "shipId": ship["id"],
+            }
+        )
+
+    async def ship_cargo_transfer(self, request: web.Request):
+        user = request["user"]
+        source = self._ship(user, request.match_info["shipId"])
+        target = self._ship(user, request.query.get("toShipId"))
+        good = request.query.get("good")
+        quantity = int(request.query.get("quantity", 0))
+
+        if self._quantity(source, good) < quantity:
+            return _error(400, 400, "Ship has insufficient cargo")
+
+        self._cargo(source, good, -quantity)
+        self._cargo(target, good, quantity)
+        return web.json_response({"fromShip": source, "toShip": target})
+
+    async def structure_get_all(self, request: web.Request):
+        user = request["user"]
+        return web.json_response(
+            {
+                "structures": [
+                    self._public(s)
+                    for s in self.structures.values()
+                    if s["_owner"] is user
+                ]
+            }
+        )
+
+    async def structure_create(self, request: web.Request):
+        user = request["user"]
+        kind = next(
+            (s for s in STRUCTURE_TYPES if s["type"] == request.query.get("type")), None
+        )
+        if kind is None or request.query.get("location") not in self.locations:
+            return _error(400, 400, "Invalid structure type or location")
+
+        structure = {
+            "id": self._id(),
+            "type": kind["type"],
+            "location": request.query["location"],
+            "status": "UNDER_CONSTRUCTION",
+            "active": False,
+            "ownedBy": {"username": user["username"]},
+            "inventory": [],
+            "consumes": kind["consumes"],
+            "produces": kind["produces"],
+            "_owner": user,
+        }
+        self.structures[structure["id"]] = structure
+        return web.json_response({"structure": self._public(structure)}, status=201)
+
+    def _structure(self, request: web.Request) -> dict:
+        structure = self.structures.get(request.match_info["structureId"])
+        if structure is None:
+            raise web.HTTPNotFound(
+                text='{"error": {"code": 404, "message": "Structure not found"}}',
+                content_type="application/json",
+            )
+        return structure
+
+    async def structure_get_info(self, request: web.Request):
+        return web.json_response({"structure": self._public(self._structure(request))})
+
+    async def structure_deposit(self, request: web.Request):
+        structure = self._structure(request)
+        ship = self._ship(request["user"], request.query.get("shipId"))
+        good = request.query.get("good")
+        quantity = int(request.query.get("quantity", 0))
+
+        if self._quantity(ship, good) < quantity:
+            return _error(400, 400, "Ship has insufficient cargo")
+
+        self._cargo(ship, good, -quantity)
+        self._cargo(
+            structure.setdefault("_hold", {"cargo": [], "maxCargo": 1 << 30}),
+            good,
+            quantity,
+        )
+        structure["inventory"] = structure["_hold"]["cargo"]
+        return web.json_response(
+            {
+                "deposit": {"good": good, "quantity": quantity},
+                "ship": ship,
+                "structure": self._public(structure),
+            }
+        )
+
+    async def structure_transfer(self, request: web.Request):
+        structure = self._structure(request)
+        ship = self._ship(request["user"], request.query.get("shipId"))
+        good = request.query.get("good")
+        quantity = int(request.query.get("quantity", 0))
+        hold = structure.setdefault("_hold", {"cargo": [], "maxCargo": 1 << 30})
+
+        if self._quantity(hold, good) < quantity:
+            return _error(400, 400, "Structure has insufficient stock")
+
+        self._cargo(hold, good, -quantity)
+        self._cargo(ship, good, quantity)
+        structure["inventory"] = hold["cargo"]
+        return web.json_response(
+            {
+                "transfer": {"good": good, "quantity": quantity},
+                "ship": ship,
+                "structure": self._public(structure),
+            }
+        )
+
+    async def system_get_info(self, request: web.Request):
+        return web.json_response(
+            {"system": {"symbol": SYSTEM, "name": "Omicron Eridani"}}
+        )
+
+    async def system_ship_listings(self, request: web.Request):
+        return web.json_response(
+            {
+                "shipListings": [
+                    dict(
+                        {k: v for k, v in s.items() if k != "price"},
+                        purchaseLocations=[
+                            {
+                                "system": SYSTEM,
+                                "location": "OE-PM-TR",
+                                "price": s["price"],
+                            }
+                        ],
+                    )
+                    for s in SHIP_TYPES
+                ]
+            }
+        )
+
+    async def system_flight_plans(self, request: web.Request):
+        now = time.time()
+        return web.json_response(
+            {
+                "flightPlans": [
+                    self._public(p)
+                    for p in self.flight_plans.values()
+                    if p["_arrives"] > now
+                ]
+            }
+        )
+
+    async def system_docked_ships(self, request: web.Request):
+        return web.json_response({"ships": self._docked()})
+
+    async def system_get_locations(self, request: web.Request):
+        return web.json_response({"locations": list(self.locations.values())})
+
+    async def type_goods(self, request: web.Request):
+        return web.json_response(
+            {
+                "goods": [
+                    {
+                        "symbol": g,
+                        "name": g.replace("_", " ").title(),
+                        "volumePerUnit": v,
+                    }
+                    for g, v in GOODS.items()
+                ]
+            }
+        )
+
+    async def type_loans(self, request: web.Request):
+        return web.json_response({"loans": LOAN_TYPES})
+
+    async def type_structures(self, request: web.Request):
+        return web.json_response({"structures": STRUCTURE_TYPES})
+
+    async def type_ships(self, request: web.Request):
+        ship_class = request.query.get("class")
+        return web.json_response(
+            {"ships": [s for s in SHIP_TYPES if ship_class in (None, s["class"])]}
+        )
+
+    async def username_claim(self, request: web.Request):
+        return _error(409, 40901, "Username has already been claimed.")
+
+    async def warp_attempt(self, request: web.Request):
+        self._ship(request["user"], request.query.get("shipId"))
+        return _error(400, 400, "Ship is not at a wormhole.")
+
+    # ==================== Lifecycle ==================== #
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> str:
+        """Start serving. Returns the base URL to hand to a client"""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+
+        # Port 0 picks a free port, so read back the one we got
+        self.port = self._runner.addresses[0][1]
+        return self.url
+
+    async def close(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_):
+        await self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local SpaceTraders stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--token", action="append", default=None)
+    parser.add_argument("--rate", type=float, default=2.0)
+    parser.add_argument("--burst", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--ships", type=int, default=5)
+    args = parser.parse_args()
+
+    server = MockServer(
+        tokens=args.token or ("mock-token",),
+        rate=args.rate,
+        burst=args.burst,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        ships=args.ships,
+        host=args.host,
+        port=args.port,
+    )
+    web.run_app(server.app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
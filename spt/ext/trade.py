@@ -0,0 +1,274 @@
+"""Vectorized trade search over market snapshots.
+
+Builds location x good matrices of buy/sell prices and volumes with NumPy, then
+ranks every (origin, destination, good) trade for a whole fleet in one pass:
+
+    market = await MarketMatrix.fetch(client.http, "OE")
+    for trade in best_trades(await client.ships, market):
+        print(trade)
+
+Needs NumPy (`pip install numpy`).
+"""
+
+import asyncio
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Union
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError("spt.ext.trade needs NumPy: pip install numpy") from e
+
+from ..enum import Goods
+from ..http import HTTPClient
+from ..model import Model
+
+FUEL = Goods.FUEL.value
+
+# Location types that cost extra fuel to take off from
+GRAVITY_WELLS = ("PLANET",)
+
+
+def distances(x: "np.ndarray", y: "np.ndarray") -> "np.ndarray":
+    """Pairwise distances between points, rounded up as the API does"""
+    return np.ceil(np.hypot(x[:, None] - x[None, :], y[:, None] - y[None, :]))
+
+
+def fuel_cost(distance: "np.ndarray", well: "np.ndarray") -> "np.ndarray":
+    """Fuel burnt flying `distance`, departing from a gravity well where `well`"""
+    well = np.asarray(well)
+    if well.ndim == 1 and np.ndim(distance) == 2:
+        well = well[:, None]
+
+    return np.round(distance / 4) + np.where(well, 2, 0) + 1
+
+
+def flight_time(distance: "np.ndarray", speed: "np.ndarray") -> "np.ndarray":
+    """Seconds taken to fly `distance` at `speed`, including docking"""
+    return np.round(distance * 2 / np.maximum(speed, 1)) + 30
+
+
+class Trade(NamedTuple):
+    """Buy `units` of `good` at `origin` and sell them at `destination`"""
+
+    ship: str
+    good: str
+    origin: str
+    destination: str
+    units: int
+    profit: float
+    fuel: int
+    time: float
+
+    @property
+    def rate(self) -> float:
+        """Profit per second of flight"""
+        return self.profit / self.time if self.time else 0.0
+
+
+class MarketMatrix:
+    """Market snapshots for a set of locations as dense arrays.
+
+    Rows are locations and columns are goods, in `Goods` order followed by any
+    goods the enum doesn't know. Prices a market doesn't list are NaN and its
+    quantity is 0. `buy` is what a ship pays, `sell` what it is paid.
+    """
+
+    def __init__(self, locations: List[dict], markets: Dict[str, List[dict]]):
+        self.locations: List[str] = [loc["symbol"] for loc in locations]
+        self.index: Dict[str, int] = {s: i for i, s in enumerate(self.locations)}
+
+        goods = [g.value for g in Goods]
+        known = set(goods)
+        for listing in markets.values():
+            for item in listing:
+                if item["symbol"] not in known:
+                    known.add(item["symbol"])
+                    goods.append(item["symbol"])
+
+        self.goods: List[str] = goods
+        self.columns: Dict[str, int] = {g: i for i, g in enumerate(goods)}
+
+        shape = (len(self.locations), len(goods))
+        self.buy = np.full(shape, np.nan)
+        self.sell = np.full(shape, np.nan)
+        self.available = np.zeros(shape)
+        self.volume = np.ones(len(goods))
+
+        self.x = np.array([loc.get("x", 0) for loc in locations], dtype=float)
+        self.y = np.array([loc.get("y", 0) for loc in locations], dtype=float)
+        self.well = np.array([loc.get("type") in GRAVITY_WELLS for loc in locations])
+        self.distance = distances(self.x, self.y)
+        self.fuel = fuel_cost(self.distance, self.well)
+
+        self._margin: Optional["np.ndarray"] = None
+        for symbol, listing in markets.items():
+            self.update(symbol, listing)
+
+    @classmethod
+    async def fetch(cls, http: HTTPClient, system: str) -> "MarketMatrix":
+        """Snapshot every market in a system, fetching them concurrently"""
+        locations = (await http.system_get_locations(system))["locations"]
+        results = await asyncio.gather(
+            *(http.location_get_market(loc["symbol"]) for loc in locations),
+            return_exceptions=True,
+        )
+
+        markets = {
+            loc["symbol"]: result["marketplace"]
+            for loc, result in zip(locations, results)
+            if isinstance(result, dict) and "marketplace" in result
+        }
+        return cls(locations, markets)
+
+    def update(self, symbol: str, listing: List[dict]):
+        """Replace one location's row with a fresh marketplace listing"""
+        row = self.index[symbol]
+        self._margin = None
+        self.buy[row] = np.nan
+        self.sell[row] = np.nan
+        self.available[row] = 0
+
+        for item in listing:
+            col = self.columns.get(item["symbol"])
+            if col is None:
+                continue
+
+            self.buy[row, col] = item.get("purchasePricePerUnit", np.nan)
+            self.sell[row, col] = item.get("sellPricePerUnit", np.nan)
+            self.available[row, col] = item.get("quantityAvailable", 0)
+            self.volume[col] = item.get("volumePerUnit", 1)
+
+    @property
+    def margin(self) -> "np.ndarray":
+        """Profit per unit, origin x destination x good. 0 where there is no trade"""
+        if self._margin is None:
+            margin = self.sell[None, :, :] - self.buy[:, None, :]
+            np.nan_to_num(margin, copy=False, nan=0.0)
+
+            # Staying put isn't a trade
+            margin[np.arange(len(self.locations)), np.arange(len(self.locations))] = 0
+            self._margin = margin
+
+        return self._margin
+
+    @property
+    def fuel_price(self) -> "np.ndarray":
+        """Fuel price at each location, the system's median where it isn't sold"""
+        price = self.buy[:, self.columns[FUEL]]
+        fallback = np.nanmedian(price) if np.isfinite(price).any() else 0.0
+        return np.where(np.isnan(price), fallback, price)
+
+
+def _fields(ship: Union[Model, dict]) -> dict:
+    return ship.data if isinstance(ship, Model) else ship
+
+
+def best_trades(
+    ships: Iterable[Union[Model, dict]],
+    market: MarketMatrix,
+    top: int = 1,
+    by: str = "rate",
+) -> List[Trade]:
+    """The `top` most profitable trades from each docked ship's location.
+
+    Units are limited by the ship's free cargo space, less any fuel it must buy
+    for the flight, and by the quantity on sale. Fuel is paid for at the origin.
+    Trades are ranked by profit per second of flight (`by="rate"`) or by total
+    profit (`by="profit"`); only profitable ones are returned. Ships compete for
+    nothing here: two ships at one market may be handed the same trade.
+    """
+    if by not in ("rate", "profit"):
+        raise ValueError(f"Unknown ranking {by!r}")
+
+    docked = [
+        s
+        for s in map(_fields, ships)
+        if s.get("location") in market.index and not s.get("flightPlanId")
+    ]
+    if not docked:
+        return []
+
+    fuel_held = [
+        sum(c.get("quantity", 0) for c in s.get("cargo", ()) if c["good"] == FUEL)
+        for s in docked
+    ]
+    profiles = np.array(
+        [
+            (market.index[s["location"]], s.get("spaceAvailable", 0), s.get("speed", 1))
+            for s in docked
+        ],
+        dtype=float,
+    )
+    profiles = np.column_stack([profiles, fuel_held])
+
+    # Ships at the same market with the same hold, speed and fuel get the same
+    # answer, so each distinct profile is only solved once
+    profiles, which = np.unique(profiles, axis=0, return_inverse=True)
+    which = which.reshape(-1)
+    origin = profiles[:, 0].astype(int)
+    space, speed, held = profiles[:, 1], profiles[:, 2], profiles[:, 3]
+
+    # profiles x destinations
+    fuel = market.fuel[origin]
+    fuel_bought = np.maximum(fuel - held[:, None], 0)
+    fuel_spend = fuel_bought * market.fuel_price[origin][:, None]
+    room = np.maximum(space[:, None] - fuel_bought, 0)
+    seconds = flight_time(market.distance[origin], speed[:, None])
+
+    # Scored one origin at a time, so each block is profiles there x destinations x
+    # goods and the margin table broadcasts instead of being copied per profile
+    n_goods = len(market.goods)
+    top = min(top, len(market.locations) * n_goods)
+    best = np.empty((len(profiles), top), dtype=np.intp)
+    margin = market.margin
+
+    for o in np.unique(origin):
+        rows = np.flatnonzero(origin == o)
+
+        score = room[rows][:, :, None] / market.volume
+        np.floor(score, out=score)
+        np.minimum(score, market.available[o], out=score)
+        score *= margin[o]
+        score -= fuel_spend[rows][:, :, None]
+        if by == "rate":
+            score /= seconds[rows][:, :, None]
+
+        flat = score.reshape(len(rows), -1)
+        if top == 1:
+            best[rows, 0] = flat.argmax(axis=1)
+        else:
+            picked = np.argpartition(-flat, top - 1, axis=1)[:, :top]
+            order = np.argsort(-np.take_along_axis(flat, picked, axis=1), axis=1)
+            best[rows] = np.take_along_axis(picked, order, axis=1)
+
+    # profiles x top
+    dest, good = np.divmod(best, n_goods)
+    at = np.arange(len(profiles))[:, None]
+    units = np.minimum(
+        np.floor(room[at, dest] / market.volume[good]),
+        market.available[origin[:, None], good],
+    )
+    profit = margin[origin[:, None], dest, good] * units - fuel_spend[at, dest]
+
+    trades = []
+    for ship, i in zip(docked, which):
+        for k in range(top):
+            if profit[i, k] <= 0:
+                continue
+
+            d = dest[i, k]
+            trades.append(
+                Trade(
+                    ship.get("id"),
+                    market.goods[good[i, k]],
+                    market.locations[origin[i]],
+                    market.locations[d],
+                    int(units[i, k]),
+                    float(profit[i, k]),
+                    int(fuel[i, d]),
+                    float(seconds[i, d]),
+                )
+            )
+
+    return trades
@@ -0,0 +1,192 @@
+import asyncio
+import logging
+
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Union
+
+from .cargo import Cargo
+from .errors import HTTPError
+from .flight import FlightPlan
+from .http import HTTPClient
+from .ship import Ship
+
+FUEL = "FUEL"
+
+
+class FleetResult:
+    """Outcome of a fleet operation: a result or an error per item.
+
+    Items are keyed by ship id, or by (ship id, good) for per-good operations.
+    """
+
+    def __init__(self):
+        self.results: Dict[Hashable, Any] = {}
+        self.errors: Dict[Hashable, Exception] = {}
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def __len__(self):
+        return len(self.results) + len(self.errors)
+
+    def __repr__(self):
+        return f"<FleetResult ok={len(self.results)} failed={len(self.errors)}>"
+
+
+def _budget(http: HTTPClient) -> int:
+    """How many requests the client can send at once without queueing"""
+    members = getattr(http, "members", None) or [http]
+    return max(1, sum(m.ratelimiter.burst for m in members))
+
+
+class Fleet:
+    """Runs the same operation over many ships at once.
+
+    At most `concurrency` ships are worked on at a time, by default as many as
+    the rate limit lets through in one burst, so a bulk call keeps the limiter
+    busy without piling a queue up behind it. Errors are collected per item
+    instead of stopping the rest.
+    """
+
+    def __init__(
+        self, http: HTTPClient, ships: Iterable[Ship], concurrency: int = None
+    ):
+        self.http = http
+        self.ships: List[Ship] = list(ships)
+        self.concurrency: int = concurrency or _budget(http)
+        self._log = logging.getLogger("spacetraders")
+
+    def __len__(self):
+        return len(self.ships)
+
+    def __iter__(self):
+        return iter(self.ships)
+
+    @property
+    def cargo(self) -> Cargo:
+        """Everything the fleet is carrying, added up"""
+        return Cargo.sum(ship.cargo for ship in self.ships)
+
+    @property
+    def docked(self) -> List[Ship]:
+        """Ships at a location and not on a flight"""
+        return [
+            s for s in self.ships if s.location is not None and not s.flight_plan_id
+        ]
+
+    async def _each(
+        self,
+        ships: Iterable[Ship],
+        work: Callable[[Ship, FleetResult], Awaitable[None]],
+    ) -> FleetResult:
+        result = FleetResult()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def one(ship: Ship):
+            async with semaphore:
+                try:
+                    await work(ship, result)
+                except Exception as e:
+                    self._log.debug(f"Fleet operation failed for {ship.id}: {e!r}")
+                    result.errors[ship.id] = e
+
+        await asyncio.gather(*(one(ship) for ship in ships))
+        return result
+
+    async def sell_all(self, keep: Iterable[str] = (FUEL,)) -> FleetResult:
+        """Sell every good in every docked ship's hold, except those in `keep`.
+
+        Results are (credits, Order) per (ship id, good). A ship sells its goods
+        one after the other so its state is applied in order.
+        """
+        keep = set(keep)
+
+        async def work(ship: Ship, result: FleetResult):
+            for good, quantity in list(ship.cargo):
+                if good in keep:
+                    continue
+
+                try:
+                    credits, order = await ship.sell(good, quantity)
+                    if credits is None:
+                        raise HTTPError(f"Could not sell {quantity} {good}")
+                    result.results[(ship.id, good)] = (credits, order)
+                except Exception as e:
+                    result.errors[(ship.id, good)] = e
+
+        return await self._each(self.docked, work)
+
+    async def refuel(self, target: int) -> FleetResult:
+        """Buy fuel so every docked ship holds `target` units, space permitting.
+
+        Results are (credits, Order) per ship id, or None where nothing was needed.
+        """
+
+        async def work(ship: Ship, result: FleetResult):
+            cargo = ship.cargo
+            quantity = min(target - cargo[FUEL], cargo.space)
+
+            if quantity <= 0:
+                result.results[ship.id] = None
+                return
+
+            credits, order = await ship.purchase(FUEL, quantity)
+            if credits is None:
+                raise HTTPError(f"Could not buy {quantity} {FUEL}")
+            result.results[ship.id] = (credits, order)
+
+        return await self._each(self.docked, work)
+
+    async def update(self) -> FleetResult:
+        """Refresh every ship. Results are the ships themselves.
+
+        A fleet of more than one ship is refreshed from a single ship listing (one
+        per account for a pool) rather than a request per ship.
+        """
+        if len(self.ships) == 1:
+            return await self._each(self.ships, self.__update_one)
+
+        result = FleetResult()
+        try:
+            listing = await self.http.ship_get_all()
+        except Exception as e:
+            for ship in self.ships:
+                result.errors[ship.id] = e
+            return result
+
+        fresh = {data["id"]: data for data in listing.get("ships", [])}
+        for ship in self.ships:
+            data = fresh.get(ship.id)
+            if data is None:
+                result.errors[ship.id] = HTTPError(f"Ship {ship.id} was not listed")
+            else:
+                result.results[ship.id] = ship.apply(data)
+
+        return result
+
+    @staticmethod
+    async def __update_one(ship: Ship, result: FleetResult):
+        await ship.update()
+        result.results[ship.id] = ship
+
+    async def travel(self, destinations: Union[str, Dict[str, str]]) -> FleetResult:
+        """Send ships off. Results are the FlightPlan per ship id.
+
+        Pass one destination for every docked ship, or a {ship id: destination}
+        dict to move only those ships.
+        """
+        if isinstance(destinations, str):
+            ships = self.docked
+            where = {ship.id: destinations for ship in ships}
+        else:
+            where = dict(destinations)
+            ships = [s for s in self.ships if s.id in where]
+
+        async def work(ship: Ship, result: FleetResult):
+            plan: FlightPlan = await ship.travel_to(where[ship.id])
+            if plan.id is None:
+                error = plan.data.get("error", {}).get("message", "Unknown Error")
+                raise HTTPError(f"Could not fly to {where[ship.id]}: {error}")
+            result.results[ship.id] = plan
+
+        return await self._each(ships, work)
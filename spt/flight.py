@@ -1,21 +1,31 @@
 from typing import Dict, Union
 
+from .model import Field, Model
 
-class FlightPlan:
-    def __init__(self, data: Dict[str, Dict[str, Union[str, int, None]]]):
-        data = data["flightPlan"]
 
-        self.arrives = data.get("arrivesAt")
-        self.created_at = data.get("createdAt")
-        self.departure = data.get("departure")
-        self.destination = data.get("destination")
+class FlightPlan(Model):
+    __slots__ = ("http",)
 
-        self.distance = data.get("distance")
-        self.fuel_used = data.get("fuelConsumed")
-        self.fuel_remaining = data.get("fuelRemaining")
+    _wrapper = "flightPlan"
 
-        self.id = data.get("id")
-        self.ship_id = data.get("shipId")
+    arrives = Field("arrivesAt")
+    created_at = Field("createdAt")
+    departure = Field("departure")
+    destination = Field("destination")
 
-        self.terminated_at = data.get("terminatedAt")
-        self.terminated = None if self.terminated_at is None else True
+    distance = Field("distance")
+    fuel_used = Field("fuelConsumed")
+    fuel_remaining = Field("fuelRemaining")
+
+    id = Field("id")
+    ship_id = Field("shipId")
+
+    terminated_at = Field("terminatedAt")
+
+    def __init__(self, http, data: Dict[str, Dict[str, Union[str, int, None]]]):
+        self.http = http
+        super().__init__(data)
+
+    @property
+    def terminated(self):
+        return None if self.terminated_at is None else True
@@ -1,11 +1,29 @@
-from aiohttp import ClientSession, ClientResponse
-from .errors import ReachedMaximumRetries, HTTPError
+from .errors import CircuitOpen, ReachedMaximumRetries, HTTPError, ServerError
 from asyncio import AbstractEventLoop
+from .cache import ResponseCache
+from .decode import Decoder
+from .identity import IdentityMap
+from .metrics import Metrics
+from .ratelimit import RateLimiter
+from .retry import RETRY_EXCEPTIONS, FAILURE_STATUSES, Breakers, RetryPolicy
 from .route import Route
-from threading import Lock
+from .scheduler import Scheduler
+from .transport import (
+    RecordingTransport,
+    ReplayTransport,
+    Response,
+    SessionTransport,
+    Transport,
+)
+
+from http import HTTPStatus
+from typing import Dict, Optional
+from urllib.parse import urlencode, urlsplit
 
 import asyncio
+import json
 import logging
+import random
 
 
 class HTTPClient:
@@ -20,83 +38,307 @@ class HTTPClient:
         )
         self._log = logging.getLogger("spacetraders-http")
         self.__token = token
-        self.__session: ClientSession = ClientSession(
-            headers={"Authorization": f"Bearer {token}"}
+        self.base_url: str = kwargs.get("base_url", Route.BASE).rstrip("/")
+        self.transport: Transport = kwargs.get("transport", None) or (
+            ReplayTransport(
+                kwargs["replay"],
+                kwargs.get("replay_mode", "keyed"),
+                kwargs.get("replay_speed", None),
+            )
+            if kwargs.get("replay", None)
+            else SessionTransport(
+                kwargs.get("session", None),
+                headers={"Authorization": f"Bearer {token}"},
+                limit=kwargs.get("connections", 100),
+                limit_per_host=kwargs.get("connections_per_host", 0),
+                keepalive=kwargs.get("keepalive", 30.0),
+                dns_ttl=kwargs.get("dns_ttl", 300),
+            )
+        )
+        if kwargs.get("record", None):
+            self.transport = RecordingTransport(self.transport, kwargs["record"])
+        self.ratelimiter: RateLimiter = kwargs.get("ratelimiter", None) or RateLimiter(
+            rate=kwargs.get("rate_limit", 2.0), burst=kwargs.get("burst", 10)
+        )
+        self.scheduler: Scheduler = Scheduler(
+            self.ratelimiter, kwargs.get("priorities", None)
+        )
+        cache = kwargs.get("cache", None)
+        self.cache: Optional[ResponseCache] = (
+            ResponseCache() if cache is True else (None if cache is False else cache)
+        )
+        self.decoder: Decoder = kwargs.get("decoder", None) or Decoder(
+            kwargs.get("json_backend", None)
+        )
+        self.metrics: Metrics = kwargs.get("metrics", None) or Metrics()
+        self.retry: RetryPolicy = kwargs.get("retry", None) or RetryPolicy(
+            max_retries=self._max_retries,
+            base=kwargs.get("retry_base", 0.5),
+            cap=kwargs.get("retry_cap", 30.0),
         )
-        self.__lock = kwargs.get("lock", Lock())
+        breakers = kwargs.get("breakers", None)
+        self.breakers: Optional[Breakers] = (
+            Breakers(
+                kwargs.get("breaker_threshold", 5), kwargs.get("breaker_cooldown", 30.0)
+            )
+            if breakers is None
+            else (None if breakers is False else breakers)
+        )
+        identity = kwargs.get("identity", None)
+        self.identity: IdentityMap = IdentityMap() if identity is None else identity
+        self.arrivals = None
+        self.coalesce: bool = kwargs.get("coalesce", True)
+
+        # Share of responses logged at DEBUG, decided before any record is made
+        self.log_sample: float = kwargs.get("log_sample", 1.0)
+        self.coalesced: int = 0
+        self.__inflight: Dict[str, asyncio.Future] = {}
+        self.closed: bool = False
+        self.drain_timeout: Optional[float] = kwargs.get("drain_timeout", 30.0)
+        self.__active = 0
+        self.__idle: Optional[asyncio.Event] = None
         self.__loop: AbstractEventLoop = loop
 
         self.__kwargs = kwargs
 
-    async def __handle_status(self, response: ClientResponse):
+    async def start(self):
+        """Open the connection pool. Requests also do this on first use"""
+        self.closed = False
+        await self.transport.start()
+
+    async def close(self, timeout: Optional[float] = None):
+        """Stop taking requests, let in-flight ones finish, then close the pool.
+
+        Waits at most `timeout` seconds, `drain_timeout` by default, for requests
+        already sent. A persistent response cache is saved once they are done.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        timeout = self.drain_timeout if timeout is None else timeout
+
+        if self.__active:
+            self.__idle = asyncio.Event()
+            try:
+                await asyncio.wait_for(self.__idle.wait(), timeout)
+            except asyncio.TimeoutError:
+                self._log.warning(
+                    f"Closing with {self.__active} requests still in flight"
+                )
+
+        await self.transport.close()
+
+        if self.cache is not None and self.cache.path is not None:
+            self.cache.save()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def __handle_status(self, response: Response):
         """Checks a response's `status_code` and raises an error"""
 
         code = response.status
 
         if code in (401,):
-            json = await response.json()
+            json = response.json(self.decoder.loads)
             err = json.get("error")
             err_code = err.get("code", "Unknown")
             err_message = err.get("message", "Unknown Error")
             raise HTTPError(f"Code {err_code}: {err_message}")
 
-        elif code in (503,):
-            raise HTTPError("Error 503: Service Unavailable")
+    @staticmethod
+    def __header(response: Response, name: str, cast) -> Optional[float]:
+        """Reads a numeric header, returning None when missing or malformed"""
+        try:
+            return cast(response.headers.get(name))
+        except (TypeError, ValueError):
+            return None
 
     async def _request(self, route: Route) -> dict:
         """Make a request using a Route"""
+        cache = self.cache
+
+        if cache is not None:
+            result = cache.get(route)
+            if result is not None:
+                self.metrics[route].cache_hits += 1
+                return result
+
+        if self.closed:
+            raise HTTPError("HTTPClient is closed")
+
+        self.__active += 1
+        try:
+            if self.coalesce and route.method.upper() == "GET":
+                result = await self.__coalesced(route)
+            else:
+                result = await self._perform(route)
+        finally:
+            self.__active -= 1
+            if not self.__active and self.__idle is not None:
+                self.__idle.set()
+
+        # Error payloads aren't cached, and a call that failed changed nothing
+        if cache is not None and "error" not in result:
+            cache.update(route, result)
+
+        return result
+
+    async def __coalesced(self, route: Route) -> dict:
+        """Share one in-flight request between identical concurrent GETs"""
+        key = route.key
+        task = self.__inflight.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(self._perform(route))
+            self.__inflight[key] = task
+            task.add_done_callback(lambda _: self.__inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+            self.metrics[route].coalesced += 1
+
+        # Shielded so one cancelled caller doesn't cancel the request for the rest
+        return await asyncio.shield(task)
+
+    @property
+    def inflight(self) -> int:
+        """Number of distinct GET requests currently in flight"""
+        return len(self.__inflight)
+
+    async def _perform(self, route: Route) -> dict:
+        """Send a Route to the API, retrying as the retry policy allows"""
         retries = 0
         _log = self._log
+        policy = self.retry
         timeout = (
             route.timeout
             if not self.__kwargs.get("timeout", False)
             else self.__kwargs.get("timeout", False)
         )
 
-
-        _log.info(route.__str__())
-        _log.info(route.kwargs)
-
-        with self.__lock:
-            while retries != self._max_retries:
-                try:
-                    async with self.__session.request(
-                        url=route.url,
-                        method=route.method,
-                        headers=route.headers,
-                        json=route.json,
-                        params=route.params,
-                        timeout=timeout,
-                    ) as response:
-                        headers = dict(response.headers)  # Maybe unnecessary?
-                        await self.__handle_status(response)
-
-                        json = await response.json()
-
-                        remain = int(headers.get("x-ratelimit-remaining"))
-                        wait_for = float(headers.get("Retry-After"))
-
-                        if remain == 0 and wait_for != 0:
-                            _log.warn(
-                                f"Client has hit ratelimit, waiting for {wait_for} seconds"
-                            )
-                            await asyncio.sleep(wait_for)
-
-                        return json
-
-                except asyncio.TimeoutError:
-                    _log.warn(f"Request timed out after {timeout} seconds")
-                    retries += 1
-                _log.info("Hit timeout")
-
-        raise ReachedMaximumRetries(f"Hit maximum retries: {self._max_retries}")
+        metrics = self.metrics[route]
+        url = route.resolve(self.base_url)
+        sent = self.__request_bytes(route, url)
+        host = urlsplit(url).netloc
+        breaker = self.breakers[host] if self.breakers is not None else None
+
+        logged = _log.isEnabledFor(logging.DEBUG) and (
+            self.log_sample >= 1 or random.random() < self.log_sample
+        )
+
+        while True:
+            if breaker is not None and not breaker.allow():
+                metrics.rejected += 1
+                raise CircuitOpen(host, breaker.retry_in)
+
+            waited, limited = await self.scheduler.acquire(route)
+            metrics.ratelimit_wait += limited
+            metrics.queue_wait += waited - limited
+            retry_after = None
+
+            try:
+                response = await self.transport.send(route, url, timeout)
+
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    metrics.timeouts += 1
+                if breaker is not None and isinstance(e, RETRY_EXCEPTIONS):
+                    breaker.failure()
+                if not policy.retry_error(route, e):
+                    raise
+
+                _log.warning("%s %s failed with %r", route.method, route.endpoint, e)
+                error: Exception = e
+
+            else:
+                metrics.observe(
+                    response.elapsed, response.status, len(response.body), sent
+                )
+                if logged:
+                    self.__log_request(route, response, retries)
+
+                retry_after = self.__header(response, "retry-after", float)
+                self.ratelimiter.update(
+                    self.__header(response, "x-ratelimit-remaining", int), retry_after
+                )
+
+                status = response.status
+                if breaker is not None:
+                    if status in FAILURE_STATUSES:
+                        breaker.failure()
+                    else:
+                        breaker.success()
+
+                if status < 500 and status != 429:
+                    await self.__handle_status(response)
+                    return response.json(self.decoder.loads)
+
+                error = self.__server_error(status, retry_after)
+                if not policy.retry_status(route, status):
+                    raise error
+
+                _log.warning("%s %s got %s", route.method, route.endpoint, error)
+
+            retries += 1
+            if retries > policy.max_retries:
+                raise ReachedMaximumRetries(
+                    f"Hit maximum retries: {policy.max_retries}"
+                ) from error
+
+            delay = policy.delay(retries, retry_after)
+            metrics.retries += 1
+            metrics.retry_wait += delay
+            await asyncio.sleep(delay)
+
+    def __log_request(self, route: Route, response: Response, retries: int):
+        """One record per response, formatted only if a handler writes it out"""
+        method = route.method.upper()
+        self._log.debug(
+            "%s %s -> %s in %.1f ms",
+            method,
+            route.endpoint,
+            response.status,
+            response.elapsed * 1000,
+            extra={
+                "request": {
+                    "method": method,
+                    "path": route.path,
+                    "endpoint": route.endpoint,
+                    "params": route.params,
+                    "status": response.status,
+                    "elapsed": response.elapsed,
+                    "retries": retries,
+                }
+            },
+        )
+
+    @staticmethod
+    def __request_bytes(route: Route, url: str) -> int:
+        """Bytes of the request line's URL and query plus the JSON body, as sent"""
+        sent = len(url.encode())
+        if route.params:
+            sent += 1 + len(urlencode(route.params).encode())
+        if route.json is not None:
+            sent += len(json.dumps(route.json).encode())
+        return sent
+
+    @staticmethod
+    def __server_error(status: int, retry_after: Optional[float]) -> ServerError:
+        try:
+            phrase = HTTPStatus(status).phrase
+        except ValueError:
+            phrase = "Server Error"
+
+        return ServerError(f"Error {status}: {phrase}", status, retry_after)
 
         # ==================== Account ==================== #
 
     async def account(self):
-        res = await self._request(
-            Route("get", "https://api.spacetraders.io/my/account")
-        )
+        res = await self._request(Route("get", "/my/account"))
 
         return res
 
@@ -104,7 +346,7 @@ class HTTPClient:
 
     async def flight_plan_info(self, flightPlanId: str):
         res = await self._request(
-            Route("get", f"https://api.spacetraders.io/my/flight-plans/{flightPlanId}")
+            Route("get", "/my/flight-plans/{flightPlanId}", flightPlanId=flightPlanId)
         )
 
         return res
@@ -112,8 +354,8 @@ class HTTPClient:
     async def flight_plan_create(self, shipId: str, destination: str):
         res = await self._request(
             Route(
-                "get",
-                "https://api.spacetraders.io/my/flight-plans",
+                "post",
+                "/my/flight-plans",
                 params={"shipId": shipId, "destination": destination},
             )
         )
@@ -123,39 +365,31 @@ class HTTPClient:
     # ==================== Game ==================== #
 
     async def game_status(self):
-        res = await self._request(
-            Route("get", "https://api.spacetraders.io/game/status")
-        )
+        res = await self._request(Route("get", "/game/status"))
 
         return res
 
     # ==================== Leaderboard ==================== #
 
     async def get_leaderboard(self):
-        res = await self._request(
-            Route("get", "https://api.spacetraders.io/game/leaderboard/net-worth")
-        )
+        res = await self._request(Route("get", "/game/leaderboard/net-worth"))
 
         return res
 
     # ==================== Loans ==================== #
 
     async def loan_get_all(self):
-        res = await self._request(Route("get", "https://api.spacetraders.io/my/loans"))
+        res = await self._request(Route("get", "/my/loans"))
 
         return res
 
     async def loan_pay(self, loanId: str):
-        res = await self._request(
-            Route("put", f"https://api.spacetraders.io/my/loans/{loanId}")
-        )
+        res = await self._request(Route("put", "/my/loans/{loanId}", loanId=loanId))
 
         return res
 
     async def loan_take(self, type: str):
-        res = await self._request(
-            Route("post", "https://api.spacetraders.io/my/loans", params={"type": type})
-        )
+        res = await self._request(Route("post", "/my/loans", params={"type": type}))
 
         return res
 
@@ -163,7 +397,7 @@ class HTTPClient:
 
     async def location_get_info(self, locationSymbol: str):
         res = await self._request(
-            Route("get", f"https://api.spacetraders.io/locations/{locationSymbol}")
+            Route("get", "/locations/{locationSymbol}", locationSymbol=locationSymbol)
         )
 
         return res
@@ -172,7 +406,8 @@ class HTTPClient:
         res = await self._request(
             Route(
                 "get",
-                f"https://api.spacetraders.io/locations/{locationSymbol}/marketplace",
+                "/locations/{locationSymbol}/marketplace",
+                locationSymbol=locationSymbol,
             )
         )
 
@@ -181,7 +416,9 @@ class HTTPClient:
     async def location_get_ships(self, locationSymbol: str):
         res = await self._request(
             Route(
-                "get", f"https://api.spacetraders.io/locations/{locationSymbol}/ships"
+                "get",
+                "/locations/{locationSymbol}/ships",
+                locationSymbol=locationSymbol,
             )
         )
 
@@ -193,7 +430,7 @@ class HTTPClient:
         res = await self._request(
             Route(
                 "post",
-                "https://api.spacetraders.io/my/purchase-orders",
+                "/my/purchase-orders",
                 params={"shipId": shipId, "good": good, "quantity": quantity},
             )
         )
@@ -204,7 +441,7 @@ class HTTPClient:
         res = await self._request(
             Route(
                 "post",
-                "https://api.spacetraders.io/my/sell-orders",
+                "/my/sell-orders",
                 params={"shipId": shipId, "good": good, "quantity": quantity},
             )
         )
@@ -217,7 +454,7 @@ class HTTPClient:
         res = await self._request(
             Route(
                 "post",
-                "https://api.spacetraders.io/my/ships",
+                "/my/ships",
                 params={"location": location, "type": type},
             )
         )
@@ -225,14 +462,12 @@ class HTTPClient:
         return res
 
     async def ship_get_info(self, shipId: str):
-        res = await self._request(
-            Route("get", f"https://api.spacetraders.io/my/ships/{shipId}")
-        )
+        res = await self._request(Route("get", "/my/ships/{shipId}", shipId=shipId))
 
         return res
 
     async def ship_get_all(self):
-        res = await self._request(Route("get", "https://api.spacetraders.io/my/ships"))
+        res = await self._request(Route("get", "/my/ships"))
 
         return res
 
@@ -240,7 +475,8 @@ class HTTPClient:
         res = await self._request(
             Route(
                 "post",
-                f"https://api.spacetraders.io/my/ships/{shipId}/jettison",
+                "/my/ships/{shipId}/jettison",
+                shipId=shipId,
                 params={"shipId": shipId, "good": good, "quantity": quantity},
             )
         )
@@ -248,9 +484,7 @@ class HTTPClient:
         return res
 
     async def ship_scrap(self, shipId: str):
-        res = await self._request(
-            Route("delete", f"https://api.spacetraders.io/my/ships/{shipId}/")
-        )
+        res = await self._request(Route("delete", "/my/ships/{shipId}/", shipId=shipId))
 
         return res
 
@@ -260,7 +494,8 @@ class HTTPClient:
         res = await self._request(
             Route(
                 "post",
-                f"https://api.spacetraders.io/my/ships/{fromShipId}/transfer",
+                "/my/ships/{fromShipId}/transfer",
+                fromShipId=fromShipId,
                 params={
                     "fromShipId": fromShipId,
                     "toShipId": toShipId,
@@ -278,7 +513,7 @@ class HTTPClient:
         res = await self._request(
             Route(
                 "post",
-                f"https://api.spacetraders.io/my/structures",
+                "/my/structures",
                 params={"location": location, "type": type},
             )
         )
@@ -291,7 +526,8 @@ class HTTPClient:
         res = await self._request(
             Route(
                 "post",
-                f"https://api.spacetraders.io/my/structures/{structureId}/deposit",
+                "/my/structures/{structureId}/deposit",
+                structureId=structureId,
                 params={
                     "structureId": structureId,
                     "shipId": shipId,
@@ -309,7 +545,8 @@ class HTTPClient:
         res = await self._request(
             Route(
                 "post",
-                f"https://api.spacetraders.io/structures/{structureId}/deposit",
+                "/structures/{structureId}/deposit",
+                structureId=structureId,
                 params={
                     "structureId": structureId,
                     "shipId": shipId,
@@ -325,7 +562,8 @@ class HTTPClient:
         res = await self._request(
             Route(
                 "get",
-                f"https://api.spacetraders.io/structures/{structureId}",
+                "/structures/{structureId}",
+                structureId=structureId,
                 params={"structureId": structureId},
             )
         )
@@ -338,7 +576,8 @@ class HTTPClient:
         res = await self._request(
             Route(
                 "post",
-                f"https://api.spacetraders.io/my/structures/{structureId}/transfer",
+                "/my/structures/{structureId}/transfer",
+                structureId=structureId,
                 params={
                     "structureId": structureId,
                     "shipId": shipId,
@@ -354,7 +593,8 @@ class HTTPClient:
         res = await self._request(
             Route(
                 "get",
-                f"https://api.spacetraders.io/my/structures/{structureId}",
+                "/my/structures/{structureId}",
+                structureId=structureId,
                 params={"structureId": structureId},
             )
         )
@@ -362,9 +602,7 @@ class HTTPClient:
         return res
 
     async def structure_get_all_info(self):
-        res = await self._request(
-            Route("get", "https://api.spacetraders.io/my/structures")
-        )
+        res = await self._request(Route("get", "/my/structures"))
 
         return res
 
@@ -374,7 +612,8 @@ class HTTPClient:
         res = await self._request(
             Route(
                 "get",
-                f"https://api.spacetraders.io/systems/{systemSymbol}/ship-listings",
+                "/systems/{systemSymbol}/ship-listings",
+                systemSymbol=systemSymbol,
                 params={"systemSymbol": systemSymbol},
             )
         )
@@ -385,7 +624,8 @@ class HTTPClient:
         res = await self._request(
             Route(
                 "get",
-                f"https://api.spacetraders.io/systems/{systemSymbol}/flight-plans",
+                "/systems/{systemSymbol}/flight-plans",
+                systemSymbol=systemSymbol,
                 params={"systemSymbol": systemSymbol},
             )
         )
@@ -396,7 +636,8 @@ class HTTPClient:
         res = await self._request(
             Route(
                 "get",
-                f"https://api.spacetraders.io/systems/{systemSymbol}/ships",
+                "/systems/{systemSymbol}/ships",
+                systemSymbol=systemSymbol,
                 params={"systemSymbol": systemSymbol},
             )
         )
@@ -407,7 +648,8 @@ class HTTPClient:
         res = await self._request(
             Route(
                 "get",
-                f"https://api.spacetraders.io/systems/{systemSymbol}/locations",
+                "/systems/{systemSymbol}/locations",
+                systemSymbol=systemSymbol,
                 params={"systemSymbol": systemSymbol},
             )
         )
@@ -418,7 +660,8 @@ class HTTPClient:
         res = await self._request(
             Route(
                 "get",
-                f"https://api.spacetraders.io/systems/{systemSymbol}",
+                "/systems/{systemSymbol}",
+                systemSymbol=systemSymbol,
                 params={"systemSymbol": systemSymbol},
             )
         )
@@ -428,23 +671,17 @@ class HTTPClient:
     # ==================== Types ==================== #
 
     async def type_goods(self):
-        res = await self._request(
-            Route("get", "https://api.spacetraders.io/types/goods")
-        )
+        res = await self._request(Route("get", "/types/goods"))
 
         return res
 
     async def type_loans(self):
-        res = await self._request(
-            Route("get", "https://api.spacetraders.io/types/loans")
-        )
+        res = await self._request(Route("get", "/types/loans"))
 
         return res
 
     async def type_structures(self):
-        res = await self._request(
-            Route("get", "https://api.spacetraders.io/types/structures")
-        )
+        res = await self._request(Route("get", "/types/structures"))
 
         return res
 
@@ -452,7 +689,7 @@ class HTTPClient:
         res = await self._request(
             Route(
                 "get",
-                "https://api.spacetraders.io/types/ships",
+                "/types/ships",
                 params=None if ship_class is None else {"class": ship_class},
             )
         )
@@ -465,7 +702,8 @@ class HTTPClient:
         res = await self._request(
             Route(
                 "post",
-                f"https://api.spacetraders.io/users/{username}/claim",
+                "/users/{username}/claim",
+                username=username,
                 params={"username": username},
             )
         )
@@ -478,7 +716,7 @@ class HTTPClient:
         res = await self._request(
             Route(
                 "post",
-                "https://api.spacetraders.io/my/warp-jumps",
+                "/my/warp-jumps",
                 params={"shipId": shipId},
             )
         )
@@ -0,0 +1,50 @@
+from typing import Optional, Type, TypeVar
+from weakref import WeakValueDictionary
+
+from .errors import SPTError
+from .model import Model
+
+M = TypeVar("M", bound=Model)
+
+
+class IdentityMap:
+    """Keeps one live object per (type, id).
+
+    Loading a payload for an object that is already held somewhere updates that
+    object in place instead of creating a new one, so every holder sees fresh
+    state. Objects are held weakly and drop out once nothing else uses them.
+    """
+
+    def __init__(self):
+        self._objects: "WeakValueDictionary[tuple, Model]" = WeakValueDictionary()
+
+    def __len__(self):
+        return len(self._objects)
+
+    def get(self, cls: Type[M], id: str) -> Optional[M]:
+        return self._objects.get((cls, id))
+
+    def load(self, cls: Type[M], http, payload: dict) -> M:
+        """The live `cls` for this payload, created or refreshed from it.
+
+        Check the result's `changed` to see which payload keys differed.
+        """
+        if payload is None:
+            raise SPTError(f"No payload to load a {cls.__name__} from")
+
+        if cls._wrapper is not None:
+            payload = payload.get(cls._wrapper, payload)
+
+        id = payload.get("id")
+        obj = self._objects.get((cls, id)) if id is not None else None
+
+        if obj is None:
+            obj = cls(http, payload)
+            if id is not None:
+                self._objects[(cls, id)] = obj
+            return obj
+
+        return obj.apply(payload)
+
+    def discard(self, cls: Type[Model], id: str):
+        self._objects.pop((cls, id), None)
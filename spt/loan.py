@@ -1,22 +1,25 @@
 from __future__ import annotations
 from typing import Tuple, List
 from .http import HTTPClient
+from .model import Field, Model
 
 
-class Loan:
+class Loan(Model):
+    __slots__ = ("http",)
+
+    due_at = Field("due")
+    id = Field("id")
+    repayment_amount = Field("repaymentAmount")
+    status = Field("status")
+    type = Field("type")
+
     def __init__(self, http: HTTPClient, data: dict):
         self.http = http
-        self.data = data
-
-        self.due_at = data.get("due", None)
-        self.id = data.get("id", None)
-        self.repayment_amount = data.get("repaymentAmount", None)
-        self.status = data.get("status", None)
-        self.type = data.get("type", None)
+        super().__init__(data)
 
     async def pay_off(self) -> Tuple[int, List[Loan]]:
         result = await self.http.loan_pay(self.id)
 
         return result.get("credits", None), [
-            Loan(self.http, x) for x in result["loans"]
+            self.http.identity.load(Loan, self.http, x) for x in result["loans"]
         ]
@@ -1,9 +1,23 @@
 from .http import HTTPClient
+from .model import Field, Model
 
 
-class Location:
+class Location(Model):
+    __slots__ = ("http",)
+
+    _wrapper = "location"
+
+    allows_construction = Field("allowsConstruction", False)
+    docked_ships = Field("dockedShips")
+    name = Field("name")
+    symbol = Field("symbol")
+    type = Field("type")
+    x = Field("x", 0)
+    y = Field("y", 0)
+
     def __init__(self, http: HTTPClient, data: dict):
-        self.allows_construction = data.get("allowsConstruction", False)
-        self.docked_ships = data.get("dockedShips", None)
-        self.name = data.get("name", None)
-        self.symbol = data.get("symbol", None)
+        self.http = http
+        super().__init__(data)
+
+    def __str__(self):
+        return str(self.symbol)
@@ -0,0 +1,119 @@
+import atexit
+import json
+import logging
+
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from typing import Optional
+
+FORMAT = "[%(name)s]  %(levelname)s - %(message)s"
+
+LOGGERS = ("spacetraders", "spacetraders-http")
+
+# The background writer from the last `setup`, if any
+_listener: Optional[QueueListener] = None
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line, with a request's fields alongside the message"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": record.created,
+            "logger": record.name,
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        request = getattr(record, "request", None)
+        if request is not None:
+            entry.update(request)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class _LazyQueueHandler(QueueHandler):
+    """Queues records as they are, leaving all formatting to the writer thread"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def shutdown():
+    """Stop the background writer, flushing everything queued so far"""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def setup(
+    path: Optional[str] = "spacetraders.log",
+    level: int = logging.DEBUG,
+    mode: str = "a",
+    quiet_asyncio: bool = True,
+    banner: bool = False,
+    background: bool = True,
+    structured: bool = False,
+) -> Optional[logging.Handler]:
+    """Opt-in logging setup for scripts. Nothing here runs on `import spt`.
+
+    Attaches one handler writing to `path` (stderr if None) to the package's
+    loggers. Pass `mode="w"` to truncate the file first. Calling it again replaces
+    the handler instead of adding another. Returns the handler.
+
+    With `background` the loggers only put records on a queue, and a thread
+    formats and writes them, so the event loop never blocks on the file.
+    `structured` writes JSON lines, with each request's fields as keys.
+    """
+    global _listener
+
+    if quiet_asyncio:
+        # Hides aiohttp's unclosed session warnings
+        logging.getLogger("asyncio").disabled = True
+
+    handler = (
+        logging.FileHandler(path, mode=mode)
+        if path is not None
+        else logging.StreamHandler()
+    )
+    handler.setLevel(level)
+    handler.setFormatter(JSONFormatter() if structured else logging.Formatter(FORMAT))
+
+    shutdown()
+    front = handler
+    if background:
+        queue: SimpleQueue = SimpleQueue()
+        _listener = QueueListener(queue, handler, respect_handler_level=True)
+        _listener.start()
+        front = _LazyQueueHandler(queue)
+        front.setLevel(level)
+
+    front.set_name("spacetraders")
+
+    for name in LOGGERS:
+        logger = logging.getLogger(name)
+        logger.setLevel(level)
+
+        for old in [h for h in logger.handlers if h.get_name() == "spacetraders"]:
+            logger.removeHandler(old)
+            old.close()
+
+        logger.addHandler(front)
+
+    if banner:
+        try:
+            import art
+
+            print(f"\033[1;33m {art.text2art('spt')} \033[0m")
+
+        except ImportError:
+            pass
+
+    return handler
+
+
+atexit.register(shutdown)
@@ -0,0 +1,194 @@
+import json
+
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+from .route import Route
+
+# Upper bounds, in seconds, of the latency histogram buckets. A +Inf bucket follows
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Routes past `max_routes` are folded into this one so memory stays bounded
+OVERFLOW = ("*", "other")
+
+
+class RouteMetrics:
+    """Counters for one (method, path template) pair"""
+
+    def __init__(self):
+        self.requests = 0
+        self.latency_sum = 0.0
+        self.buckets: List[int] = [0] * (len(BUCKETS) + 1)
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.statuses: Dict[int, int] = {}
+        self.retries = 0
+        self.retry_wait = 0.0
+        self.rejected = 0
+        self.timeouts = 0
+        self.ratelimit_wait = 0.0
+        self.queue_wait = 0.0
+        self.coalesced = 0
+        self.cache_hits = 0
+
+    def observe(self, latency: float, status: int, bytes_in: int, bytes_out: int):
+        self.requests += 1
+        self.latency_sum += latency
+        self.buckets[bisect_left(BUCKETS, latency)] += 1
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def quantile(self, q: float) -> float:
+        """Estimated latency quantile, as the upper bound of the bucket it falls in"""
+        target = q * self.requests
+        seen = 0
+
+        for bound, count in zip(BUCKETS, self.buckets):
+            seen += count
+            if count and seen >= target:
+                return bound
+
+        return float("inf") if self.buckets[-1] else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "latency_sum": self.latency_sum,
+            "latency_mean": self.latency_sum / self.requests if self.requests else 0.0,
+            "latency_p50": self.quantile(0.5),
+            "latency_p99": self.quantile(0.99),
+            "buckets": dict(zip([str(b) for b in BUCKETS] + ["+Inf"], self.buckets)),
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "statuses": {str(k): v for k, v in self.statuses.items()},
+            "retries": self.retries,
+            "retry_wait": self.retry_wait,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "ratelimit_wait": self.ratelimit_wait,
+            "queue_wait": self.queue_wait,
+            "coalesced": self.coalesced,
+            "cache_hits": self.cache_hits,
+        }
+
+
+class EventMetrics:
+    """Counters for one client event, readable as `Client.event_metrics[name]`"""
+
+    def __init__(self):
+        self.dispatched = 0
+        self.handlers = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.buckets: List[int] = [0] * (len(BUCKETS) + 1)
+
+    def observe(self, latency: float):
+        """Record a handler finishing `latency` seconds after its dispatch"""
+        self.handlers += 1
+        self.latency_sum += latency
+        self.latency_max = max(self.latency_max, latency)
+        self.buckets[bisect_left(BUCKETS, latency)] += 1
+
+    def to_dict(self) -> dict:
+        return {
+            "dispatched": self.dispatched,
+            "handlers": self.handlers,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "latency_mean": self.latency_sum / self.handlers if self.handlers else 0.0,
+            "latency_max": self.latency_max,
+            "buckets": dict(zip([str(b) for b in BUCKETS] + ["+Inf"], self.buckets)),
+        }
+
+
+class Metrics:
+    """Per-route request metrics, readable as `Client.http.metrics`"""
+
+    def __init__(self, max_routes: int = 128):
+        self.max_routes = max_routes
+        self.routes: Dict[Tuple[str, str], RouteMetrics] = {}
+
+    def __getitem__(self, route: Route) -> RouteMetrics:
+        key = (route.method.upper(), route.path)
+        metrics = self.routes.get(key)
+
+        if metrics is None:
+            if len(self.routes) >= self.max_routes:
+                key = OVERFLOW
+            metrics = self.routes.setdefault(key, RouteMetrics())
+
+        return metrics
+
+    def reset(self):
+        self.routes.clear()
+
+    def snapshot(self) -> dict:
+        return {
+            f"{method} {path}": metrics.to_dict()
+            for (method, path), metrics in self.routes.items()
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot())
+
+    def to_prometheus(self, prefix: str = "spacetraders_http") -> str:
+        """Render in the Prometheus text exposition format"""
+        lines = []
+
+        def metric(name: str, kind: str, doc: str):
+            lines.append(f"# HELP {prefix}_{name} {doc}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+        def labels(method: str, path: str, **extra) -> str:
+            pairs = {"method": method, "route": path, **extra}
+            return ",".join(f'{k}="{v}"' for k, v in pairs.items())
+
+        metric("request_duration_seconds", "histogram", "Request latency")
+        for (method, path), m in self.routes.items():
+            cumulative = 0
+            for bound, count in zip([str(b) for b in BUCKETS] + ["+Inf"], m.buckets):
+                cumulative += count
+                lines.append(
+                    f"{prefix}_request_duration_seconds_bucket"
+                    f"{{{labels(method, path, le=bound)}}} {cumulative}"
+                )
+            lines.append(
+                f"{prefix}_request_duration_seconds_sum"
+                f"{{{labels(method, path)}}} {m.latency_sum}"
+            )
+            lines.append(
+                f"{prefix}_request_duration_seconds_count"
+                f"{{{labels(method, path)}}} {m.requests}"
+            )
+
+        metric("responses_total", "counter", "Responses by status code")
+        for (method, path), m in self.routes.items():
+            for status, count in m.statuses.items():
+                lines.append(
+                    f"{prefix}_responses_total"
+                    f"{{{labels(method, path, status=status)}}} {count}"
+                )
+
+        counters = (
+            ("bytes_in", "received_bytes_total", "Response body bytes"),
+            ("bytes_out", "sent_bytes_total", "Request URL, query and body bytes"),
+            ("retries", "retries_total", "Retried attempts"),
+            ("retry_wait", "retry_wait_seconds_total", "Backoff before retries"),
+            ("rejected", "circuit_rejected_total", "Calls refused by an open circuit"),
+            ("timeouts", "timeouts_total", "Timed out attempts"),
+            ("ratelimit_wait", "ratelimit_wait_seconds_total", "Rate limit waits"),
+            ("queue_wait", "queue_wait_seconds_total", "Time queued behind others"),
+            ("coalesced", "coalesced_total", "Calls joining an in-flight request"),
+            ("cache_hits", "cache_hits_total", "Calls served from the cache"),
+        )
+        for attr, name, doc in counters:
+            metric(name, "counter", doc)
+            for (method, path), m in self.routes.items():
+                lines.append(
+                    f"{prefix}_{name}{{{labels(method, path)}}} {getattr(m, attr)}"
+                )
+
+        return "\n".join(lines) + "\n"
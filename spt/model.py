@@ -0,0 +1,78 @@
+from typing import Any, FrozenSet, Optional
+
+_MISSING = object()
+
+# Shared by every model that hasn't been refreshed, so building one copies nothing
+_UNCHANGED: FrozenSet[str] = frozenset()
+
+
+class Field:
+    """A model attribute, read from the raw payload only when accessed"""
+
+    __slots__ = ("key", "default")
+
+    def __init__(self, key: str, default: Any = None):
+        self.key = key
+        self.default = default
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+
+        return obj.data.get(self.key, self.default)
+
+
+class Model:
+    """Base for API objects. Keeps the raw payload and parses fields lazily.
+
+    Models use `__slots__`, so an instance is just a reference to its payload. Use
+    `apply` to refresh one in place from a newer payload; `changed` then holds the
+    payload keys whose values differ. It is empty for a model never refreshed, and
+    worked out on first access rather than on every `apply`.
+    """
+
+    __slots__ = ("data", "_previous", "__weakref__")
+
+    # Key the payload is wrapped in by some endpoints, e.g. {"flightPlan": {...}}
+    _wrapper: Optional[str] = None
+
+    def __init__(self, data: Optional[dict]):
+        if data is not None and self._wrapper is not None:
+            data = data.get(self._wrapper, data)
+
+        self.data: dict = data if data is not None else {}
+
+        # The payload `apply` replaced, until `changed` diffs it into a frozenset
+        self._previous = _UNCHANGED
+
+    @property
+    def changed(self) -> FrozenSet[str]:
+        """Payload keys whose values differed at the last `apply`"""
+        previous = self._previous
+        if isinstance(previous, frozenset):
+            return previous
+
+        data = self.data
+        changed = frozenset(
+            k
+            for k in previous.keys() | data.keys()
+            if previous.get(k, _MISSING) != data.get(k, _MISSING)
+        )
+        self._previous = changed
+        return changed
+
+    def apply(self, payload: Optional[dict]):
+        """Replace this object's state with a newer payload. Returns self"""
+        if payload is None:
+            return self
+
+        if self._wrapper is not None:
+            payload = payload.get(self._wrapper, payload)
+
+        old = self.data
+        self._previous = old if payload is not old else _UNCHANGED
+        self.data = payload
+        return self
+
+    def __repr__(self):
+        return f"<{type(self).__name__} id={self.data.get('id')!r}>"
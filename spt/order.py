@@ -0,0 +1,12 @@
+from .model import Field, Model
+
+
+class Order(Model):
+    """A filled purchase or sell order"""
+
+    __slots__ = ()
+
+    good = Field("good")
+    quantity = Field("quantity", 0)
+    price_per_unit = Field("pricePerUnit", 0)
+    total = Field("total", 0)
@@ -0,0 +1,221 @@
+import asyncio
+import logging
+
+from asyncio import AbstractEventLoop
+from typing import Dict, List, Optional
+
+from .cache import ResponseCache
+from .decode import Decoder
+from .http import HTTPClient
+from .identity import IdentityMap
+from .metrics import Metrics
+from .ratelimit import RateLimiter
+from .retry import Breakers, RetryPolicy
+from .route import Route
+from .scheduler import Scheduler
+from .transport import Transport
+
+# Parameters naming an object that belongs to one account, checked in this order
+OWNER_KEYS = ("shipId", "fromShipId", "flightPlanId", "loanId", "structureId")
+
+# Response keys holding owned objects, used to learn which account owns what
+OWNED_KEYS = (
+    "ship",
+    "ships",
+    "fromShip",
+    "toShip",
+    "flightPlan",
+    "loan",
+    "loans",
+    "structure",
+    "structures",
+)
+
+
+class HTTPClientPool(HTTPClient):
+    """Client for web requests spread over several accounts.
+
+    Holds one HTTPClient, with its own session and rate limit budget, per token.
+    Calls for a ship, flight plan, loan or structure go to the account that owns
+    it. Other reads go to the account with the most budget left, but other writes
+    (buying ships, taking loans, building structures, claiming names) spend
+    credits, so they go to the `primary` account (the first token unless given).
+    Use `using(token)` to send one from a particular account. Account-wide
+    listings are fetched from every account in parallel and merged.
+
+    Settings shared by every account are read from the members. `ratelimiter`,
+    `scheduler`, `cache` and `transport` are the primary account's; `members` has
+    the others and `budgets` a summary of all of them.
+    """
+
+    def __init__(self, tokens: List[str], loop: AbstractEventLoop, **kwargs):
+        """Client for web requests. Requires at least one Token"""
+        if not tokens:
+            raise ValueError("HTTPClientPool needs at least one token")
+
+        tokens = list(tokens)
+        primary = kwargs.pop("primary", tokens[0])
+        if primary not in tokens:
+            raise ValueError("The primary token must be one of the pool's tokens")
+
+        self._log = logging.getLogger("spacetraders-http")
+
+        # Every account gets its own budget, so a shared limiter makes no sense here
+        kwargs.pop("ratelimiter", None)
+        self.metrics: Metrics = kwargs.get("metrics", None) or Metrics()
+        kwargs["metrics"] = self.metrics
+        identity = kwargs.get("identity", None)
+        self.identity: IdentityMap = IdentityMap() if identity is None else identity
+        kwargs["identity"] = self.identity
+
+        # Accounts share a host, so they share its circuit breaker too
+        breakers = kwargs.get("breakers", None)
+        self.breakers: Optional[Breakers] = (
+            Breakers(
+                kwargs.get("breaker_threshold", 5), kwargs.get("breaker_cooldown", 30.0)
+            )
+            if breakers is None
+            else (None if breakers is False else breakers)
+        )
+        kwargs["breakers"] = False if self.breakers is None else self.breakers
+        self.arrivals = None
+        self.tokens: List[str] = tokens
+        self.members: List[HTTPClient] = [
+            HTTPClient(token, loop, **kwargs) for token in tokens
+        ]
+        self.primary: HTTPClient = self.members[tokens.index(primary)]
+        self.owners: Dict[str, HTTPClient] = {}
+
+        # Built from the same kwargs, so these are the same for every member
+        self.base_url: str = self.primary.base_url
+        self.decoder: Decoder = self.primary.decoder
+        self.retry: RetryPolicy = self.primary.retry
+        self.coalesce: bool = self.primary.coalesce
+        self.log_sample: float = self.primary.log_sample
+        self.drain_timeout: Optional[float] = self.primary.drain_timeout
+
+    @property
+    def ratelimiter(self) -> RateLimiter:
+        return self.primary.ratelimiter
+
+    @property
+    def scheduler(self) -> Scheduler:
+        return self.primary.scheduler
+
+    @property
+    def cache(self) -> Optional[ResponseCache]:
+        return self.primary.cache
+
+    @property
+    def transport(self) -> Transport:
+        return self.primary.transport
+
+    def using(self, token: str) -> HTTPClient:
+        """The member for one account, to send a call from it explicitly"""
+        try:
+            return self.members[self.tokens.index(token)]
+        except ValueError:
+            raise ValueError("Token is not one of the pool's tokens") from None
+
+    @property
+    def closed(self) -> bool:
+        return all(m.closed for m in self.members)
+
+    async def start(self):
+        await asyncio.gather(*(m.start() for m in self.members))
+
+    async def close(self, timeout: Optional[float] = None):
+        """Drain and close every account's connection pool"""
+        await asyncio.gather(*(m.close(timeout) for m in self.members))
+
+    @property
+    def coalesced(self) -> int:
+        return sum(m.coalesced for m in self.members)
+
+    @property
+    def inflight(self) -> int:
+        return sum(m.inflight for m in self.members)
+
+    def budgets(self) -> List[dict]:
+        """Rate limit state of every account, in token order"""
+        return [
+            {
+                "tokens": m.ratelimiter.tokens,
+                "blocked_for": m.ratelimiter.blocked_for,
+                "queued": m.scheduler.depth,
+            }
+            for m in self.members
+        ]
+
+    def owner_of(self, id: str) -> Optional[HTTPClient]:
+        return self.owners.get(id)
+
+    def member_for(self, route: Route) -> HTTPClient:
+        """The account a route should be sent from"""
+        for key in OWNER_KEYS:
+            value = route.parameters.get(key) or (route.params or {}).get(key)
+            if value is not None and value in self.owners:
+                return self.owners[value]
+
+        if route.method.upper() != "GET":
+            return self.primary
+
+        return max(self.members, key=lambda m: m.ratelimiter.tokens - m.scheduler.depth)
+
+    def _learn(self, member: HTTPClient, result: dict):
+        """Remember which account owns the objects in a response"""
+        if not isinstance(result, dict):
+            return
+
+        for key in OWNED_KEYS:
+            value = result.get(key)
+            for item in value if isinstance(value, list) else (value,):
+                if isinstance(item, dict) and item.get("id") is not None:
+                    self.owners[item["id"]] = member
+                    # Plans are only readable by their ship's account
+                    if item.get("flightPlanId") is not None:
+                        self.owners[item["flightPlanId"]] = member
+
+    async def _request(self, route: Route) -> dict:
+        member = self.member_for(route)
+        result = await member._request(route)
+
+        self._learn(member, result)
+        return result
+
+    async def _gather(self, name: str, key: str) -> dict:
+        results = await asyncio.gather(*(getattr(m, name)() for m in self.members))
+        merged = []
+
+        for member, result in zip(self.members, results):
+            self._learn(member, result)
+            merged.extend(result.get(key, []))
+
+        return {key: merged}
+
+    # ==================== Account-wide views ==================== #
+
+    async def accounts(self) -> List[dict]:
+        return await asyncio.gather(*(m.account() for m in self.members))
+
+    async def account(self):
+        users = [r.get("user", {}) for r in await self.accounts()]
+
+        return {
+            "user": {
+                "username": ",".join(str(u.get("username")) for u in users),
+                "credits": sum(u.get("credits", 0) for u in users),
+                "shipCount": sum(u.get("shipCount", 0) for u in users),
+                "structureCount": sum(u.get("structureCount", 0) for u in users),
+                "joinedAt": min(u.get("joinedAt") or "" for u in users) or None,
+            }
+        }
+
+    async def loan_get_all(self):
+        return await self._gather("loan_get_all", "loans")
+
+    async def ship_get_all(self):
+        return await self._gather("ship_get_all", "ships")
+
+    async def structure_get_all_info(self):
+        return await self._gather("structure_get_all_info", "structures")
@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import time
+
+from typing import Optional
+
+
+class RateLimiter:
+    """An asyncio token bucket shared by every request of a client.
+
+    Tokens refill continuously at `rate` per second up to `burst`. Any number
+    of requests may be in flight at once; callers only wait when the bucket is
+    empty. The bucket is corrected from the `x-ratelimit-remaining` and
+    `Retry-After` headers of every response via `update`.
+    """
+
+    def __init__(self, rate: float = 2.0, burst: int = 10):
+        self.rate = float(rate)
+        self.burst = int(burst)
+
+        self._log = logging.getLogger("spacetraders-http")
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._seeded = False
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(float(self.burst), self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        """Tokens currently available, without consuming any"""
+        self._refill(time.monotonic())
+        return self._tokens
+
+    @property
+    def blocked_for(self) -> float:
+        """Seconds until the server allows requests again, 0 if not blocked"""
+        return max(0.0, self._blocked_until - time.monotonic())
+
+    async def acquire(self) -> float:
+        """Wait until a request may be sent. Returns the seconds spent waiting"""
+        # Created lazily so the lock binds to the running loop
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        start = time.monotonic()
+
+        # The lock is only held while waiting for a token, never across a request,
+        # and hands tokens out in FIFO order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+
+                self._refill(now)
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return time.monotonic() - start
+
+                await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+    def release(self):
+        """Give back a token that was acquired but not used"""
+        self._tokens = min(float(self.burst), self._tokens + 1.0)
+
+    def update(self, remaining: Optional[int], retry_after: Optional[float]):
+        """Correct the bucket from a response's rate limit headers"""
+        now = time.monotonic()
+        self._refill(now)
+
+        if remaining is not None:
+            if not self._seeded:
+                # First answer from the server replaces our guess
+                self._tokens = min(float(self.burst), float(remaining))
+                self._seeded = True
+            else:
+                # Responses can arrive out of order, so only ever trust a lower count
+                self._tokens = min(self._tokens, float(remaining))
+
+        if retry_after and (remaining is None or remaining <= 0):
+            self._log.warning(
+                f"Client has hit ratelimit, waiting for {retry_after} seconds"
+            )
+            self._tokens = 0.0
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+
+
+class SharedRateLimiter(RateLimiter):
+    """A RateLimiter whose bucket lives in shared memory, for several processes.
+
+    Make it in the parent and hand it to each worker process when it starts
+    (e.g. as a `Process` argument). Every copy then draws from the same bucket, so
+    one account's limit holds however many processes send requests. Each change
+    to the bucket is made under a cross-process lock, held only for the update.
+    `time.monotonic` is system-wide, so timestamps agree between processes.
+    """
+
+    # Slots of the shared array
+    TOKENS, UPDATED, BLOCKED_UNTIL, SEEDED = range(4)
+
+    def __init__(self, rate: float = 2.0, burst: int = 10, context=None):
+        import multiprocessing
+
+        context = context or multiprocessing.get_context("spawn")
+        self._shared = context.Array("d", 4)
+        super().__init__(rate, burst)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # asyncio locks belong to one loop, so each process makes its own
+        state["_lock"] = None
+        return state
+
+    def _field(index: int):
+        def get(self) -> float:
+            return self._shared[index]
+
+        def set(self, value: float):
+            self._shared[index] = value
+
+        return property(get, set)
+
+    _tokens = _field(TOKENS)
+    _updated = _field(UPDATED)
+    _blocked_until = _field(BLOCKED_UNTIL)
+    _seeded = _field(SEEDED)
+    del _field
+
+    @property
+    def tokens(self) -> float:
+        with self._shared.get_lock():
+            return super().tokens
+
+    async def acquire(self) -> float:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        start = time.monotonic()
+
+        # The asyncio lock keeps this process's waiters in order, and the shared
+        # one makes taking a token atomic across processes
+        async with self._lock:
+            while True:
+                with self._shared.get_lock():
+                    now = time.monotonic()
+                    if now < self._blocked_until:
+                        wait = self._blocked_until - now
+                    else:
+                        self._refill(now)
+                        if self._tokens >= 1.0:
+                            self._tokens -= 1.0
+                            return time.monotonic() - start
+                        wait = (1.0 - self._tokens) / self.rate
+
+                await asyncio.sleep(wait)
+
+    def release(self):
+        with self._shared.get_lock():
+            super().release()
+
+    def update(self, remaining: Optional[int], retry_after: Optional[float]):
+        with self._shared.get_lock():
+            super().update(remaining, retry_after)
@@ -0,0 +1,194 @@
+import asyncio
+import logging
+import random
+import time
+
+from typing import Dict, FrozenSet, Optional, Tuple, Type
+
+from aiohttp import ClientConnectionError, ClientConnectorError
+
+from .route import Route
+
+# Statuses worth trying again, the server may well answer next time
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Statuses that mean the request was refused before anything happened, so even a
+# non-idempotent request like a purchase order is safe to send again
+SAFE_STATUSES = frozenset({429, 503})
+
+# Statuses counted against a host's circuit breaker
+FAILURE_STATUSES = frozenset({500, 502, 503, 504})
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+RETRY_EXCEPTIONS: Tuple[Type[BaseException], ...] = (
+    asyncio.TimeoutError,
+    ClientConnectionError,
+)
+
+
+class RetryPolicy:
+    """Decides whether a failed attempt is retried, and how long to wait first.
+
+    Delays grow exponentially from `base` up to `cap`, with full jitter so a fleet
+    of clients doesn't retry in lockstep. A `Retry-After` from the server is always
+    waited out. Requests that aren't idempotent (POST) are only retried when the
+    server can't have acted on them: on 429/503 or when the connection was never
+    made. Pass `retry_unsafe=True` to retry them like any other request.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 5,
+        base: float = 0.5,
+        cap: float = 30.0,
+        jitter: bool = True,
+        statuses: FrozenSet[int] = RETRY_STATUSES,
+        exceptions: Tuple[Type[BaseException], ...] = RETRY_EXCEPTIONS,
+        retry_unsafe: bool = False,
+    ):
+        self.max_retries = max_retries
+        self.base = base
+        self.cap = cap
+        self.jitter = jitter
+        self.statuses = statuses
+        self.exceptions = exceptions
+        self.retry_unsafe = retry_unsafe
+
+    def idempotent(self, route: Route) -> bool:
+        return self.retry_unsafe or route.method.upper() in IDEMPOTENT_METHODS
+
+    def retry_status(self, route: Route, status: int) -> bool:
+        """Whether a response with `status` should be retried"""
+        if status not in self.statuses:
+            return False
+
+        return self.idempotent(route) or status in SAFE_STATUSES
+
+    def retry_error(self, route: Route, error: BaseException) -> bool:
+        """Whether an attempt that raised `error` should be retried"""
+        if not isinstance(error, self.exceptions):
+            return False
+
+        # A refused connection never reached the server
+        return self.idempotent(route) or isinstance(error, ClientConnectorError)
+
+    def delay(self, retries: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to wait before retry number `retries`, counting from 1"""
+        delay = min(self.cap, self.base * 2 ** (retries - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+
+        return delay
+
+
+class CircuitBreaker:
+    """Sheds load from a host that keeps failing.
+
+    After `threshold` failures in a row the breaker opens and requests fail fast
+    with CircuitOpen. Once `cooldown` seconds pass it lets a single probe through
+    (half-open); a success closes it again, a failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, host: str, threshold: int = 5, cooldown: float = 30.0):
+        self.host = host
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._log = logging.getLogger("spacetraders-http")
+
+        self.failures = 0
+        self.trips = 0
+        self.rejected = 0
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_at = 0.0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and self.retry_in == 0:
+            return self.HALF_OPEN
+        return self._state
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until an open breaker lets a probe through"""
+        if self._state != self.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.cooldown - time.monotonic())
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now"""
+        now = time.monotonic()
+
+        if self._state == self.CLOSED:
+            return True
+
+        # The probe is let through once the cooldown ends. Another is allowed if
+        # it never reports back within a cooldown, e.g. because it was cancelled
+        if self._state == self.OPEN and self.retry_in == 0:
+            self._state = self.HALF_OPEN
+            self._probe_at = now
+            return True
+
+        if self._state == self.HALF_OPEN and now - self._probe_at >= self.cooldown:
+            self._probe_at = now
+            return True
+
+        self.rejected += 1
+        return False
+
+    def success(self):
+        if self._state != self.CLOSED:
+            self._log.info(f"Circuit for {self.host} closed")
+
+        self._state = self.CLOSED
+        self.failures = 0
+
+    def failure(self):
+        self.failures += 1
+
+        if self._state == self.HALF_OPEN or self.failures >= self.threshold:
+            if self._state != self.OPEN:
+                self.trips += 1
+                self._log.warning(
+                    f"Circuit for {self.host} opened for {self.cooldown}s "
+                    f"after {self.failures} failures"
+                )
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+
+    def to_dict(self) -> dict:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "rejected": self.rejected,
+            "retry_in": self.retry_in,
+        }
+
+
+class Breakers:
+    """One CircuitBreaker per host, made on first use"""
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.hosts: Dict[str, CircuitBreaker] = {}
+
+    def __getitem__(self, host: str) -> CircuitBreaker:
+        breaker = self.hosts.get(host)
+        if breaker is None:
+            breaker = self.hosts[host] = CircuitBreaker(
+                host, self.threshold, self.cooldown
+            )
+        return breaker
+
+    def snapshot(self) -> Dict[str, dict]:
+        return {host: breaker.to_dict() for host, breaker in self.hosts.items()}
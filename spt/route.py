@@ -1,27 +1,57 @@
-from typing import Optional
+from typing import Any, Optional
+from urllib.parse import quote
 from .errors import HTTPError
 
 
 class Route:
+    BASE = "https://api.spacetraders.io"
+
     def __init__(
         self,
         method: Optional[str],
-        url: Optional[str],
+        path: Optional[str],
         headers: Optional[dict] = None,
         json: Optional[dict] = None,
         params: Optional[dict] = None,
         timeout: Optional[float] = 5.0,
+        priority: Optional[int] = None,
+        **parameters: Any,
     ):
-        """Make a Route for the HTTP Client"""
-        if method is None or url is None:
+        """Make a Route for the HTTP Client
+
+        `path` is a template such as `/my/ships/{shipId}`, filled in from `parameters`
+        """
+        if method is None or path is None:
             raise HTTPError("Method or URL is None")
 
-        self.url = url
+        self.path = path
+        self.parameters = parameters
         self.method = method
         self.headers = headers
         self.json = json
         self.params = params
         self.timeout = timeout
+        self.priority = priority
+
+        if parameters:
+            path = path.format(
+                **{k: quote(str(v), safe="") for k, v in parameters.items()}
+            )
+
+        self.endpoint = path
+        self.url = self.resolve(self.BASE)
+
+    def resolve(self, base: str) -> str:
+        """The full URL of this route on the API at `base`"""
+        return (
+            self.endpoint if self.endpoint.startswith("http") else base + self.endpoint
+        )
+
+    @property
+    def key(self) -> str:
+        """Identifies identical requests: method, URL and query parameters"""
+        params = "&".join(f"{k}={v}" for k, v in sorted((self.params or {}).items()))
+        return f"{self.method.upper()} {self.url}?{params}"
 
     def __str__(self):
         return f"{self.method.capitalize()} '{self.url}'\n\nParameters - {self.params}\nHeaders - {self.headers}\n"
@@ -0,0 +1,170 @@
+import asyncio
+import time
+
+from collections import OrderedDict, deque
+from enum import IntEnum
+from typing import Dict, Optional, Tuple
+
+from .ratelimit import RateLimiter
+from .route import Route
+
+
+class Priority(IntEnum):
+    """Priority classes for requests. Lower values are served first"""
+
+    CRITICAL = 0
+    NORMAL = 1
+    BACKGROUND = 2
+
+
+# (method, path template) -> priority. Anything not listed is NORMAL
+ROUTE_PRIORITIES: Dict[Tuple[str, str], Priority] = {
+    ("POST", "/my/purchase-orders"): Priority.CRITICAL,
+    ("POST", "/my/sell-orders"): Priority.CRITICAL,
+    ("POST", "/my/flight-plans"): Priority.CRITICAL,
+    ("POST", "/my/warp-jumps"): Priority.CRITICAL,
+    ("GET", "/locations/{locationSymbol}/marketplace"): Priority.BACKGROUND,
+    ("GET", "/locations/{locationSymbol}/ships"): Priority.BACKGROUND,
+    ("GET", "/game/status"): Priority.BACKGROUND,
+    ("GET", "/game/leaderboard/net-worth"): Priority.BACKGROUND,
+    ("GET", "/systems/{systemSymbol}"): Priority.BACKGROUND,
+    ("GET", "/systems/{systemSymbol}/locations"): Priority.BACKGROUND,
+    ("GET", "/systems/{systemSymbol}/ship-listings"): Priority.BACKGROUND,
+    ("GET", "/systems/{systemSymbol}/flight-plans"): Priority.BACKGROUND,
+    ("GET", "/systems/{systemSymbol}/ships"): Priority.BACKGROUND,
+    ("GET", "/types/goods"): Priority.BACKGROUND,
+    ("GET", "/types/loans"): Priority.BACKGROUND,
+    ("GET", "/types/ships"): Priority.BACKGROUND,
+    ("GET", "/types/structures"): Priority.BACKGROUND,
+}
+
+# Parameters that identify the ship a request is made for
+OWNER_KEYS = ("shipId", "fromShipId")
+
+
+class ClassStats:
+    """Queue statistics for one priority class"""
+
+    def __init__(self):
+        self.depth = 0
+        self.served = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float):
+        self.served += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def to_dict(self) -> dict:
+        return {
+            "depth": self.depth,
+            "served": self.served,
+            "mean_wait": self.total_wait / self.served if self.served else 0.0,
+            "max_wait": self.max_wait,
+        }
+
+
+class Scheduler:
+    """Orders requests waiting for the rate limiter.
+
+    Each rate limit token goes to the highest priority class with waiters. Inside a
+    class, ships are served round robin so one busy ship can't starve the rest.
+    """
+
+    def __init__(
+        self,
+        ratelimiter: RateLimiter,
+        priorities: Optional[Dict[Tuple[str, str], Priority]] = None,
+    ):
+        self.ratelimiter = ratelimiter
+        self.priorities = dict(ROUTE_PRIORITIES)
+        self.priorities.update(priorities or {})
+
+        # priority -> owner -> waiting futures, rotated for round robin
+        self._queues: Dict[Priority, "OrderedDict[Optional[str], deque]"] = {
+            p: OrderedDict() for p in Priority
+        }
+        self._stats: Dict[Priority, ClassStats] = {p: ClassStats() for p in Priority}
+        self._task: Optional[asyncio.Task] = None
+
+    def classify(self, route: Route) -> Priority:
+        if route.priority is not None:
+            return Priority(route.priority)
+
+        return self.priorities.get((route.method.upper(), route.path), Priority.NORMAL)
+
+    @staticmethod
+    def owner(route: Route) -> Optional[str]:
+        """The ship a request belongs to, if any"""
+        for key in OWNER_KEYS:
+            if key in route.parameters:
+                return route.parameters[key]
+
+            if route.params and key in route.params:
+                return route.params[key]
+
+        return None
+
+    @property
+    def depth(self) -> int:
+        return sum(s.depth for s in self._stats.values())
+
+    def stats(self) -> Dict[str, dict]:
+        """Queue depth and wait times per priority class"""
+        return {p.name.lower(): s.to_dict() for p, s in self._stats.items()}
+
+    async def acquire(self, route: Route) -> Tuple[float, float]:
+        """Wait for this route's turn.
+
+        Returns the seconds spent waiting, and how much of that was the rate limiter
+        refilling the token this route got
+        """
+        loop = asyncio.get_event_loop()
+        priority = self.classify(route)
+        future = loop.create_future()
+
+        queues = self._queues[priority]
+        queues.setdefault(self.owner(route), deque()).append(future)
+        self._stats[priority].depth += 1
+
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+
+        start = time.monotonic()
+        limited = await future
+
+        waited = time.monotonic() - start
+        self._stats[priority].record(waited)
+        return waited, min(waited, limited)
+
+    def _next(self) -> Optional[asyncio.Future]:
+        for priority in Priority:
+            queues = self._queues[priority]
+
+            while queues:
+                owner, queue = next(iter(queues.items()))
+                future = queue.popleft()
+                self._stats[priority].depth -= 1
+
+                if queue:
+                    queues.move_to_end(owner)
+                else:
+                    del queues[owner]
+
+                # Waiters that were cancelled while queued are skipped
+                if not future.done():
+                    return future
+
+        return None
+
+    async def _run(self):
+        while self.depth:
+            limited = await self.ratelimiter.acquire()
+
+            future = self._next()
+            if future is None:
+                self.ratelimiter.release()
+                continue
+
+            future.set_result(limited)
@@ -1,36 +1,64 @@
 from __future__ import annotations
 from typing import Union, Tuple
 
+from .cargo import Cargo
+from .errors import HTTPError
 from .flight import FlightPlan
 from .http import HTTPClient
 from .location import Location
+from .model import Field, Model
+from .order import Order
 from .structure import Structure, OwnedStructure
 
 
-class ShipInfo:
-    ...
+class ShipInfo: ...
 
 
-class Ship:
+def _expect(result: dict, key: str, action: str) -> dict:
+    """`result[key]`, or an HTTPError with the API's message when it is missing"""
+    value = result.get(key)
+    if value is None:
+        error = result.get("error", {}).get("message", "Unknown Error")
+        raise HTTPError(f"Could not {action}: {error}")
+    return value
+
+
+class Ship(Model):
+    __slots__ = ("http", "_cargo")
+
+    ship_class = Field("class")
+    id = Field("id")
+    location = Field("location")
+    manufacturer = Field("manufacturer")
+    max_cargo = Field("maxCargo", 0)
+    plating = Field("plating", 0)
+    spaceAvailable = Field("spaceAvailable", 0)
+    speed = Field("speed", 0)
+    ship_type = Field("type")
+    weapons = Field("weapons", 0)
+
+    x = Field("x", 0)
+    y = Field("y", 0)
+
+    flight_plan_id = Field("flightPlanId")
+
     def __init__(self, http: HTTPClient, data: dict) -> None:
         self.http = http
-        self.data = data
+        self._cargo = None
+        super().__init__(data)
 
-        self.cargo = data.get("cargo", [])
-        self.ship_class = data.get("class", None)
-        self.id = data.get("id", None)
-        self.location = Location(data.get("location"))
-        self.manufacturer = data.get("manufacturer")
-        self.max_cargo = data.get("maxCargo", 0)
-        self.plating = data.get("plating", 0)
-        self.spaceAvailable = data.get("spaceAvailable", 0)
-        self.speed = data.get("speed", 0)
-        self.ship_type = data.get("type", None)
-        self.weapons = data.get("weapons", 0)
+    @property
+    def cargo(self) -> Cargo:
+        """The hold, rebuilt only once a newer payload has replaced it"""
+        items = self.data.setdefault("cargo", [])
+        cargo = self._cargo
 
-        self.x, self.y = data.get("x", 0), data.get("y", 0)
+        if cargo is None or cargo.source is not items:
+            cargo = Cargo(items, self.max_cargo, self.data.get("spaceAvailable"))
+            cargo.source = items
+            self._cargo = cargo
 
-        self.flight_plan_id = data.get("flightPlanId", None)
+        return cargo
 
     async def travel_to(
         self, destination: Union[str, Location, Structure, OwnedStructure]
@@ -49,7 +77,16 @@ class Ship:
         else:
             raise Exception("Type is not of (str, Location, Structure, OwnedStructure)")
 
-        return FlightPlan(self.http, result)
+        plan = FlightPlan(self.http, result)
+
+        # An error payload has no plan id, and the ship hasn't left
+        if plan.id is not None:
+            self.data["flightPlanId"] = plan.id
+
+            if self.http.arrivals is not None:
+                self.http.arrivals.schedule(self, plan)
+
+        return plan
 
     @property
     async def flight_plan(self) -> Union[None, FlightPlan]:
@@ -57,39 +94,53 @@ class Ship:
             return
 
         result = await self.http.flight_plan_info(self.flight_plan_id)
+        plan = FlightPlan(self.http, result)
+
+        # Pick up flights started elsewhere, e.g. before a restart
+        arrivals = self.http.arrivals
+        if arrivals is not None and self.id not in arrivals:
+            arrivals.schedule(self, plan)
 
-        return FlightPlan(self.http, result)
+        return plan
 
     async def purchase(self, good: str, quantity: int) -> (int, Order):
         result = await self.http.order_purchase(self.id, good, quantity)
 
-        self.__init__(self.http, result.get("ship", None))
+        self.apply(result.get("ship", None))
         return result.get("credits", None), Order(result.get("order", None))
 
     async def sell(self, good: str, quantity: int) -> (int, Order):
         result = await self.http.order_sell(self.id, good, quantity)
 
-        self.__init__(self.http, result.get("ship", None))
+        self.apply(result.get("ship", None))
         return result.get("credits", None), Order(result.get("order"))
 
     async def update(self):
         result = await self.http.ship_get_info(self.id)
-        self.__init__(self.http, result.get("ship", None))
+        self.apply(result.get("ship", None))
         return
 
-    async def jettison(self, good: str, amount: int):
+    async def jettison(self, good: str, amount: int = None):
+        if amount is None:
+            amount = self.cargo[good]
+
         result = await self.http.ship_cargo_jettison(self.id, good, amount)
 
         return result  # TODO: Maybe make an object for this ?  | Or, return the 'quantityRemaining' attribute ?
 
     async def scrap(self):
         result = await self.http.ship_scrap(self.id)
+        self.http.identity.discard(Ship, self.id)
 
         return result["success"]
 
     async def transfer_cargo(
-        self, target_ship: Union[str, Ship], good: str, amount: int
+        self, target_ship: Union[str, Ship], good: str, amount: int = None
     ) -> Tuple[Ship, Ship]:
+        """Move `amount` of a good, everything held by default, to another ship"""
+        if amount is None:
+            amount = self.cargo[good]
+
         if isinstance(target_ship, str):
             result = await self.http.ship_cargo_transfer(
                 self.id, target_ship, good, amount
@@ -103,11 +154,22 @@ class Ship:
         else:
             raise Exception("Type is not of (str, Ship)")
 
-        return Ship(self.http, result["fromShip"]), Ship(self.http, result["toShip"])
+        from_ship = _expect(result, "fromShip", f"transfer {good}")
+        to_ship = _expect(result, "toShip", f"transfer {good}")
+
+        identity = self.http.identity
+        return (
+            identity.load(Ship, self.http, from_ship),
+            identity.load(Ship, self.http, to_ship),
+        )
 
     async def deposit_to_owned_structure(
-        self, structure: Union[OwnedStructure, str], good: str, quantity: int
+        self, structure: Union[OwnedStructure, str], good: str, quantity: int = None
     ):
+        """Deposit `quantity` of a good, everything held by default"""
+        if quantity is None:
+            quantity = self.cargo[good]
+
         if isinstance(structure, OwnedStructure):
             result = await self.http.structure_deposit_owned(
                 structure.id, self.id, good, quantity
@@ -121,13 +183,18 @@ class Ship:
         else:
             raise Exception("Type is not of (OwnedStructure, str)")
 
-        self.__init__(self.http, result.get("ship", None))
+        deposited = _expect(result, "structure", f"deposit {good}")
+        self.apply(result.get("ship", None))
 
-        return OwnedStructure(self.http, result.get("structure"))
+        return self.http.identity.load(OwnedStructure, self.http, deposited)
 
     async def deposit_to_structure(
-        self, structure: Union[Structure, str], good: str, quantity: int
+        self, structure: Union[Structure, str], good: str, quantity: int = None
     ):
+        """Deposit `quantity` of a good, everything held by default"""
+        if quantity is None:
+            quantity = self.cargo[good]
+
         if isinstance(structure, Structure):
             result = await self.http.structure_deposit(
                 structure.id, self.id, good, quantity
@@ -141,9 +208,10 @@ class Ship:
         else:
             raise Exception("Type is not of (OwnedStructure, str)")
 
-        self.__init__(self.http, result.get("ship", None))
+        deposited = _expect(result, "structure", f"deposit {good}")
+        self.apply(result.get("ship", None))
 
-        return OwnedStructure(self.http, result.get("structure"))
+        return self.http.identity.load(OwnedStructure, self.http, deposited)
 
     async def transfer_to_ship(
         self, structure: Union[OwnedStructure, str], good: str, quantity: int
@@ -161,6 +229,7 @@ class Ship:
         else:
             raise Exception("Type is not of (OwnedStructure, str)")
 
-        self.__init__(self.http, result.get("ship", {"none": None}))
+        source = _expect(result, "structure", f"transfer {good}")
+        self.apply(result.get("ship", None))
 
-        return self, OwnedStructure(self.http, result.get("structure"))
+        return self, self.http.identity.load(OwnedStructure, self.http, source)
@@ -1,10 +1,40 @@
+from .cargo import Cargo
 from .http import HTTPClient
+from .model import Field, Model
 
 
-class Structure:
-    def __init__(self, http, data):
-        pass
+class Structure(Model):
+    __slots__ = ("http", "_inventory")
+
+    _wrapper = "structure"
+
+    id = Field("id")
+    type = Field("type")
+    location = Field("location")
+    status = Field("status")
+    active = Field("active", False)
+    owner = Field("ownedBy")
+    consumes = Field("consumes", ())
+    produces = Field("produces", ())
+
+    def __init__(self, http: HTTPClient, data: dict):
+        self.http = http
+        self._inventory = None
+        super().__init__(data)
+
+    @property
+    def inventory(self) -> Cargo:
+        """Stored goods, rebuilt only once a newer payload has replaced them"""
+        items = self.data.setdefault("inventory", [])
+        inventory = self._inventory
+
+        if inventory is None or inventory.source is not items:
+            inventory = Cargo(items)
+            inventory.source = items
+            self._inventory = inventory
+
+        return inventory
 
 
 class OwnedStructure(Structure):
-    pass
+    __slots__ = ()
@@ -0,0 +1,251 @@
+"""Ships spread over worker processes that share one rate limit.
+
+    async def trade(client, ships):
+        ...  # runs in a worker process, on its own loop
+        client.dispatch("on_trade", ship, profit)
+        return total
+
+    async with Supervisor(token, trade, processes=4) as supervisor:
+        @supervisor.event()
+        async def on_trade(ship, profit):
+            ...  # runs in the parent
+
+        result = await supervisor.run()
+
+`trade` must be importable by the workers, i.e. defined at module level. Workers
+are started with the "spawn" method, so the calling script needs the usual
+`if __name__ == "__main__":` guard.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import pickle
+
+from queue import Empty
+
+from typing import Any, Awaitable, Callable, List, Optional, Sequence
+
+from .client import Client
+from .errors import SPTError
+from .fleet import FleetResult
+from .model import Model
+from .ratelimit import SharedRateLimiter
+from .ship import Ship
+
+Worker = Callable[[Client, List[Ship]], Awaitable[Any]]
+
+
+class _Packed:
+    """A Model sent between processes as its class and payload"""
+
+    __slots__ = ("cls", "data", "http")
+
+    def __init__(self, model: Model):
+        self.cls = type(model)
+        self.data = model.data
+        self.http = hasattr(model, "http")
+
+    def __getstate__(self):
+        return self.cls, self.data, self.http
+
+    def __setstate__(self, state):
+        self.cls, self.data, self.http = state
+
+
+def _pack(value: Any) -> Any:
+    if isinstance(value, Model):
+        return _Packed(value)
+    if isinstance(value, (list, tuple)):
+        return type(value)(_pack(v) for v in value)
+    if isinstance(value, dict):
+        return {k: _pack(v) for k, v in value.items()}
+    return value
+
+
+def _unpack(client: Client, value: Any) -> Any:
+    if isinstance(value, _Packed):
+        if value.http:
+            return client.identity.load(value.cls, client.http, value.data)
+        return value.cls(value.data)
+    if isinstance(value, (list, tuple)):
+        return type(value)(_unpack(client, v) for v in value)
+    if isinstance(value, dict):
+        return {k: _unpack(client, v) for k, v in value.items()}
+    return value
+
+
+def _send(queue, message: tuple):
+    """Pickle here rather than in the queue's feeder thread, which drops failures"""
+    try:
+        queue.put(pickle.dumps(message))
+    except Exception as e:
+        logging.getLogger("spacetraders").warning(
+            f"Could not send {message[0]} {message[1]!r} to the supervisor: {e!r}"
+        )
+        if message[0] == "error":
+            queue.put(pickle.dumps(("error", message[1], SPTError(repr(message[2])))))
+        elif message[0] == "done":
+            queue.put(pickle.dumps(("error", message[1], SPTError(repr(e)))))
+
+
+class WorkerClient(Client):
+    """The Client a worker process runs with.
+
+    Every event it dispatches also goes to the supervisor, with models sent as
+    their payloads and loaded into the parent's identity map there.
+    """
+
+    def __init__(self, queue, token: str, **kwargs):
+        self.queue = queue
+        super().__init__(token, **kwargs)
+
+    def dispatch(self, event_name: str, *args, **kwargs) -> List[asyncio.Task]:
+        if event_name != "on_ready":
+            _send(self.queue, ("event", event_name, _pack(args), _pack(kwargs)))
+
+        if not self.events.get(event_name):
+            return []
+        return super().dispatch(event_name, *args, **kwargs)
+
+
+async def _serve(queue, token: str, ids: List[str], worker: Worker, kwargs: dict):
+    async with WorkerClient(queue, token, **kwargs) as client:
+        wanted = set(ids)
+        ships = [ship for ship in await client.ships if ship.id in wanted]
+        return await worker(client, ships)
+
+
+def _main(index: int, token: str, ids: List[str], worker: Worker, queue, kwargs: dict):
+    """Entry point of a worker process"""
+    try:
+        result = asyncio.run(_serve(queue, token, ids, worker, kwargs))
+    except BaseException as e:
+        _send(queue, ("error", index, e))
+    else:
+        _send(queue, ("done", index, _pack(result)))
+
+
+class Supervisor:
+    """Runs `worker(client, ships)` in `processes` worker processes.
+
+    Ships are dealt out round-robin, one shard per process. Each process has its
+    own loop and Client, and all of them, the parent included, draw from one
+    SharedRateLimiter so the account's limit holds overall. Events a worker
+    dispatches are re-dispatched on the parent's `client`, and `run` returns a
+    FleetResult of what each worker returned, keyed by shard index. Other kwargs
+    go to every Client.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        worker: Worker,
+        processes: Optional[int] = None,
+        **kwargs,
+    ):
+        self.token = token
+        self.worker = worker
+        self.processes: int = processes or multiprocessing.cpu_count()
+        self.context = multiprocessing.get_context("spawn")
+        self._log = logging.getLogger("spacetraders")
+
+        self.limiter: SharedRateLimiter = kwargs.pop("ratelimiter", None) or (
+            SharedRateLimiter(
+                kwargs.get("rate_limit", 2.0), kwargs.get("burst", 10), self.context
+            )
+        )
+        self.kwargs = kwargs
+        self.client = Client(token, ratelimiter=self.limiter, **kwargs)
+
+    def event(self, *args, **kwargs):
+        """Register a parent-side handler, as `Client.event`"""
+        return self.client.event(*args, **kwargs)
+
+    def shard(self, ids: Sequence[str]) -> List[List[str]]:
+        shards = [list(ids[i :: self.processes]) for i in range(self.processes)]
+        return [s for s in shards if s]
+
+    async def run(self, ships: Optional[Sequence[Any]] = None) -> FleetResult:
+        """Run the worker over `ships` (ids or Ships), every ship by default"""
+        if ships is None:
+            ships = await self.client.ships
+        ids = [s if isinstance(s, str) else s.id for s in ships]
+
+        queue = self.context.Queue()
+        shards = self.shard(ids)
+        kwargs = {**self.kwargs, "ratelimiter": self.limiter}
+        procs = [
+            self.context.Process(
+                target=_main,
+                args=(i, self.token, shard, self.worker, queue, kwargs),
+                name=f"spacetraders-worker-{i}",
+                daemon=True,
+            )
+            for i, shard in enumerate(shards)
+        ]
+        for proc in procs:
+            proc.start()
+
+        try:
+            return await self.__collect(queue, procs)
+        finally:
+            for proc in procs:
+                if proc.is_alive():
+                    proc.terminate()
+            loop = asyncio.get_event_loop()
+            await asyncio.gather(
+                *(loop.run_in_executor(None, proc.join) for proc in procs)
+            )
+            queue.close()
+
+    async def __collect(self, queue, procs: list) -> FleetResult:
+        result = FleetResult()
+        loop = asyncio.get_event_loop()
+        pending = set(range(len(procs)))
+
+        while pending:
+            message = await loop.run_in_executor(None, self.__receive, queue)
+
+            if message is None:
+                # Nothing arrived, so check for workers that died without a word
+                for index in list(pending):
+                    if procs[index].exitcode is not None and queue.empty():
+                        pending.discard(index)
+                        result.errors[index] = SPTError(
+                            f"Worker {index} exited with {procs[index].exitcode}"
+                        )
+                continue
+
+            kind, key = message[0], message[1]
+            if kind == "event":
+                args = _unpack(self.client, message[2])
+                kwargs = _unpack(self.client, message[3])
+                if self.client.events.get(key):
+                    self.client.dispatch(key, *args, **kwargs)
+            elif kind == "done":
+                pending.discard(key)
+                result.results[key] = _unpack(self.client, message[2])
+            elif kind == "error":
+                pending.discard(key)
+                self._log.warning(f"Worker {key} failed: {message[2]!r}")
+                result.errors[key] = message[2]
+
+        return result
+
+    @staticmethod
+    def __receive(queue) -> Optional[tuple]:
+        try:
+            return pickle.loads(queue.get(timeout=0.5))
+        except Empty:
+            return None
+
+    async def close(self):
+        await self.client.close()
+
+    async def __aenter__(self):
+        await self.client.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
@@ -0,0 +1,178 @@
+"""A blocking Client for threaded code.
+
+    with SyncClient(token) as client:
+        ships = client.ships
+        client.http.location_get_market("OE-PM")
+        future = client.submit(client.client.http.ship_get_info, ships[0].id)
+
+The Client runs on an event loop in a background thread. Every call from any
+thread is handed to that loop, so all threads share one session, rate limiter
+and identity map.
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import threading
+
+from typing import Any, Awaitable, Callable, List, Optional, Union
+
+from .client import Client
+from .errors import SPTError
+from .fleet import Fleet
+from .http import HTTPClient
+from .model import Model
+
+
+def _unwrap(value: Any) -> Any:
+    """The objects behind any Blocking wrappers, so they can go back to the loop"""
+    if isinstance(value, Blocking):
+        return value.obj
+    if isinstance(value, (list, tuple)):
+        return type(value)(_unwrap(v) for v in value)
+    if isinstance(value, dict):
+        return {k: _unwrap(v) for k, v in value.items()}
+    return value
+
+
+class Blocking:
+    """Wraps a client, model or fleet so its coroutines block until done.
+
+    Coroutine methods and async properties run on the owner's loop. Wrapped
+    arguments are unwrapped on the way in, and models, fleets and clients they
+    return come back wrapped, so results can be passed straight back in. Anything
+    else comes back as it is. The wrapped object is `obj`.
+    """
+
+    __slots__ = ("obj", "_sync")
+
+    # Results worth wrapping, since they have coroutine methods of their own
+    WRAP = (Model, Fleet, HTTPClient, Client)
+
+    def __init__(self, obj: Any, sync: "SyncClient"):
+        self.obj = obj
+        self._sync = sync
+
+    def _wrap(self, value: Any) -> Any:
+        if isinstance(value, self.WRAP):
+            return Blocking(value, self._sync)
+        if isinstance(value, (list, tuple)) and any(
+            isinstance(v, self.WRAP) for v in value
+        ):
+            return type(value)(self._wrap(v) for v in value)
+        return value
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self.obj, name)
+
+        if asyncio.iscoroutine(value):
+            return self._wrap(self._sync.run(value))
+
+        if asyncio.iscoroutinefunction(value):
+
+            @functools.wraps(value)
+            def call(*args, **kwargs):
+                return self._wrap(self._sync.run(value, *args, **kwargs))
+
+            return call
+
+        return self._wrap(value)
+
+    def __iter__(self):
+        return (self._wrap(v) for v in self.obj)
+
+    def __len__(self):
+        return len(self.obj)
+
+    def __repr__(self):
+        return f"<Blocking {self.obj!r}>"
+
+
+class SyncClient:
+    """A Client on its own loop thread, safe to call from any number of threads.
+
+    Takes the same arguments as `Client`. Attributes of the Client are reached
+    through a `Blocking` wrapper, so `client.ships` returns blocking ships and
+    `client.http` a blocking HTTPClient. `submit` returns a
+    `concurrent.futures.Future` instead of waiting. Event handlers still run on the
+    loop thread. Models are updated there too, so read them in workers but change
+    them only through their methods.
+    """
+
+    def __init__(self, token: Union[str, List[str]], **kwargs):
+        self.closed = False
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.__run_loop, name="spacetraders-loop", daemon=True
+        )
+        self._thread.start()
+
+        try:
+            self.client: Client = self.run(self.__open(token, kwargs))
+        except BaseException:
+            self.__stop()
+            raise
+
+        self.__proxy = Blocking(self.client, self)
+
+    def __run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    async def __open(self, token: Union[str, List[str]], kwargs: dict) -> Client:
+        # Made on the loop thread so everything it creates binds to this loop
+        client = Client(token, loop=self.loop, **kwargs)
+        return await client.__aenter__()
+
+    def submit(
+        self, call: Union[Awaitable, Callable[..., Awaitable]], *args, **kwargs
+    ) -> concurrent.futures.Future:
+        """Run a coroutine, or a coroutine function with arguments, on the loop.
+
+        Blocking arguments are passed on as the objects they wrap.
+        """
+        if not asyncio.iscoroutine(call):
+            call = call(*_unwrap(args), **_unwrap(kwargs))
+
+        if threading.get_ident() == self._thread.ident:
+            call.close()
+            raise SPTError("SyncClient can't block its own loop; await it instead")
+
+        return asyncio.run_coroutine_threadsafe(call, self.loop)
+
+    def run(
+        self,
+        call: Union[Awaitable, Callable[..., Awaitable]],
+        *args,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> Any:
+        """Like `submit`, but waits for the result"""
+        return self.submit(call, *args, **kwargs).result(timeout)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.__proxy, name)
+
+    def close(self):
+        """Close the Client, then stop the loop thread"""
+        if self.closed:
+            return
+
+        self.closed = True
+        try:
+            self.run(self.client.close())
+        finally:
+            self.__stop()
+
+    def __stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,236 @@
+import asyncio
+import json
+import logging
+import time
+
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from aiohttp import ClientSession, TCPConnector
+
+from .errors import ReplayExhausted
+from .route import Route
+
+
+class Response:
+    """A finished response, independent of how it was fetched"""
+
+    def __init__(self, status: int, headers: dict, body: bytes, elapsed: float = 0.0):
+        self.status = status
+        self.headers = {k.lower(): v for k, v in headers.items()}
+        self.body = body
+        self.elapsed = elapsed
+
+    def json(self, loads: Callable[[bytes], Any] = json.loads):
+        return loads(self.body) if self.body else {}
+
+
+class Transport:
+    """Sends a Route and returns its Response"""
+
+    async def start(self):
+        pass
+
+    async def send(self, route: Route, url: str, timeout: float) -> Response:
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class SessionTransport(Transport):
+    """Sends requests over an aiohttp session.
+
+    Unless one is passed in, the session and its connection pool are made by
+    `start` (or the first request) inside the running loop, and closed by `close`.
+    `headers` go on every request, whichever session sends it.
+    `limit` caps open connections in total and `limit_per_host` per host (0 is no
+    cap). Idle connections are kept alive for `keepalive` seconds so TLS handshakes
+    are reused, and DNS answers are cached for `dns_ttl` seconds.
+    """
+
+    def __init__(
+        self,
+        session: Optional[ClientSession] = None,
+        headers: Optional[dict] = None,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        keepalive: float = 30.0,
+        dns_ttl: Optional[int] = 300,
+    ):
+        self.session = session
+        self.headers = headers
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive = keepalive
+        self.dns_ttl = dns_ttl
+        self._owned = session is None
+
+    async def start(self):
+        if self.session is not None and not self.session.closed:
+            return
+
+        connector = TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive,
+            ttl_dns_cache=self.dns_ttl,
+            use_dns_cache=self.dns_ttl is not None,
+        )
+        self.session = ClientSession(headers=self.headers, connector=connector)
+        self._owned = True
+
+    async def send(self, route: Route, url: str, timeout: float) -> Response:
+        if self.session is None:
+            await self.start()
+
+        # A session passed in doesn't carry our headers, so send them every time
+        headers = route.headers
+        if self.headers and not self._owned:
+            headers = {**self.headers, **headers} if headers else self.headers
+
+        start = time.monotonic()
+
+        async with self.session.request(
+            url=url,
+            method=route.method,
+            headers=headers,
+            json=route.json,
+            params=route.params,
+            timeout=timeout,
+        ) as response:
+            body = await response.read()
+
+            return Response(
+                response.status,
+                dict(response.headers),
+                body,
+                time.monotonic() - start,
+            )
+
+    async def close(self):
+        """Close the session if this transport made it"""
+        if self.session is not None and self._owned:
+            await self.session.close()
+            self.session = None
+
+
+class RecordingTransport(Transport):
+    """Sends requests through another transport, logging every exchange as JSONL.
+
+    The file is opened for appending by `start` (or the first request) and closed
+    by `close`, so a restarted client carries on writing to it. Each record is
+    written and flushed as one line.
+    """
+
+    def __init__(self, inner: Transport, path: str):
+        self.inner = inner
+        self.path = path
+        self._file = None
+
+    async def send(self, route: Route, url: str, timeout: float) -> Response:
+        if self._file is None:
+            self._file = open(self.path, "a")
+
+        sent = time.time()
+        response = await self.inner.send(route, url, timeout)
+
+        try:
+            body = json.loads(response.body) if response.body else None
+            text = None
+        except ValueError:
+            body, text = None, response.body.decode(errors="replace")
+
+        record = {
+            "key": route.key,
+            "method": route.method.upper(),
+            "path": route.path,
+            "url": url,
+            "params": route.params,
+            "json": route.json,
+            "status": response.status,
+            "headers": response.headers,
+            "body": body,
+            "text": text,
+            "elapsed": response.elapsed,
+            "time": sent,
+        }
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+        return response
+
+    async def start(self):
+        if self._file is None:
+            self._file = open(self.path, "a")
+        await self.inner.start()
+
+    async def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        await self.inner.close()
+
+
+class ReplayTransport(Transport):
+    """Serves responses recorded by RecordingTransport, without touching the network.
+
+    In "ordered" mode records are served in file order, whatever is asked for. In
+    "keyed" mode each request gets the next record with the same method, URL and
+    parameters, and the last one is repeated once they run out. `speed` scales the
+    recorded response times: None serves instantly, 10 replays ten times faster.
+    """
+
+    def __init__(self, path: str, mode: str = "keyed", speed: Optional[float] = None):
+        if mode not in ("ordered", "keyed"):
+            raise ValueError(f"Unknown replay mode {mode!r}")
+
+        self._log = logging.getLogger("spacetraders-http")
+        self.mode = mode
+        self.speed = speed
+
+        with open(path) as f:
+            self.records: List[dict] = [json.loads(line) for line in f if line.strip()]
+
+        self._ordered: Deque[dict] = deque(self.records)
+        self._keyed: Dict[str, Deque[dict]] = {}
+        self._last: Dict[str, dict] = {}
+        for record in self.records:
+            self._keyed.setdefault(record["key"], deque()).append(record)
+
+    def _next(self, route: Route) -> dict:
+        if self.mode == "ordered":
+            if not self._ordered:
+                raise ReplayExhausted("Replay has no more recorded responses")
+
+            record = self._ordered.popleft()
+            if record["key"] != route.key:
+                self._log.warning(f"Replaying {record['key']} for {route.key}")
+            return record
+
+        key = route.key
+        queue = self._keyed.get(key)
+
+        if queue:
+            self._last[key] = queue.popleft()
+        elif key not in self._last:
+            raise ReplayExhausted(f"No recorded response for {key}")
+
+        return self._last[key]
+
+    async def send(self, route: Route, url: str, timeout: float) -> Response:
+        record = self._next(route)
+
+        if self.speed:
+            await asyncio.sleep(record.get("elapsed", 0.0) / self.speed)
+
+        if record.get("text") is not None:
+            body = record["text"].encode()
+        else:
+            body = (
+                b"" if record["body"] is None else json.dumps(record["body"]).encode()
+            )
+
+        return Response(
+            record["status"], record["headers"], body, record.get("elapsed", 0.0)
+        )
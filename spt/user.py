@@ -1,22 +1,21 @@
-import asyncio
-import pprint
+from .model import Field, Model
 
-from .http import HTTPClient
 
+class User(Model):
+    __slots__ = ()
 
-class User:
-    def __init__(self, data: dict):
-        self.credits = data.get("credits", 0)
-        self.joined_at = data.get("joinedAt", None)
-        self.ship_count = data.get("shipCount", 0)
-        self.structure_count = data.get("structureCount", 0)
-        self.name = data.get("username", "None")
+    credits = Field("credits", 0)
+    joined_at = Field("joinedAt")
+    ship_count = Field("shipCount", 0)
+    structure_count = Field("structureCount", 0)
+    name = Field("username", "None")
 
 
-class PartialUser:
+class PartialUser(Model):
     """A user that is not full, such as those on a Leaderboard"""
 
-    def __init__(self, data: dict):
-        self.net_worth = data.get("netWorth", None)
-        self.rank = data.get("rank", None)
-        self.username = data.get("username", None)
+    __slots__ = ()
+
+    net_worth = Field("netWorth")
+    rank = Field("rank")
+    username = Field("username")
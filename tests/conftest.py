@@ -0,0 +1,67 @@
+import asyncio
+import threading
+
+import pytest
+
+from spt import cache, ratelimit, retry
+from spt.ext.mock import MockServer
+
+TOKEN = "test-token"
+
+
+class Clock:
+    """Stands in for the `time` module, moved by hand"""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """One fake clock for every module that keeps time"""
+    clock = Clock()
+    for module in (cache, ratelimit, retry):
+        monkeypatch.setattr(module, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def token():
+    return TOKEN
+
+
+@pytest.fixture
+def server(token):
+    """A MockServer to start with `async with` on the test's own loop"""
+    return MockServer(tokens=(token,), rate=100, burst=50, ships=3, seed=0)
+
+
+@pytest.fixture
+def threaded_server(token):
+    """A MockServer on its own loop thread, for code that runs its own loop"""
+    server = MockServer(tokens=(token,), rate=100, burst=50, ships=3, seed=0)
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(server.start())
+        started.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    started.wait()
+
+    yield server
+
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+
+from spt.client import Client
+from spt.flight import FlightPlan
+from spt.ship import Ship
+
+
+class FakeHTTP:
+    """Answers ship refreshes with the ship landed at its plan's destination"""
+
+    arrivals = None
+
+    def __init__(self):
+        self.refreshed = []
+
+    async def ship_get_info(self, ship_id: str) -> dict:
+        self.refreshed.append(ship_id)
+        return {"ship": {"id": ship_id, "location": "OE-PM-TR"}}
+
+
+def plan(id: str, seconds: float, **data) -> FlightPlan:
+    return FlightPlan(
+        None, {"flightPlan": dict(id=id, timeRemainingInSeconds=seconds, **data)}
+    )
+
+
+def run(test):
+    async def main():
+        client = Client("token")
+        http = FakeHTTP()
+        arrived = []
+
+        @client.event()
+        async def on_arrival(ship, flight):
+            arrived.append((ship.id, flight.id))
+
+        try:
+            await test(client, http)
+            # Let arrivals already under way finish before closing cancels them
+            await asyncio.gather(*client.arrivals._tasks)
+        finally:
+            await client.close()
+        return arrived, http
+
+    return asyncio.run(main())
+
+
+def test_arrivals_fire_in_order_after_a_refresh():
+    async def test(client, http):
+        ships = [Ship(http, {"id": f"s{i}", "flightPlanId": f"p{i}"}) for i in range(3)]
+        for ship, seconds in zip(ships, (0.03, 0.01, 0.02)):
+            client.arrivals.schedule(ship, plan(f"p{ship.id[1]}", seconds))
+
+        assert len(client.arrivals) == 3
+        await asyncio.sleep(0.06)
+        assert len(client.arrivals) == 0
+        assert ships[0].location == "OE-PM-TR"
+
+    arrived, http = run(test)
+    assert arrived == [("s1", "p1"), ("s2", "p2"), ("s0", "p0")]
+    assert http.refreshed == ["s1", "s2", "s0"]
+
+
+def test_rescheduling_replaces_the_old_flight():
+    async def test(client, http):
+        ship = Ship(http, {"id": "s"})
+        client.arrivals.schedule(ship, plan("early", 0.01))
+        client.arrivals.schedule(ship, plan("late", 0.04))
+
+        await asyncio.sleep(0.02)
+        assert "s" in client.arrivals
+        await asyncio.sleep(0.04)
+
+    arrived, _ = run(test)
+    assert arrived == [("s", "late")]
+
+
+def test_an_earlier_flight_rearms_the_timer():
+    async def test(client, http):
+        client.arrivals.schedule(Ship(http, {"id": "a"}), plan("pa", 10))
+        client.arrivals.schedule(Ship(http, {"id": "b"}), plan("pb", 0.01))
+
+        await asyncio.sleep(0.03)
+        assert "a" in client.arrivals
+
+    arrived, _ = run(test)
+    assert arrived == [("b", "pb")]
+
+
+def test_cancelled_and_finished_flights_never_fire():
+    async def test(client, http):
+        client.arrivals.schedule(Ship(http, {"id": "a"}), plan("pa", 0.01))
+        client.arrivals.cancel("a")
+        client.arrivals.schedule(
+            Ship(http, {"id": "b"}),
+            plan("pb", 0.0, terminatedAt="2021-01-01T00:00:00.000Z"),
+        )
+
+        assert "b" not in client.arrivals
+        await asyncio.sleep(0.03)
+
+    arrived, http = run(test)
+    assert arrived == []
+    assert http.refreshed == []
+
+
+def test_close_stops_tracking():
+    async def test(client, http):
+        client.arrivals.schedule(Ship(http, {"id": "a"}), plan("pa", 0.01))
+        client.arrivals.close()
+
+        assert len(client.arrivals) == 0
+        await asyncio.sleep(0.03)
+
+    arrived, _ = run(test)
+    assert arrived == []
+
+
+def test_no_handler_means_no_dispatch(caplog):
+    async def main():
+        client = Client("token")
+        http = FakeHTTP()
+        client.arrivals.schedule(Ship(http, {"id": "a"}), plan("pa", 0.0))
+
+        await asyncio.sleep(0.01)
+        await asyncio.gather(*client.arrivals._tasks)
+        await client.close()
+        return client, http
+
+    with caplog.at_level(logging.WARNING, logger="spacetraders"):
+        client, http = asyncio.run(main())
+
+    assert http.refreshed == ["a"]
+    assert "on_arrival" not in client.event_metrics
+    assert not caplog.records
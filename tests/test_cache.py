@@ -0,0 +1,131 @@
+import asyncio
+import json
+
+from spt.cache import ResponseCache
+from spt.http import HTTPClient
+from spt.route import Route
+from spt.transport import Response, Transport
+
+TTLS = {"/my/ships": 10.0, "/my/ships/{shipId}": 10.0}
+
+
+def ship(id: str) -> Route:
+    return Route("get", "/my/ships/{shipId}", shipId=id)
+
+
+def test_caches_gets_with_a_ttl_only(clock):
+    cache = ResponseCache(TTLS)
+
+    cache.update(ship("a"), {"ship": "a"})
+    cache.update(Route("get", "/my/account"), {"user": {}})
+
+    assert cache.get(ship("a")) == {"ship": "a"}
+    assert cache.get(Route("get", "/my/account")) is None
+    assert len(cache) == 1
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = ResponseCache(TTLS)
+    cache.update(ship("a"), {"ship": "a"})
+
+    clock.now += 9.9
+    assert cache.get(ship("a")) is not None
+
+    clock.now += 0.2
+    assert cache.get(ship("a")) is None
+    assert len(cache) == 0
+
+
+def test_evicts_least_recently_used(clock):
+    cache = ResponseCache(TTLS, max_entries=2)
+    cache.update(ship("a"), {"ship": "a"})
+    cache.update(ship("b"), {"ship": "b"})
+
+    # Reading a makes b the least recently used
+    cache.get(ship("a"))
+    cache.update(ship("c"), {"ship": "c"})
+
+    assert cache.get(ship("b")) is None
+    assert cache.get(ship("a")) is not None
+    assert cache.get(ship("c")) is not None
+    assert cache.evictions == 1
+
+
+def test_bounded_by_size(clock):
+    cache = ResponseCache(TTLS, max_bytes=60)
+    cache.update(ship("a"), {"ship": "a" * 30})
+    cache.update(ship("b"), {"ship": "b" * 30})
+
+    assert cache.get(ship("a")) is None
+    assert cache.get(ship("b")) is not None
+
+    # Too big to ever fit, so not stored at all
+    cache.update(ship("c"), {"ship": "c" * 100})
+    assert cache.get(ship("c")) is None
+    assert cache.get(ship("b")) is not None
+
+
+def test_mutating_calls_invalidate_what_they_change(clock):
+    cache = ResponseCache(TTLS)
+    cache.update(ship("a"), {"ship": "a"})
+    cache.update(Route("get", "/my/ships"), {"ships": []})
+    cache.update(Route("get", "/types/goods"), {"goods": []})
+
+    cache.update(Route("post", "/my/sell-orders"), {"credits": 1})
+
+    assert cache.get(ship("a")) is None
+    assert cache.get(Route("get", "/my/ships")) is None
+    assert cache.get(Route("get", "/types/goods")) == {"goods": []}
+
+
+def test_unlisted_mutating_calls_keep_the_cache(clock):
+    cache = ResponseCache(TTLS)
+    cache.update(Route("get", "/types/goods"), {"goods": []})
+
+    cache.update(Route("post", "/users/{username}/claim", username="a"), {})
+
+    assert cache.get(Route("get", "/types/goods")) == {"goods": []}
+
+
+def test_invalidate_everything(clock):
+    cache = ResponseCache(TTLS)
+    cache.update(ship("a"), {"ship": "a"})
+    cache.update(Route("get", "/types/goods"), {"goods": []})
+
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_saves_and_loads_unexpired_entries(clock, tmp_path):
+    path = str(tmp_path / "cache.json")
+    cache = ResponseCache(TTLS, path=path)
+    cache.update(ship("a"), {"ship": "a"})
+    cache.update(Route("get", "/types/goods"), {"goods": []})
+    cache.save()
+
+    clock.now += 60
+    loaded = ResponseCache(TTLS, path=path)
+
+    assert loaded.get(ship("a")) is None
+    assert loaded.get(Route("get", "/types/goods")) == {"goods": []}
+
+
+class NotFound(Transport):
+    async def send(self, route: Route, url: str, timeout: float) -> Response:
+        body = {"error": {"code": 404, "message": "Not found"}}
+        return Response(404, {}, json.dumps(body).encode())
+
+
+def test_error_payloads_are_not_cached(clock):
+    cache = ResponseCache()
+    route = Route("get", "/systems/{systemSymbol}", systemSymbol="XX")
+
+    async def run():
+        async with HTTPClient(
+            "token", asyncio.get_event_loop(), transport=NotFound(), cache=cache
+        ) as http:
+            return await http._request(route)
+
+    assert "error" in asyncio.run(run())
+    assert len(cache) == 0
@@ -0,0 +1,92 @@
+from spt.cargo import Cargo
+from spt.enum import Goods
+from spt.ship import Ship
+
+ITEMS = [
+    {"good": "FUEL", "quantity": 20, "totalVolume": 20},
+    {"good": "DRONES", "quantity": 3, "totalVolume": 6},
+]
+
+
+def test_reads_a_manifest():
+    cargo = Cargo(ITEMS, capacity=100, space=74)
+
+    assert cargo["FUEL"] == 20
+    assert cargo[Goods.DRONES] == 3
+    assert cargo.volume("DRONES") == 6
+    assert cargo["METALS"] == 0
+    assert "FUEL" in cargo and "METALS" not in cargo
+    assert dict(cargo) == {"FUEL": 20, "DRONES": 3}
+    assert len(cargo) == 2
+
+
+def test_space_is_reported_or_worked_out():
+    assert Cargo(ITEMS, capacity=100, space=50).space == 50
+    assert Cargo(ITEMS, capacity=100).space == 74
+
+
+def test_add_keeps_space_in_step():
+    cargo = Cargo(ITEMS, capacity=100, space=74)
+
+    cargo.add("FUEL", 10)
+    cargo.add("DRONES", -1, -2)
+
+    assert cargo["FUEL"] == 30
+    assert cargo["DRONES"] == 2
+    assert cargo.space == 66
+    assert cargo.used == 34
+
+
+def test_unknown_goods_are_kept_too():
+    cargo = Cargo([{"good": "NEW_GOOD", "quantity": 2, "totalVolume": 4}], 10)
+
+    assert cargo["NEW_GOOD"] == 2
+    assert cargo.space == 6
+    assert cargo.to_list() == [{"good": "NEW_GOOD", "quantity": 2, "totalVolume": 4}]
+
+
+def test_fits_uses_volume_per_unit():
+    cargo = Cargo(ITEMS, capacity=30)
+
+    # 4 free; drones take 2 each
+    assert cargo.fits("DRONES", 2)
+    assert not cargo.fits("DRONES", 3)
+    assert cargo.fits("METALS", 4)
+    assert not cargo.fits("METALS", 2, per_unit=3)
+
+
+def test_round_trips_to_the_api_shape():
+    assert sorted(Cargo(ITEMS).to_list(), key=lambda i: i["good"]) == sorted(
+        ITEMS, key=lambda i: i["good"]
+    )
+
+
+def test_sum_adds_holds_up():
+    total = Cargo.sum(
+        [
+            Cargo(ITEMS, capacity=100, space=74),
+            Cargo([{"good": "FUEL", "quantity": 5}], capacity=50, space=45),
+            Cargo([{"good": "NEW_GOOD", "quantity": 1}], capacity=10),
+        ]
+    )
+
+    assert total["FUEL"] == 25
+    assert total["DRONES"] == 3
+    assert total["NEW_GOOD"] == 1
+    assert total.capacity == 160
+    assert total.space == 74 + 45 + 9
+
+
+def test_ship_rebuilds_cargo_only_for_a_new_payload():
+    ship = Ship(
+        None, {"id": "a", "maxCargo": 100, "spaceAvailable": 80, "cargo": ITEMS}
+    )
+
+    cargo = ship.cargo
+    assert ship.cargo is cargo
+    assert cargo.space == 80
+
+    ship.apply({"id": "a", "maxCargo": 100, "spaceAvailable": 100, "cargo": []})
+    assert ship.cargo is not cargo
+    assert ship.cargo["FUEL"] == 0
+    assert ship.cargo.space == 100
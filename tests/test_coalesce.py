@@ -0,0 +1,85 @@
+import asyncio
+
+from spt.http import HTTPClient
+from spt.route import Route
+
+GOODS = Route("get", "/types/goods")
+
+
+def http(server, token: str, **kwargs) -> HTTPClient:
+    return HTTPClient(
+        token,
+        asyncio.get_event_loop(),
+        base_url=server.url,
+        rate_limit=100,
+        burst=50,
+        **kwargs,
+    )
+
+
+def test_identical_gets_share_one_request(server, token):
+    server.latency = 0.05
+
+    async def run():
+        async with server, http(server, token) as client:
+            results = await asyncio.gather(*(client._request(GOODS) for _ in range(10)))
+            return results, client
+
+    results, client = asyncio.run(run())
+
+    assert server.requests == 1
+    assert client.coalesced == 9
+    assert client.metrics[GOODS].coalesced == 9
+    assert all(r is results[0] for r in results)
+    assert client.inflight == 0
+
+
+def test_different_gets_are_not_shared(server, token):
+    server.latency = 0.05
+
+    async def run():
+        async with server, http(server, token) as client:
+            await asyncio.gather(
+                client._request(GOODS), client._request(Route("get", "/my/account"))
+            )
+
+    asyncio.run(run())
+    assert server.requests == 2
+
+
+def test_posts_are_never_shared(server, token):
+    server.latency = 0.05
+
+    async def run():
+        async with server, http(server, token) as client:
+            route = Route("post", "/my/loans", params={"type": "STARTUP"})
+            await asyncio.gather(client._request(route), client._request(route))
+
+    asyncio.run(run())
+    assert server.requests == 2
+
+
+def test_a_cancelled_caller_leaves_the_request_running(server, token):
+    server.latency = 0.05
+
+    async def run():
+        async with server, http(server, token) as client:
+            first = asyncio.ensure_future(client._request(GOODS))
+            second = asyncio.ensure_future(client._request(GOODS))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            return await second
+
+    assert "goods" in asyncio.run(run())
+    assert server.requests == 1
+
+
+def test_coalescing_can_be_turned_off(server, token):
+    server.latency = 0.05
+
+    async def run():
+        async with server, http(server, token, coalesce=False) as client:
+            await asyncio.gather(*(client._request(GOODS) for _ in range(3)))
+
+    asyncio.run(run())
+    assert server.requests == 3
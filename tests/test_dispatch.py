@@ -0,0 +1,117 @@
+import asyncio
+import gc
+
+from spt.client import Client
+
+
+def run(test, **kwargs):
+    async def main():
+        client = Client("token", **kwargs)
+        try:
+            return await test(client)
+        finally:
+            await client.close()
+
+    return asyncio.run(main())
+
+
+def test_handlers_of_one_event_run_concurrently():
+    async def test(client):
+        running, peak = 0, 0
+
+        async def handler():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        for _ in range(4):
+            client.event("on_tick")(handler)
+
+        await client._dispatch("on_tick")
+        return peak, client.event_metrics["on_tick"]
+
+    peak, metrics = run(test)
+    assert peak == 4
+    assert (metrics.dispatched, metrics.handlers) == (1, 4)
+
+
+def test_concurrency_caps_running_handlers():
+    async def test(client):
+        running, peak = 0, 0
+
+        async def handler():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        for _ in range(5):
+            client.event("on_tick", concurrency=2)(handler)
+
+        await client._dispatch("on_tick")
+        return peak
+
+    assert run(test) == 2
+
+
+def test_timeouts_and_failures_are_counted():
+    async def test(client):
+        @client.event("on_tick", timeout=0.01)
+        async def slow():
+            await asyncio.sleep(1)
+
+        @client.event("on_tick")
+        async def broken():
+            raise ValueError("boom")
+
+        @client.event("on_tick")
+        async def fine():
+            pass
+
+        await client._dispatch("on_tick")
+        return client.event_metrics["on_tick"]
+
+    metrics = run(test)
+    assert (metrics.timeouts, metrics.failures, metrics.handlers) == (1, 1, 3)
+
+
+def test_dispatch_timeout_is_the_default():
+    async def test(client):
+        @client.event("on_tick")
+        async def slow():
+            await asyncio.sleep(1)
+
+        await client._dispatch("on_tick")
+        return client.event_metrics["on_tick"].timeouts
+
+    assert run(test, dispatch_timeout=0.01) == 1
+
+
+def test_dropped_tasks_still_finish():
+    async def test(client):
+        done = asyncio.Event()
+
+        @client.event("on_tick")
+        async def handler():
+            await asyncio.sleep(0.01)
+            done.set()
+
+        client.dispatch("on_tick")
+        gc.collect()
+        assert len(client._tasks) == 1
+
+        await asyncio.wait_for(done.wait(), 1)
+        await asyncio.sleep(0)
+        return client._tasks
+
+    assert run(test) == set()
+
+
+def test_unregistered_events_start_nothing():
+    async def test(client):
+        return client.dispatch("on_nothing")
+
+    assert run(test) == []
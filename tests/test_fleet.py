@@ -0,0 +1,82 @@
+import asyncio
+
+from spt.client import Client
+from spt.errors import HTTPError
+from spt.fleet import Fleet
+
+
+def run(server, token: str, test):
+    async def main():
+        async with server, Client(
+            token, base_url=server.url, rate_limit=100, burst=50
+        ) as client:
+            return await test(client, await client.fleet())
+
+    return asyncio.run(main())
+
+
+def test_refuel_fills_every_docked_ship(server, token):
+    async def test(client, fleet):
+        result = await fleet.refuel(30)
+        again = await fleet.refuel(30)
+        return result, again, fleet
+
+    result, again, fleet = run(server, token, test)
+
+    assert result.ok and len(result) == 3
+    assert all(ship.cargo["FUEL"] == 30 for ship in fleet)
+    assert set(again.results.values()) == {None}
+
+
+def test_errors_are_collected_per_ship(server, token):
+    async def test(client, fleet):
+        good, bad = fleet.ships[0], fleet.ships[1]
+        result = await fleet.travel({good.id: "OE-UC", bad.id: "NOWHERE"})
+        return result, good, bad, fleet
+
+    result, good, bad, fleet = run(server, token, test)
+
+    assert set(result.results) == {good.id}
+    assert set(result.errors) == {bad.id}
+    assert isinstance(result.errors[bad.id], HTTPError)
+    assert "Destination not found" in str(result.errors[bad.id])
+
+    # The ship in flight is no longer docked, the failed one still is
+    assert good not in fleet.docked
+    assert bad in fleet.docked
+
+
+def test_update_uses_one_listing(server, token):
+    async def test(client, fleet):
+        before = server.requests
+        result = await fleet.update()
+        return result, server.requests - before
+
+    result, requests = run(server, token, test)
+
+    assert result.ok and len(result) == 3
+    assert requests == 1
+
+
+def test_concurrency_bounds_ships_in_progress(server, token):
+    async def test(client, fleet):
+        fleet = Fleet(client.http, fleet.ships, concurrency=2)
+        running, peak = 0, 0
+
+        async def work(ship, result):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            if ship is fleet.ships[0]:
+                raise ValueError("boom")
+            result.results[ship.id] = True
+
+        return await fleet._each(fleet.ships, work), peak, fleet
+
+    result, peak, fleet = run(server, token, test)
+
+    assert peak == 2
+    assert len(result) == 3
+    assert isinstance(result.errors[fleet.ships[0].id], ValueError)
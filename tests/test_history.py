@@ -0,0 +1,97 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from spt.ext.history import MarketHistory  # noqa: E402
+
+
+def listing(buy: float, quantity: int = 100):
+    return [
+        {
+            "symbol": "FUEL",
+            "purchasePricePerUnit": buy,
+            "sellPricePerUnit": buy - 1,
+            "quantityAvailable": quantity,
+        },
+        {
+            "symbol": "METALS",
+            "purchasePricePerUnit": 10 * buy,
+            "sellPricePerUnit": 10 * buy - 1,
+            "quantityAvailable": quantity,
+        },
+    ]
+
+
+def fill(history: MarketHistory, count: int, step: float = 10.0, start: float = 0.0):
+    history.extend(
+        (start + i * step, loc, listing(i))
+        for i in range(count)
+        for loc in ("OE-PM", "OE-CR")
+    )
+
+
+def test_queries_by_location_good_and_time(tmp_path):
+    history = MarketHistory(str(tmp_path))
+    fill(history, 10)
+
+    assert len(history) == 40
+
+    fuel = history.query("OE-PM", "FUEL")
+    assert list(fuel["buy"]) == list(range(10))
+    assert list(fuel["ts"]) == [i * 10.0 for i in range(10)]
+
+    window = history.query("OE-CR", start=20, end=50)
+    assert len(window["ts"]) == 6
+    assert set(window["ts"]) == {20.0, 30.0, 40.0}
+
+    assert len(history.query("NOWHERE")["ts"]) == 0
+    assert len(history.query(good="NOTHING")["ts"]) == 0
+
+
+def test_rejects_snapshots_out_of_order(tmp_path):
+    history = MarketHistory(str(tmp_path))
+    history.append("OE-PM", listing(1), ts=100)
+
+    with pytest.raises(ValueError):
+        history.append("OE-PM", listing(1), ts=50)
+
+
+def test_rolls_segments_and_reopens(tmp_path):
+    history = MarketHistory(str(tmp_path), segment_rows=8)
+    fill(history, 10)
+
+    assert len(history.segments) == 5
+    assert all(seg["rows"] == 8 for seg in history.segments)
+
+    reopened = MarketHistory(str(tmp_path), segment_rows=8)
+    assert len(reopened) == 40
+    assert list(reopened.query("OE-PM", "FUEL")["buy"]) == list(range(10))
+
+
+def test_compaction_keeps_the_last_record_per_window(tmp_path):
+    history = MarketHistory(str(tmp_path), segment_rows=8)
+    # 12 snapshots 10s apart, so two 60s windows
+    fill(history, 12)
+    sealed = sum(seg["rows"] for seg in history.segments[:-1])
+
+    removed = history.compact(resolution=60, older_than=0, max_segments=10)
+
+    assert removed > 0
+    assert len(history) == 48 - removed
+    fuel = history.query("OE-PM", "FUEL")
+    # Sealed segments (up to ts 90) keep the last record of each 60s window, and
+    # the open one (ts 100 and 110) is left alone
+    assert list(fuel["ts"]) == [50.0, 90.0, 100.0, 110.0]
+    assert history.segments[0]["resolution"] == 60
+    assert sealed - removed == history.segments[0]["rows"]
+
+
+def test_retain_drops_old_records(tmp_path):
+    history = MarketHistory(str(tmp_path), segment_rows=8)
+    fill(history, 12)
+
+    history.compact(older_than=1e12, retain=0)
+
+    # Only the open segment survives a zero retention
+    assert len(history) == history.segments[-1]["rows"]
+    assert history.query()["ts"].min() >= history.segments[-1]["start"]
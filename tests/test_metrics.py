@@ -0,0 +1,44 @@
+import asyncio
+import json
+
+from urllib.parse import urlencode
+
+from spt.http import HTTPClient
+from spt.route import Route
+from spt.transport import Response, Transport
+
+
+class Echo(Transport):
+    async def send(self, route: Route, url: str, timeout: float) -> Response:
+        return Response(200, {}, b'{"ok": true}', 0.002)
+
+
+def test_observes_each_response():
+    route = Route(
+        "post",
+        "/my/ships/{shipId}/transfer",
+        params={"toShipId": "b", "good": "FUEL"},
+        json={"note": "ünïcode"},
+        shipId="a",
+    )
+
+    async def run():
+        async with HTTPClient(
+            "token", asyncio.get_event_loop(), transport=Echo(), base_url="http://x"
+        ) as http:
+            await http._request(route)
+            return http.metrics[route]
+
+    metrics = asyncio.run(run())
+    url = "http://x/my/ships/a/transfer"
+    sent = (
+        len(url)
+        + 1
+        + len(urlencode(route.params))
+        + len(json.dumps(route.json).encode())
+    )
+
+    assert metrics.requests == 1
+    assert metrics.statuses == {200: 1}
+    assert metrics.bytes_in == len(b'{"ok": true}')
+    assert metrics.bytes_out == sent
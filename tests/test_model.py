@@ -0,0 +1,82 @@
+import tracemalloc
+
+import pytest
+
+from spt.errors import SPTError
+from spt.flight import FlightPlan
+from spt.identity import IdentityMap
+from spt.ship import Ship
+
+
+def payload(i: int) -> dict:
+    return {
+        "id": f"ship{i:08d}",
+        "location": "OE-PM-TR",
+        "x": 21,
+        "y": -26,
+        "cargo": [{"good": "FUEL", "quantity": 20, "totalVolume": 20}],
+        "spaceAvailable": 80,
+        "type": "GR-MK-I",
+        "maxCargo": 100,
+    }
+
+
+def test_fields_read_from_the_payload():
+    ship = Ship(None, payload(1))
+
+    assert ship.id == "ship00000001"
+    assert ship.max_cargo == 100
+    assert ship.flight_plan_id is None
+    assert not hasattr(ship, "__dict__")
+
+
+def test_wrapped_payloads_are_unwrapped():
+    plan = FlightPlan(None, {"flightPlan": {"id": "p", "destination": "OE-CR"}})
+
+    assert plan.id == "p"
+    assert plan.destination == "OE-CR"
+
+
+def test_building_a_model_copies_nothing():
+    # Regression: every model used to carry a frozenset of its payload's keys
+    a, b = Ship(None, payload(1)), Ship(None, payload(2))
+    assert a.changed == frozenset()
+    assert a.changed is b.changed
+
+    payloads = [payload(i) for i in range(2000)]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    ships = [Ship(None, p) for p in payloads]
+    per_ship = (tracemalloc.get_traced_memory()[0] - before) / len(ships)
+    tracemalloc.stop()
+
+    assert per_ship < 200
+
+
+def test_apply_reports_changed_keys():
+    ship = Ship(None, payload(1))
+    fresh = dict(payload(1), x=0, flightPlanId="p")
+    del fresh["y"]
+
+    assert ship.apply(fresh) is ship
+    assert ship.x == 0
+    assert ship.changed == {"x", "y", "flightPlanId"}
+
+    ship.apply(ship.data)
+    assert ship.changed == frozenset()
+
+
+def test_identity_map_refreshes_live_objects():
+    identity = IdentityMap()
+    ship = identity.load(Ship, None, payload(1))
+
+    again = identity.load(Ship, None, dict(payload(1), x=5))
+
+    assert again is ship
+    assert ship.x == 5
+    assert ship.changed == {"x"}
+
+
+def test_identity_map_rejects_a_missing_payload():
+    with pytest.raises(SPTError, match="Ship"):
+        IdentityMap().load(Ship, None, None)
@@ -0,0 +1,89 @@
+import asyncio
+
+from spt.ext.mock import MockServer
+from spt.pool import HTTPClientPool
+from spt.route import Route
+
+TOKENS = ["token-a", "token-b"]
+
+
+def pool(server: MockServer, **kwargs) -> HTTPClientPool:
+    return HTTPClientPool(
+        TOKENS,
+        asyncio.get_event_loop(),
+        base_url=server.url,
+        rate_limit=100,
+        burst=50,
+        **kwargs,
+    )
+
+
+def mock() -> MockServer:
+    return MockServer(tokens=TOKENS, rate=100, burst=50, ships=2, seed=0)
+
+
+def test_listings_merge_every_account():
+    server = mock()
+
+    async def run():
+        async with server, pool(server) as http:
+            ships = (await http.ship_get_all())["ships"]
+            return http, ships
+
+    http, ships = asyncio.run(run())
+    b_ships = set(server.users["token-b"]["ships"])
+
+    assert len(ships) == 4
+    for ship in ships:
+        owner = http.using("token-b" if ship["id"] in b_ships else "token-a")
+        assert http.owner_of(ship["id"]) is owner
+
+
+def test_flight_plans_go_to_their_ships_account():
+    server = mock()
+
+    async def run():
+        async with server, pool(server) as http:
+            await http.ship_get_all()
+            ship = next(iter(server.users["token-b"]["ships"]))
+            plan = (await http.flight_plan_create(ship, "OE-PM-TR"))["flightPlan"]
+
+            route = Route(
+                "get", "/my/flight-plans/{flightPlanId}", flightPlanId=plan["id"]
+            )
+            assert http.member_for(route) is http.using("token-b")
+
+            # Reads would otherwise go to whichever account has more budget left
+            http.using("token-b").ratelimiter._tokens = 0.0
+            return plan, await http.flight_plan_info(plan["id"])
+
+    plan, info = asyncio.run(run())
+    assert info["flightPlan"]["id"] == plan["id"]
+
+
+def test_plans_are_learned_from_ship_payloads():
+    server = mock()
+
+    async def run():
+        async with server, pool(server) as http:
+            ship = next(iter(server.users["token-b"]["ships"]))
+            await http.using("token-b").flight_plan_create(ship, "OE-PM-TR")
+
+            await http.ship_get_all()
+            plan = server.users["token-b"]["ships"][ship]["flightPlanId"]
+            return http, plan
+
+    http, plan = asyncio.run(run())
+    assert http.owner_of(plan) is http.using("token-b")
+
+
+def test_unowned_writes_go_to_the_primary_account():
+    server = mock()
+
+    async def run():
+        async with server, pool(server, primary="token-b") as http:
+            await http.loan_take("STARTUP")
+
+    asyncio.run(run())
+    assert server.users["token-b"]["loans"]
+    assert not server.users["token-a"]["loans"]
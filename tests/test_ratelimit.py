@@ -0,0 +1,93 @@
+import asyncio
+import multiprocessing
+
+import pytest
+
+from spt.ratelimit import RateLimiter, SharedRateLimiter
+
+
+def test_burst_is_available_at_once(clock):
+    limiter = RateLimiter(rate=2, burst=3)
+
+    async def take():
+        return [await limiter.acquire() for _ in range(3)]
+
+    assert asyncio.run(take()) == [0.0, 0.0, 0.0]
+    assert limiter.tokens == 0
+
+
+def test_refills_at_rate_up_to_burst(clock):
+    limiter = RateLimiter(rate=2, burst=3)
+    limiter._tokens = 0.0
+
+    clock.now += 0.5
+    assert limiter.tokens == pytest.approx(1.0)
+
+    clock.now += 100
+    assert limiter.tokens == 3
+
+
+def test_waits_for_a_token_when_empty():
+    limiter = RateLimiter(rate=50, burst=1)
+
+    async def take():
+        await limiter.acquire()
+        return await limiter.acquire()
+
+    assert asyncio.run(take()) >= 0.015
+
+
+def test_release_returns_a_token(clock):
+    limiter = RateLimiter(rate=2, burst=3)
+    limiter._tokens = 1.0
+
+    limiter.release()
+    assert limiter.tokens == 2
+
+    limiter.release()
+    limiter.release()
+    assert limiter.tokens == 3
+
+
+def test_first_remaining_seeds_then_only_lowers(clock):
+    limiter = RateLimiter(rate=2, burst=10)
+
+    limiter.update(4, None)
+    assert limiter.tokens == 4
+
+    limiter.update(8, None)
+    assert limiter.tokens == 4
+
+    limiter.update(1, None)
+    assert limiter.tokens == 1
+
+
+def test_retry_after_blocks(clock):
+    limiter = RateLimiter(rate=2, burst=10)
+
+    limiter.update(0, 3.0)
+    assert limiter.tokens == 0
+    assert limiter.blocked_for == 3.0
+
+    clock.now += 2
+    assert limiter.blocked_for == 1.0
+
+
+def _drain(limiter: SharedRateLimiter, n: int):
+    async def take():
+        for _ in range(n):
+            await limiter.acquire()
+
+    asyncio.run(take())
+
+
+def test_shared_bucket_spans_processes():
+    context = multiprocessing.get_context("spawn")
+    limiter = SharedRateLimiter(rate=0.001, burst=5, context=context)
+
+    worker = context.Process(target=_drain, args=(limiter, 4))
+    worker.start()
+    worker.join(30)
+
+    assert worker.exitcode == 0
+    assert limiter.tokens == pytest.approx(1.0, abs=0.01)
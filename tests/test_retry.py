@@ -0,0 +1,152 @@
+import asyncio
+import json
+
+import pytest
+
+from spt.errors import CircuitOpen, ServerError
+from spt.http import HTTPClient
+from spt.retry import CircuitBreaker, RetryPolicy
+from spt.route import Route
+from spt.transport import Response, Transport
+
+
+class Scripted(Transport):
+    """Answers with the given statuses in turn, then 200 forever"""
+
+    def __init__(self, *statuses: int):
+        self.statuses = list(statuses)
+        self.sent = 0
+
+    async def send(self, route: Route, url: str, timeout: float) -> Response:
+        self.sent += 1
+        status = self.statuses.pop(0) if self.statuses else 200
+        return Response(status, {}, json.dumps({"status": status}).encode())
+
+
+def request(transport: Transport, route: Route, **kwargs):
+    async def run():
+        async with HTTPClient(
+            "token",
+            asyncio.get_event_loop(),
+            transport=transport,
+            rate_limit=1000,
+            burst=100,
+            retry=RetryPolicy(max_retries=3, base=0.001, cap=0.001),
+            **kwargs,
+        ) as http:
+            return await http._request(route), http
+
+    return asyncio.run(run())
+
+
+GET = Route("get", "/my/account")
+POST = Route("post", "/my/sell-orders")
+
+
+def test_which_statuses_retry():
+    policy = RetryPolicy()
+
+    assert policy.retry_status(GET, 500)
+    assert not policy.retry_status(GET, 404)
+    assert not policy.retry_status(POST, 500)
+    assert policy.retry_status(POST, 429)
+    assert policy.retry_status(POST, 503)
+    assert RetryPolicy(retry_unsafe=True).retry_status(POST, 500)
+
+
+def test_which_errors_retry():
+    policy = RetryPolicy()
+
+    assert policy.retry_error(GET, asyncio.TimeoutError())
+    assert not policy.retry_error(POST, asyncio.TimeoutError())
+    assert not policy.retry_error(GET, ValueError())
+
+
+def test_delay_backs_off_to_the_cap():
+    policy = RetryPolicy(base=0.5, cap=3.0, jitter=False)
+
+    assert [policy.delay(n) for n in range(1, 5)] == [0.5, 1.0, 2.0, 3.0]
+    assert policy.delay(1, retry_after=5.0) == 5.0
+
+
+def test_jitter_stays_under_the_backoff():
+    policy = RetryPolicy(base=1.0, cap=30.0)
+
+    assert all(0 <= policy.delay(3) <= 4.0 for _ in range(100))
+
+
+def test_client_retries_server_errors():
+    transport = Scripted(503, 500)
+    result, http = request(transport, GET)
+
+    assert result == {"status": 200}
+    assert transport.sent == 3
+    assert http.metrics[GET].retries == 2
+
+
+def test_client_does_not_repeat_unsafe_posts():
+    transport = Scripted(500)
+
+    with pytest.raises(ServerError) as error:
+        request(transport, POST)
+
+    assert error.value.status == 500
+    assert transport.sent == 1
+
+
+def test_breaker_opens_after_threshold(clock):
+    breaker = CircuitBreaker("host", threshold=3, cooldown=10)
+
+    for _ in range(2):
+        breaker.failure()
+    assert breaker.state == "closed"
+
+    breaker.failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert breaker.rejected == 1
+    assert breaker.retry_in == 10
+
+
+def test_breaker_probes_after_cooldown(clock):
+    breaker = CircuitBreaker("host", threshold=1, cooldown=10)
+    breaker.failure()
+
+    clock.now += 10
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens(clock):
+    breaker = CircuitBreaker("host", threshold=1, cooldown=10)
+    breaker.failure()
+    clock.now += 10
+    breaker.allow()
+
+    breaker.failure()
+    assert breaker.state == "open"
+    assert breaker.trips == 2
+
+
+def test_lost_probe_is_replaced_after_a_cooldown(clock):
+    breaker = CircuitBreaker("host", threshold=1, cooldown=10)
+    breaker.failure()
+    clock.now += 10
+    assert breaker.allow()
+
+    clock.now += 10
+    assert breaker.allow()
+
+
+def test_open_breaker_fails_fast():
+    transport = Scripted(*[500] * 10)
+
+    with pytest.raises(CircuitOpen):
+        request(transport, GET, breaker_threshold=2, breaker_cooldown=60)
+
+    assert transport.sent == 2
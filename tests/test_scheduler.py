@@ -0,0 +1,95 @@
+import asyncio
+
+from spt.ratelimit import RateLimiter
+from spt.route import Route
+from spt.scheduler import Priority, Scheduler
+
+
+def served(routes):
+    """The order a scheduler hands out tokens to routes queued all at once"""
+
+    async def run():
+        scheduler = Scheduler(RateLimiter(rate=1000, burst=1))
+        order = []
+
+        async def one(name, route):
+            await scheduler.acquire(route)
+            order.append(name)
+
+        await asyncio.gather(*(one(name, route) for name, route in routes))
+        return scheduler, order
+
+    return asyncio.run(run())
+
+
+def test_classify():
+    scheduler = Scheduler(RateLimiter())
+
+    assert scheduler.classify(Route("post", "/my/sell-orders")) == Priority.CRITICAL
+    assert scheduler.classify(Route("get", "/game/status")) == Priority.BACKGROUND
+    assert scheduler.classify(Route("get", "/my/account")) == Priority.NORMAL
+    assert (
+        scheduler.classify(Route("get", "/game/status", priority=Priority.CRITICAL))
+        == Priority.CRITICAL
+    )
+
+
+def test_higher_priority_served_first():
+    scheduler, order = served(
+        [
+            ("background", Route("get", "/game/status")),
+            ("normal", Route("get", "/my/account")),
+            ("critical", Route("post", "/my/sell-orders")),
+        ]
+    )
+
+    assert order == ["critical", "normal", "background"]
+    assert scheduler.depth == 0
+
+
+def test_ships_take_turns_within_a_class():
+    def info(ship):
+        return Route("get", "/my/ships/{shipId}", shipId=ship)
+
+    _, order = served(
+        [
+            ("a1", info("a")),
+            ("a2", info("a")),
+            ("a3", info("a")),
+            ("b1", info("b")),
+        ]
+    )
+
+    assert order == ["a1", "b1", "a2", "a3"]
+
+
+def test_stats_count_served_requests():
+    scheduler, _ = served(
+        [(str(i), Route("get", "/my/account")) for i in range(3)]
+        + [("c", Route("post", "/my/sell-orders"))]
+    )
+
+    stats = scheduler.stats()
+    assert stats["normal"]["served"] == 3
+    assert stats["critical"]["served"] == 1
+    assert stats["background"]["served"] == 0
+    assert all(s["depth"] == 0 for s in stats.values())
+
+
+def test_cancelled_waiters_are_skipped():
+    async def run():
+        limiter = RateLimiter(rate=1000, burst=1)
+        scheduler = Scheduler(limiter)
+
+        first = asyncio.ensure_future(scheduler.acquire(Route("get", "/my/account")))
+        second = asyncio.ensure_future(scheduler.acquire(Route("get", "/my/account")))
+        await asyncio.sleep(0)
+        second.cancel()
+
+        await first
+        await asyncio.sleep(0.01)
+        return scheduler
+
+    scheduler = asyncio.run(run())
+    assert scheduler.depth == 0
+    assert scheduler.stats()["normal"]["served"] == 1
@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from spt.errors import HTTPError
+from spt.http import HTTPClient
+from spt.ship import Ship
+
+
+def ships(server, token: str, call):
+    async def run():
+        async with server, HTTPClient(
+            token,
+            asyncio.get_event_loop(),
+            base_url=server.url,
+            rate_limit=100,
+            burst=50,
+        ) as http:
+            fleet = [
+                http.identity.load(Ship, http, s)
+                for s in (await http.ship_get_all())["ships"]
+            ]
+            return await call(fleet)
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize(
+    "call",
+    [
+        lambda ship: ship.deposit_to_owned_structure("nope", "FUEL", 1),
+        lambda ship: ship.deposit_to_structure("nope", "FUEL", 1),
+        lambda ship: ship.transfer_to_ship("nope", "FUEL", 1),
+        lambda ship: ship.transfer_cargo("nope", "FUEL", 1),
+    ],
+)
+def test_error_payloads_raise_with_the_api_message(server, token, call):
+    with pytest.raises(HTTPError, match="not found"):
+        ships(server, token, lambda fleet: call(fleet[0]))
+
+
+def test_transfer_updates_both_ships(server, token):
+    async def transfer(fleet):
+        return await fleet[0].transfer_cargo(fleet[1], "FUEL", 5), fleet
+
+    (source, target), fleet = ships(server, token, transfer)
+
+    assert (source, target) == (fleet[0], fleet[1])
+    assert source.cargo["FUEL"] == 15
+    assert target.cargo["FUEL"] == 25
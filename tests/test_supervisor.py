@@ -0,0 +1,76 @@
+import asyncio
+
+from spt.ship import Ship
+from spt.supervisor import Supervisor
+
+
+async def work(client, ships):
+    for ship in ships:
+        client.dispatch("on_worked", ship)
+    return sorted(ship.id for ship in ships)
+
+
+async def fail(client, ships):
+    if len(ships) > 1:
+        raise ValueError("too many ships")
+    return [ship.id for ship in ships]
+
+
+def supervise(server, token: str, worker, processes: int = 2, events=None):
+    async def main():
+        async with Supervisor(
+            token,
+            worker,
+            processes=processes,
+            base_url=server.url,
+            rate_limit=100,
+            burst=50,
+        ) as supervisor:
+            for name, handler in (events or {}).items():
+                supervisor.event(name)(handler)
+
+            result = await supervisor.run()
+            await asyncio.gather(*supervisor.client._tasks)
+            return result, supervisor
+
+    return asyncio.run(main())
+
+
+def test_ships_are_dealt_round_robin():
+    async def make():
+        return Supervisor("token", work, processes=3)
+
+    supervisor = asyncio.run(make())
+
+    assert supervisor.shard(["a", "b", "c", "d"]) == [["a", "d"], ["b"], ["c"]]
+    assert supervisor.shard(["a"]) == [["a"]]
+
+
+def test_workers_cover_every_ship_once(threaded_server, token):
+    worked = []
+
+    async def on_worked(ship):
+        worked.append(ship)
+
+    result, supervisor = supervise(
+        threaded_server, token, work, events={"on_worked": on_worked}
+    )
+    ids = sorted(threaded_server.users[token]["ships"])
+
+    assert result.ok
+    assert sorted(result.results) == [0, 1]
+    assert sorted(i for r in result.results.values() for i in r) == ids
+
+    # Events arrive as live models from the parent's identity map
+    assert sorted(ship.id for ship in worked) == ids
+    assert all(isinstance(ship, Ship) for ship in worked)
+    assert all(ship.http is supervisor.client.http for ship in worked)
+
+
+def test_a_failing_worker_is_reported_by_shard(threaded_server, token):
+    result, _ = supervise(threaded_server, token, fail)
+
+    # Three ships over two processes: shard 0 has two of them
+    assert set(result.results) == {1}
+    assert isinstance(result.errors[0], ValueError)
+    assert "too many ships" in str(result.errors[0])
@@ -0,0 +1,42 @@
+from spt.sync import Blocking, SyncClient
+
+
+def client(server, token: str) -> SyncClient:
+    return SyncClient(token, base_url=server.url, rate_limit=100, burst=50)
+
+
+def test_results_come_back_wrapped(threaded_server, token):
+    with client(threaded_server, token) as sc:
+        ships = sc.ships
+
+        assert len(ships) == 3
+        assert all(isinstance(s, Blocking) for s in ships)
+        assert sc.http.ship_get_info(ships[0].id)["ship"]["id"] == ships[0].id
+
+
+def test_fleet_of_wrapped_ships_refuels(threaded_server, token):
+    with client(threaded_server, token) as sc:
+        fleet = sc.fleet(sc.ships)
+        result = fleet.refuel(40)
+
+        assert result.ok, result.errors
+        assert len(result) == 3
+        assert all(ship.cargo["FUEL"] == 40 for ship in sc.ships)
+
+
+def test_transfer_to_wrapped_ship(threaded_server, token):
+    with client(threaded_server, token) as sc:
+        ships = sc.ships
+        before = ships[1].cargo["FUEL"]
+
+        ships[0].transfer_cargo(ships[1], "FUEL", 1)
+
+        assert ships[1].cargo["FUEL"] == before + 1
+
+
+def test_submit_returns_a_future(threaded_server, token):
+    with client(threaded_server, token) as sc:
+        ship = sc.ships[0]
+        future = sc.submit(sc.client.http.ship_get_info, ship.id)
+
+        assert future.result(5)["ship"]["id"] == ship.id
@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+
+from aiohttp import ClientSession
+
+from spt.errors import ReplayExhausted
+from spt.http import HTTPClient
+from spt.route import Route
+
+
+def test_shared_session_sends_the_token(server, token):
+    async def run():
+        async with server, ClientSession() as session:
+            async with HTTPClient(
+                token,
+                asyncio.get_event_loop(),
+                base_url=server.url,
+                session=session,
+                rate_limit=100,
+                burst=50,
+            ) as http:
+                account = await http.account()
+
+            # The client didn't make the session, so it leaves it open
+            return account, session.closed
+
+    account, closed = asyncio.run(run())
+    assert account["user"]["username"] == "mock-user-0"
+    assert not closed
+
+
+def record(server, token: str, path: str, routes) -> list:
+    async def run():
+        async with server, HTTPClient(
+            token,
+            asyncio.get_event_loop(),
+            base_url=server.url,
+            record=path,
+            rate_limit=100,
+            burst=50,
+        ) as http:
+            return [await http._request(route) for route in routes]
+
+    return asyncio.run(run())
+
+
+def replay(path: str, routes, mode: str = "keyed") -> list:
+    async def run():
+        async with HTTPClient(
+            "unused", asyncio.get_event_loop(), replay=path, replay_mode=mode
+        ) as http:
+            return [await http._request(route) for route in routes]
+
+    return asyncio.run(run())
+
+
+ROUTES = [
+    Route("get", "/my/account"),
+    Route("get", "/types/goods"),
+    Route("get", "/my/loans"),
+    Route("post", "/my/loans", params={"type": "STARTUP"}),
+    Route("get", "/my/loans"),
+]
+
+
+def test_replay_reproduces_a_recording(server, token, tmp_path):
+    path = str(tmp_path / "requests.jsonl")
+    recorded = record(server, token, path, ROUTES)
+
+    with open(path) as f:
+        assert len(f.readlines()) == len(ROUTES)
+
+    # Keyed replay matches each request to the recording in order, per key
+    assert replay(path, ROUTES) == recorded
+    assert replay(path, reversed(ROUTES)) == [
+        recorded[2],
+        recorded[3],
+        recorded[4],
+        recorded[1],
+        recorded[0],
+    ]
+    assert replay(path, ROUTES, mode="ordered") == recorded
+
+
+def test_keyed_replay_repeats_the_last_response(server, token, tmp_path):
+    path = str(tmp_path / "requests.jsonl")
+    recorded = record(server, token, path, ROUTES[:1])
+
+    assert replay(path, ROUTES[:1] * 3) == recorded * 3
+
+    with pytest.raises(ReplayExhausted):
+        replay(path, ROUTES[1:2])
+
+
+def test_ordered_replay_runs_out(server, token, tmp_path):
+    path = str(tmp_path / "requests.jsonl")
+    record(server, token, path, ROUTES[:1])
+
+    with pytest.raises(ReplayExhausted):
+        replay(path, ROUTES[:2], mode="ordered")
+
+
+def test_recording_survives_a_restart(server, token, tmp_path):
+    path = str(tmp_path / "requests.jsonl")
+
+    async def run():
+        async with server:
+            http = HTTPClient(
+                token,
+                asyncio.get_event_loop(),
+                base_url=server.url,
+                record=path,
+                rate_limit=100,
+                burst=50,
+            )
+            for _ in range(2):
+                await http.start()
+                await http.account()
+                await http.close()
+
+    asyncio.run(run())
+
+    with open(path) as f:
+        assert len(f.readlines()) == 2